@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of the investment annuity term of the planning objective.
+
+Compares the scalar triple loop that was used by ``invcosts_annuity`` with the
+vectorized coefficient matrix, on the economic data of the Planning example
+scaled up to a larger number of years and technologies. Both the time to build
+the expression and the time CVXPY needs to canonicalize it are reported.
+
+Usage::
+
+    python benchmarks/invcosts_annuity.py --years 30 --techs 60
+"""
+
+import argparse
+import time
+
+import cvxpy as cp
+import numpy as np
+import pandas as pd
+
+from hypatia import load_example
+from hypatia.utility.utility import invcosts_annuity
+
+
+def invcosts_annuity_loop(
+    cost_inv_present, interest_rate, economiclife, technologies, main_years, discount_rate,
+):
+    """The scalar implementation replaced by the coefficient matrix"""
+
+    depreciation = np.divide(
+        np.multiply(
+            np.power((interest_rate.values + 1), economiclife.values),
+            interest_rate.values,
+        ),
+        (np.power((interest_rate.values + 1), economiclife.values) - 1),
+    )
+    depreciation = pd.DataFrame(
+        depreciation, index=["Depreciation_rate"], columns=technologies
+    )
+
+    inv_fvalue_total = 0
+    for tech_indx, tech in enumerate(technologies):
+        for y_indx, year in enumerate(main_years):
+            for future_year in range(
+                y_indx + 1, y_indx + economiclife.loc["Economic Life time", tech] + 1
+            ):
+                annuity = (
+                    cost_inv_present[y_indx, tech_indx]
+                    * depreciation.loc["Depreciation_rate", tech]
+                )
+                inv_fvalue_total += annuity * (
+                    1 + discount_rate.loc[year, "Annual Discount Rate"]
+                ) ** (-future_year)
+
+    return inv_fvalue_total
+
+
+def scaled_planning_inputs(n_years, n_techs):
+    """Tiles the Supply data of the Planning example to the requested size"""
+
+    sets = load_example("Planning")._StrData
+    data = sets.data[sets.regions[0]]
+
+    years = [f"Y{indx}" for indx in range(n_years)]
+    techs = [f"Tech{indx}" for indx in range(n_techs)]
+
+    def tile(frame):
+        values = np.resize(frame.loc[:, "Supply"].values[0], n_techs)
+        return pd.DataFrame([values], index=frame.index, columns=techs)
+
+    interest_rate = tile(data["interest_rate"])
+    economiclife = tile(data["economic_lifetime"])
+    # spread the economic lifetimes to get a realistic annuity horizon
+    economiclife.iloc[0] = 10 + np.arange(n_techs) % 30
+    discount_rate = pd.DataFrame(
+        np.resize(data["discount_rate"].values[:, 0], n_years),
+        index=years,
+        columns=["Annual Discount Rate"],
+    )
+    inv = np.resize(data["tech_inv"].loc[:, "Supply"].values, (n_years, n_techs))
+
+    return interest_rate, economiclife, techs, years, discount_rate, inv
+
+
+def time_build(function, inputs):
+
+    interest_rate, economiclife, techs, years, discount_rate, inv = inputs
+    newcap = cp.Variable((len(years), len(techs)), nonneg=True)
+    cost_inv = cp.multiply(inv, newcap)
+
+    start = time.perf_counter()
+    objective = function(
+        cost_inv, interest_rate, economiclife, techs, years, discount_rate
+    )
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    cp.Problem(cp.Minimize(objective), [newcap <= 1]).get_problem_data(cp.SCIPY)
+    canonicalization = time.perf_counter() - start
+
+    return build, canonicalization
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--years", type=int, default=20)
+    parser.add_argument("--techs", type=int, default=30)
+    args = parser.parse_args()
+
+    inputs = scaled_planning_inputs(args.years, args.techs)
+
+    print(f"{args.years} years x {args.techs} technologies")
+    for name, function in [
+        ("loop", invcosts_annuity_loop),
+        ("vectorized", invcosts_annuity),
+    ]:
+        build, canonicalization = time_build(function, inputs)
+        print(
+            f"{name:>10}: build {build:8.3f} s, canonicalization {canonicalization:8.3f} s"
+        )
@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of the extraction of the results into DataFrames.
+
+Compares the extraction that evaluated the strings of the result map with
+``eval`` and took the value of each expression separately with
+``set_DataFrame``, which takes the values of all the expressions of the sparse
+engine with one product with the solution. The regions of the Operation
+example are repeated to get a large multi-node model, which is built and
+given a zero solution, as the extraction does not depend on the solution.
+
+Usage::
+
+    python benchmarks/result_extraction.py --copies 10 --engine sparse
+"""
+
+import argparse
+import copy
+import time
+
+import cvxpy as cp
+import numpy as np
+import pandas as pd
+
+from hypatia import load_example
+from hypatia.analysis.postprocessing import set_DataFrame, year_slice_index
+from hypatia.backend.Build import BuildModel
+
+# the result map of the implementation with eval
+EVAL_MAP = {
+    "production_by_tech": {
+        "index": "year_slice",
+        "var": 'results.variables["productionbyTechnology"]',
+    },
+    "use_by_tech": {
+        "index": "year_slice",
+        "var": 'results.variables["usebyTechnology"]',
+    },
+    "variable_cost": {"index": "years", "var": "results.cost_variable"},
+    "decommissioning_cost": {"index": "years", "var": "results.cost_decom"},
+    "new_capacity": {"index": "years", "var": 'results.variables["newcapacity"]'},
+    "decommissioned_capacity": {
+        "index": "years",
+        "var": "results.decommissioned_capacity",
+    },
+    "total_capacity": {"index": "years", "var": "results.totalcapacity"},
+    "fix_cost": {"index": "years", "var": "results.cost_fix"},
+    "imports": {"index": "year_slice", "var": 'results.variables["line_import"]'},
+    "exports": {"index": "year_slice", "var": 'results.variables["line_export"]'},
+    "investment_cost": {"index": "years", "var": "results.cost_inv"},
+    "fix_tax_cost": {"index": "years", "var": "results.cost_fix_tax"},
+    "fix_subsidies": {"index": "years", "var": "results.cost_fix_sub"},
+    "emission_cost": {"index": "years", "var": "results.emission_cost"},
+    "emissions": {"index": "years", "var": "results.CO2_equivalent"},
+    "lines_total_capacity": {"index": "years", "var": "results.line_totalcapacity"},
+    "lines_decommissioned_capacity": {
+        "index": "years",
+        "var": "results.line_decommissioned_capacity",
+    },
+    "lines_investment_cost": {"index": "years", "var": "results.cost_inv_line"},
+    "lines_fix_cost": {"index": "years", "var": "results.cost_fix_line"},
+    "lines_variable_cost": {"index": "years", "var": "results.cost_variable_line"},
+    "lines_decomisioning_cost": {"index": "years", "var": "results.cost_decom_line"},
+}
+
+
+def set_DataFrame_eval(
+    results, regions, years, time_fraction, glob_mapping, technologies, mode
+):
+    """The implementation with eval replaced by set_DataFrame"""
+
+    _years = glob_mapping["Years"]
+    years = _years[_years["Year"].isin(years)]["Year_name"]
+
+    year_slice = year_slice_index(years, time_fraction)
+
+    vars_frames = {}
+
+    for item, info in EVAL_MAP.items():
+        try:
+            var = eval(info["var"])
+        except (KeyError, AttributeError):
+            continue
+        vars_frames[item] = {}
+
+        if ("line" in item) and (item != "lines_variable_cost"):
+            for pair_reg, values in var.items():
+
+                if isinstance(values, np.ndarray):
+                    values = values
+                elif isinstance(values, (pd.DataFrame, pd.Series)):
+                    values = values.values
+                else:
+                    values = values.value
+
+                columns = glob_mapping["Carriers_glob"]["Carrier"]
+
+                vars_frames[item][pair_reg] = pd.DataFrame(
+                    data=values, index=eval(info["index"]), columns=columns,
+                )
+
+        else:
+            for region in regions:
+                vars_frames[item][region] = {}
+
+                for _type, values in var[region].items():
+                    if (item == "use_by_tech") and (_type == "supply"):
+                        continue
+                    if item in ["imports", "exports", "lines_variable_cost"]:
+                        columns = glob_mapping["Carriers_glob"]["Carrier"]
+                    else:
+                        columns = technologies[region][_type]
+                    if isinstance(values, np.ndarray):
+                        values = values
+                    elif isinstance(values, (pd.DataFrame, pd.Series)):
+                        values = values.values
+                    else:
+                        values = values.value
+                    frame = pd.DataFrame(
+                        data=values, index=eval(info["index"]), columns=columns,
+                    )
+
+                    vars_frames[item][region][_type] = frame
+
+    vars_frames["demand"] = {
+        rr: pd.DataFrame(
+            data=results.demand[rr].values,
+            index=year_slice,
+            columns=results.demand[rr].columns,
+        )
+        for rr in regions
+    }
+
+    return vars_frames
+
+
+def replicate_regions(sets, copies):
+    """Repeats the regions of the sets with their data, linking all of them"""
+
+    origin = {
+        f"{reg}_{copy_indx}": reg
+        for copy_indx in range(copies)
+        for reg in sets.regions
+    }
+
+    replicated = copy.copy(sets)
+    replicated.regions = list(origin)
+    replicated.glob_mapping = dict(
+        sets.glob_mapping,
+        Regions=pd.DataFrame({"Region": list(origin), "Region_name": list(origin)}),
+    )
+    for name in ["mapping", "Technologies", "data"]:
+        values = getattr(sets, name)
+        setattr(replicated, name, {reg: values[origin[reg]] for reg in origin})
+
+    replicated._create_lines()
+    carriers = sets.glob_mapping["Carriers_glob"]["Carrier"]
+    replicated.trade_data = {
+        name: pd.DataFrame(
+            np.tile(frame.values[:, : len(carriers)], len(replicated.lines_list)),
+            index=frame.index,
+            columns=pd.MultiIndex.from_product([replicated.lines_list, carriers]),
+        )
+        for name, frame in sets.trade_data.items()
+    }
+    # the global limits are shared by more regions
+    replicated.global_data = {
+        name: frame * copies for name, frame in sets.global_data.items()
+    }
+    replicated._create_carrier_incidence()
+
+    return replicated
+
+
+def zero_solution(model):
+    """Gives all the variables of a built model a zero value"""
+
+    if model.engine == "sparse":
+        model.program.solution = np.zeros(model.program.n_vars)
+    else:
+        problem = cp.Problem(cp.Minimize(model.global_objective), model.constr)
+        for variable in problem.variables():
+            variable.value = np.zeros(variable.shape)
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--copies", type=int, default=10)
+    parser.add_argument("--engine", default="sparse")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    sets = replicate_regions(load_example("Operation")._StrData, args.copies)
+    model = BuildModel(sets=sets, engine=args.engine)
+    zero_solution(model)
+    results = model._results()
+
+    print(
+        f"{len(sets.regions)} regions, {len(sets.lines_list)} lines, "
+        f"{len(sets.time_steps)} timesteps, {args.engine} engine"
+    )
+    for name, function in [("eval", set_DataFrame_eval), ("bulk", set_DataFrame)]:
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            function(
+                results=results,
+                regions=sets.regions,
+                years=sets.main_years,
+                time_fraction=sets.time_steps,
+                glob_mapping=sets.glob_mapping,
+                technologies=sets.Technologies,
+                mode=sets.mode,
+            )
+            best = min(best, time.perf_counter() - start)
+        print(f"{name:>6}: {best:8.3f} s")
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of the memory taken by the copies of the results.
+
+Solves an example and measures the memory allocated to rerun it with
+``force_rewrite=True``, which keeps a backup of the previous results, and to
+extract the data of a ``Plotter`` from the model. A deep copy of the results,
+as was taken by both, is measured as well to compare with the shared read
+only results.
+
+Usage::
+
+    python benchmarks/results_memory.py --example Operation --solver HIGHS --engine sparse
+"""
+
+import argparse
+import copy
+import tracemalloc
+
+from hypatia import Plotter, load_example
+
+
+def traced(function, *args, **kwargs):
+    """Gives the peak and the retained memory allocated by a call, in MB"""
+
+    tracemalloc.start()
+    result = function(*args, **kwargs)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return result, peak / 2 ** 20, retained / 2 ** 20
+
+
+def results_size(results):
+    """Gives the size of the values of the result frames, in MB"""
+
+    if hasattr(results, "values") and not callable(results.values):
+        return results.values.nbytes / 2 ** 20
+    return sum(results_size(value) for value in results.values())
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--example", default="Operation")
+    parser.add_argument("--solver", default="HIGHS")
+    parser.add_argument("--engine", default="sparse")
+    args = parser.parse_args()
+
+    model = load_example(args.example)
+    model.run(solver=args.solver, verbosity=False, engine=args.engine)
+    print(
+        f"{args.example} example: {len(model._StrData.time_steps)} timesteps, "
+        f"results of {results_size(model.results):.1f} MB"
+    )
+
+    _, peak, retained = traced(copy.deepcopy, model.results)
+    print(f"{'deepcopy':>18}: peak {peak:8.1f} MB, retained {retained:8.1f} MB")
+
+    _, peak, retained = traced(
+        model.run,
+        solver=args.solver,
+        verbosity=False,
+        engine=args.engine,
+        force_rewrite=True,
+    )
+    print(f"{'run with backup':>18}: peak {peak:8.1f} MB, retained {retained:8.1f} MB")
+
+    # the data of the plots, without the config file
+    plotter = Plotter.__new__(Plotter)
+    _, peak, retained = traced(plotter._init_from_object, model)
+    print(f"{'plotter':>18}: peak {peak:8.1f} MB, retained {retained:8.1f} MB")
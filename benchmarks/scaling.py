@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of the scaling of the model with its size.
+
+Generates a synthetic model for each case of a grid of numbers of regions,
+technologies per category, carriers, years and timesteps, and times the
+reading of the sets by ``ReadSets``, the reading of the parameters by
+``_read_data``, the construction of ``BuildModel``, the solve and the
+conversion of the results by ``set_DataFrame``. The peak memory allocated by
+each phase is traced with tracemalloc in a second pass, as tracing slows the
+phases down. The problem is built and solved by the given engine, with the
+HiGHS solver by default through ``scipy`` for both engines. The results are
+written as JSON to track regressions.
+
+Usage::
+
+    python benchmarks/scaling.py --mode Operation --regions 1 2 4 --timesteps 24 168 --output scaling.json
+"""
+
+import argparse
+import itertools as it
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import cvxpy as cp
+import numpy as np
+import pandas as pd
+import scipy
+
+from hypatia.analysis.postprocessing import set_DataFrame
+from hypatia.backend.Build import BuildModel
+from hypatia.backend.StrData import ReadSets
+from synthetic import CATEGORIES, generate_model
+
+# the phases of a case, in the order they are run
+PHASES = ["read_sets", "read_data", "build", "solve", "results"]
+
+# the default solver of each engine, both using HiGHS through scipy
+SOLVERS = {"sparse": "HIGHS", "cvxpy": "SCIPY"}
+
+# the numbers that define the size of a case
+SIZES = ["regions", "technologies", "carriers", "years", "timesteps"]
+
+
+def run_phases(sets_path, parameters_path, args, measure):
+
+    """
+    Runs the phases of a case, measuring each of them with the given
+    function, and gives the measures and the sizes of the problem
+    """
+
+    measures = {}
+
+    def phase(name, function, *fargs, **kwargs):
+        result, measures[name] = measure(function, *fargs, **kwargs)
+        return result
+
+    sets = phase("read_sets", ReadSets, path=sets_path, mode=args.mode)
+    phase("read_data", sets._read_data, parameters_path, processes=1)
+    model = phase("build", BuildModel, sets=sets, engine=args.engine)
+    results = phase("solve", model._solve, verbosity=False, solver=args.solver)
+    if results is None:
+        raise RuntimeError("The generated model is not solved")
+
+    phase(
+        "results",
+        set_DataFrame,
+        results=results,
+        regions=sets.regions,
+        years=sets.main_years,
+        time_fraction=sets.time_steps,
+        glob_mapping=sets.glob_mapping,
+        technologies=sets.Technologies,
+        mode=sets.mode,
+        line_carriers=getattr(sets, "line_carriers", None),
+    )
+
+    return measures, {
+        size: model.stats[size] for size in ["variables", "constraints", "nonzeros"]
+    }
+
+
+def timed(function, *args, **kwargs):
+
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+
+    return result, time.perf_counter() - start
+
+
+def traced(function, *args, **kwargs):
+
+    tracemalloc.start()
+    result = function(*args, **kwargs)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return result, peak / 2 ** 20
+
+
+def run_case(case, args):
+
+    """
+    Generates the model of a case and gives its sizes, the best seconds of
+    each phase over the repeats and, unless skipped, their peak memory in MB
+    """
+
+    with tempfile.TemporaryDirectory() as path:
+        sets_path, parameters_path = generate_model(
+            path,
+            mode=args.mode,
+            regions=case["regions"],
+            technologies=dict.fromkeys(CATEGORIES, case["technologies"]),
+            carriers=case["carriers"],
+            years=case["years"],
+            timesteps=case["timesteps"],
+            seed=args.seed,
+            lines=args.lines,
+        )
+
+        seconds = dict.fromkeys(PHASES, float("inf"))
+        for _ in range(args.repeat):
+            measures, problem = run_phases(sets_path, parameters_path, args, timed)
+            seconds = {name: min(seconds[name], measures[name]) for name in PHASES}
+
+        memory = None
+        if not args.no_memory:
+            memory, _ = run_phases(sets_path, parameters_path, args, traced)
+
+    return {
+        "case": case,
+        "problem": problem,
+        "seconds": seconds,
+        "peak_memory_mb": memory,
+    }
+
+
+def environment():
+
+    return {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "scipy": scipy.__version__,
+        "cvxpy": cp.__version__,
+    }
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--mode", default="Operation")
+    parser.add_argument("--engine", default="sparse", choices=list(SOLVERS))
+    parser.add_argument("--solver", help="by default HIGHS or SCIPY for cvxpy")
+    parser.add_argument("--regions", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--technologies", type=int, nargs="+", default=[2])
+    parser.add_argument("--carriers", type=int, nargs="+", default=[1])
+    parser.add_argument("--years", type=int, nargs="+", default=[1])
+    parser.add_argument("--timesteps", type=int, nargs="+", default=[24, 168])
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--lines", default="all", choices=["all", "ring"])
+    parser.add_argument("--no-memory", action="store_true")
+    parser.add_argument("--output", help="the JSON file, printed if not given")
+    args = parser.parse_args()
+    if args.solver is None:
+        args.solver = SOLVERS[args.engine]
+
+    cases = [
+        dict(zip(SIZES, values))
+        for values in it.product(*(getattr(args, size) for size in SIZES))
+    ]
+
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "environment": environment(),
+        "settings": {
+            "mode": args.mode,
+            "engine": args.engine,
+            "solver": args.solver,
+            "repeat": args.repeat,
+            "seed": args.seed,
+            "lines": args.lines,
+        },
+        "results": [],
+    }
+
+    for case in cases:
+        result = run_case(case, args)
+        report["results"].append(result)
+        print(
+            ", ".join(f"{size} {value}" for size, value in case.items())
+            + ": "
+            + ", ".join(
+                f"{name} {seconds:.3f} s" for name, seconds in result["seconds"].items()
+            ),
+            file=sys.stderr,
+        )
+
+    if args.output is None:
+        print(json.dumps(report, indent=2))
+    else:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of the reader of the set files.
+
+Compares the cell by cell reading of the tables of the 'Sets' sheet through a
+fully loaded openpyxl workbook, which was used by ``ReadSets``, with
+``read_set_tables``, which reads the bounding range of all the tables in one
+read-only, values-only pass. The set files of an example are read, and
+optionally also after being written as directories of csv files.
+
+Usage::
+
+    python benchmarks/set_reader.py --example Operation --repeat 3 --csv
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import pandas as pd
+from openpyxl import load_workbook
+
+from hypatia.backend.StrData import SETS_SHEET, read_set_tables, write_set_tables
+
+EXAMPLES = os.path.join(os.path.dirname(__file__), "..", "hypatia", "examples")
+
+
+def read_set_tables_cells(path, file_name):
+    """The cell by cell implementation replaced by read_set_tables"""
+
+    sheet = load_workbook(r"{}/{}.xlsx".format(path, file_name))[SETS_SHEET]
+
+    tables = {}
+    for entry, data_boundary in sheet.tables.items():
+        content = [[cell.value for cell in ent] for ent in sheet[data_boundary]]
+        tables[entry] = pd.DataFrame(content[1:], columns=content[0])
+
+    return tables
+
+
+def write_csv_sets(path, file_names, new_path):
+    """Writes the tables of the set files as directories of csv files"""
+
+    for file_name in file_names:
+        write_set_tables(new_path, file_name, read_set_tables(path, file_name))
+
+
+def time_read(function, path, file_names, repeat):
+
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for file_name in file_names:
+            function(path, file_name)
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--example", default="Operation")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--csv", action="store_true")
+    args = parser.parse_args()
+
+    path = os.path.join(EXAMPLES, args.example, "sets")
+    file_names = sorted(
+        os.path.splitext(name)[0]
+        for name in os.listdir(path)
+        if name.endswith(".xlsx") and not name.startswith("~$")
+    )
+
+    print(f"{args.example} example: {', '.join(file_names)}")
+    readers = [
+        ("cells", read_set_tables_cells, path),
+        ("tables", read_set_tables, path),
+    ]
+
+    with tempfile.TemporaryDirectory() as csv_path:
+        if args.csv:
+            write_csv_sets(path, file_names, csv_path)
+            readers.append(("csv", read_set_tables, csv_path))
+
+        for name, function, source in readers:
+            seconds = time_read(function, source, file_names, args.repeat)
+            print(f"{name:>8}: {seconds:8.3f} s")
@@ -0,0 +1,294 @@
+# -*- coding: utf-8 -*-
+"""
+Generator of synthetic models of any size.
+
+Writes the set files of a model with the given numbers of regions,
+technologies per category, carriers, years and timesteps as directories of
+csv files, and its parameter files with the sheets, indices and columns
+defined by ``ReadSets._create_input_data``, filled with random values that
+keep the model feasible.
+
+Each carrier is a chain of a resource, an intermediate and a demand carrier:
+the supply technologies extract the resource, the conversion technologies
+turn it into the intermediate carrier, the transmission technologies deliver
+it as the demand carrier and the demand technologies consume it. The
+technologies of each category are spread over the chains, so every category
+needs at least as many technologies as carriers. All the regions have the
+same technologies and are linked with each other for all the carriers, or,
+with ``lines="ring"``, each region is linked with the next one for the
+intermediate carriers only.
+
+Usage::
+
+    python benchmarks/synthetic.py path/to/model --mode Operation --regions 4
+"""
+
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from hypatia.backend.StrData import ReadSets, write_parameter_file, write_set_tables
+
+# the technology categories of the generated models, in the order of the chains
+CATEGORIES = ["Supply", "Conversion", "Transmission", "Demand"]
+
+# the carriers of each chain, taken and given by the technologies of each category
+CHAIN = {
+    "Supply": (None, "Resource"),
+    "Conversion": ("Resource", "Intermediate"),
+    "Transmission": ("Intermediate", "Demand"),
+    "Demand": ("Demand", None),
+}
+
+# the ranges of the random values of the parameters
+RANDOM_RANGES = {
+    "demand": (50, 100),
+    "tech_var_cost": (0.1, 1),
+    "tech_inv": (1, 10),
+    "line_inv": (1, 10),
+    "line_var_cost": (0.1, 1),
+    "tech_efficiency": (0.8, 1),
+    "line_eff": (0.9, 1),
+    "res_capacity_factor": (0.2, 1),
+    "specific_emission": (0, 1),
+}
+
+# the lifetime of the technologies and of the lines, in years
+LIFETIME = 20
+
+
+def carrier_name(carrier_type, chain):
+
+    return f"{carrier_type}_{chain + 1}"
+
+
+def set_tables(regions, technologies, carriers, years, timesteps, lines=None):
+
+    """
+    Creates the tables of the global and of the regional set files
+    """
+
+    techs = [
+        (category, f"{category}_{indx + 1}", indx % carriers)
+        for category in CATEGORIES
+        for indx in range(technologies[category])
+    ]
+    carrier_list = [
+        (carrier_name(carrier_type, chain), carrier_type)
+        for chain in range(carriers)
+        for carrier_type in ["Resource", "Intermediate", "Demand"]
+    ]
+    region_list = [f"reg{indx + 1}" for indx in range(regions)]
+
+    tables = {
+        "global": {
+            "Regions": pd.DataFrame(
+                {"Region": region_list, "Region_name": region_list}
+            ),
+            "Years": pd.DataFrame(
+                {
+                    "Year": [f"Y{indx}" for indx in range(years)],
+                    "Year_name": [2020 + indx for indx in range(years)],
+                }
+            ),
+            "Timesteps": pd.DataFrame(
+                {
+                    "Timeslice": [f"T{indx + 1}" for indx in range(timesteps)],
+                    "Timeslice_name": [f"T{indx + 1}" for indx in range(timesteps)],
+                    "Timeslice_fraction": np.full(timesteps, 1 / timesteps),
+                }
+            ),
+            "Carriers_glob": pd.DataFrame(
+                {
+                    "Carrier": [name for name, _ in carrier_list],
+                    "Carr_name": [name for name, _ in carrier_list],
+                    "Carr_type": [carrier_type for _, carrier_type in carrier_list],
+                    "Carr_unit": "GWh",
+                }
+            ),
+            "Technologies_glob": pd.DataFrame(
+                {
+                    "Technology": [tech for _, tech, _ in techs],
+                    "Tech_name": [tech for _, tech, _ in techs],
+                    "Tech_category": [category for category, _, _ in techs],
+                    "Tech_cap_unit": "GW",
+                    "Tech_act_unit": "GWh",
+                }
+            ),
+            "Emissions": pd.DataFrame(
+                {
+                    "Emission": ["CO2"],
+                    "Emission_name": ["CO2"],
+                    "Emission_unit": ["ton"],
+                }
+            ),
+        }
+    }
+
+    flows = {"Carrier_input": ([], []), "Carrier_output": ([], [])}
+    for category, tech, chain in techs:
+        for table, carrier_type in zip(flows, CHAIN[category]):
+            if carrier_type is not None:
+                flows[table][0].append(tech)
+                flows[table][1].append(carrier_name(carrier_type, chain))
+
+    regional = {
+        "Technologies": tables["global"]["Technologies_glob"][
+            ["Technology", "Tech_name", "Tech_category"]
+        ],
+        "Carriers": tables["global"]["Carriers_glob"][
+            ["Carrier", "Carr_name", "Carr_type"]
+        ],
+        "Carrier_input": pd.DataFrame(
+            {
+                "Technology": flows["Carrier_input"][0],
+                "Carrier_in": flows["Carrier_input"][1],
+            }
+        ),
+        "Carrier_output": pd.DataFrame(
+            {
+                "Technology": flows["Carrier_output"][0],
+                "Carrier_out": flows["Carrier_output"][1],
+            }
+        ),
+    }
+    if lines == "ring" and regions > 1:
+        links = [
+            (region_list[indx], region_list[(indx + 1) % regions])
+            for indx in range(regions if regions > 2 else 1)
+        ]
+        tables["global"]["Lines"] = pd.DataFrame(
+            [
+                (reg_from, reg_to, carrier_name("Intermediate", chain))
+                for reg_from, reg_to in links
+                for chain in range(carriers)
+            ],
+            columns=["Region_from", "Region_to", "Carrier"],
+        )
+    elif lines not in [None, "all"]:
+        raise ValueError(f"Unknown lines {lines}, expected 'all' or 'ring'.")
+
+    for region in region_list:
+        tables[region] = regional
+
+    return tables
+
+
+def parameter_values(key, frame, sets, rng):
+
+    """
+    Gives the values of a parameter of the generated model
+    """
+
+    if key in RANDOM_RANGES:
+        return rng.uniform(*RANDOM_RANGES[key], size=frame.shape)
+
+    if key == "annualprod_per_unitcapacity":
+        # the capacity bounds the production of each timestep
+        return np.full(frame.shape, len(sets.time_steps))
+
+    if "lifetime" in key:
+        return np.full(frame.shape, LIFETIME)
+
+    if key == "tech_residual_cap" and sets.mode == "Operation":
+        # enough capacity for all the demand of a chain, after the losses and
+        # the lowest capacity factor
+        demands = len(sets.Technologies[sets.regions[0]]["Demand"])
+        demand = RANDOM_RANGES["demand"][1] * demands
+        losses = RANDOM_RANGES["tech_efficiency"][0] ** 2
+        availability = RANDOM_RANGES["res_capacity_factor"][0]
+        return np.full(frame.shape, demand / losses / availability)
+
+    if key == "line_residual_cap" and sets.mode == "Operation":
+        return rng.uniform(0, RANDOM_RANGES["demand"][1], size=frame.shape)
+
+    return frame.values
+
+
+def generate_model(
+    path,
+    mode="Planning",
+    regions=1,
+    technologies=None,
+    carriers=1,
+    years=1,
+    timesteps=24,
+    format="csv",
+    seed=0,
+    lines=None,
+):
+
+    """
+    Writes the set files of a synthetic model to path/sets and its parameter
+    files, as directories of columnar files, to path/parameters. The
+    technologies are given as the number of technologies of each category,
+    by default two, and the links as 'all' or 'ring', by default all. Returns
+    the paths of the set and of the parameter files
+    """
+
+    if technologies is None:
+        technologies = dict.fromkeys(CATEGORIES, 2)
+    for category in CATEGORIES:
+        if technologies.get(category, 0) < carriers:
+            raise ValueError(
+                f"Every category needs at least one technology per carrier, "
+                f"{category} has {technologies.get(category, 0)} for {carriers} "
+                "carriers."
+            )
+
+    sets_path = os.path.join(path, "sets")
+    parameters_path = os.path.join(path, "parameters")
+    os.makedirs(parameters_path, exist_ok=True)
+
+    for file_name, tables in set_tables(
+        regions, technologies, carriers, years, timesteps, lines
+    ).items():
+        write_set_tables(sets_path, file_name, tables)
+
+    sets = ReadSets(path=sets_path, mode=mode)
+    rng = np.random.default_rng(seed)
+
+    for file_name, ids, sheet_ids, _ in sets._parameter_files():
+        data = {}
+        for key, value in ids.items():
+            sheet = sheet_ids[value["sheet_name"]]
+            frame = pd.DataFrame(
+                sheet["value"], index=sheet["index"], columns=sheet["columns"]
+            ).astype(float)
+            frame.iloc[:, :] = parameter_values(key, frame, sets, rng)
+            data[key] = frame
+
+        write_parameter_file(parameters_path, file_name, ids, data, format)
+
+    return sets_path, parameters_path
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("path")
+    parser.add_argument("--mode", default="Planning")
+    parser.add_argument("--regions", type=int, default=1)
+    parser.add_argument("--technologies", type=int, default=2)
+    parser.add_argument("--carriers", type=int, default=1)
+    parser.add_argument("--years", type=int, default=1)
+    parser.add_argument("--timesteps", type=int, default=24)
+    parser.add_argument("--format", default="csv")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--lines", default="all", choices=["all", "ring"])
+    args = parser.parse_args()
+
+    generate_model(
+        args.path,
+        mode=args.mode,
+        regions=args.regions,
+        technologies=dict.fromkeys(CATEGORIES, args.technologies),
+        carriers=args.carriers,
+        years=args.years,
+        timesteps=args.timesteps,
+        format=args.format,
+        seed=args.seed,
+        lines=args.lines,
+    )
@@ -35,6 +35,7 @@ Package dependencies:
 
     pandas
     numpy
+    scipy
     xlsxwriter
     plotly
     openpyxl
@@ -4,14 +4,15 @@ This module contains the functions and the class for
 result visualization of hypatia model
 """
 
-from copy import deepcopy
+import os
 import pandas as pd
 import numpy as np
 from plotly import graph_objs as go
 from plotly.subplots import make_subplots
 import plotly.offline as pltly
 from IPython import get_ipython
-from hypatia.analysis.postprocessing import year_slice_index
+from hypatia.analysis.postprocessing import LazyResults, SETS_FOLDER, plot_inputs
+from hypatia.backend.StrData import read_set_tables
 
 CARS = "Carriers"
 TECHS = "Technologies"
@@ -143,7 +144,8 @@ class Plotter:
         Parameters
         ----------
         results : str, hypatia.Model
-            Initializing the plotter object by csv files or directly from
+            Initializing the plotter object by the folder of the results
+            exported by Model.to_csv or Model.to_npy, or directly from
             hypatia model.
 
         config : str
@@ -166,64 +168,59 @@ class Plotter:
     def _init_from_object(self, results):
         """Extracts the data for plots"""
 
-        self.data = deepcopy(results.results)
-        self.regions = deepcopy(results._StrData.regions)
-        self.years = deepcopy(results._StrData.main_years)
-        self.time_fraction = deepcopy(results._StrData.timeslice_fraction)
-        self.techs = deepcopy(
-            results._StrData.glob_mapping["Technologies_glob"]["Technology"].tolist()
-        )
-        self.fuels = deepcopy(
-            results._StrData.glob_mapping["Carriers_glob"]["Carrier"].tolist()
-        )
-        self.emissions = deepcopy(
-            results._StrData.glob_mapping["Emissions"]["Emission"].tolist()
+        # the results are shared with the model, they can not be changed
+        self.data = dict(results.results)
+        self.regions = results._StrData.regions
+        self.years = results._StrData.main_years
+        self.time_fraction = results._StrData.timeslice_fraction
+        self._init_sets(results._StrData.glob_mapping, results._StrData.mapping)
+        self.data.update(plot_inputs(results._StrData))
+
+        # the hourly plots need the results of the original timesteps
+        clusters = getattr(results, "_clusters", None)
+        if clusters is not None:
+            self.data = clusters.disaggregate_results(self.data)
+            self.time_fraction = clusters.timeslice_fraction
+
+    def _init_from_csv(self, results):
+        """Extracts the data from the results exported by Model.to_csv or
+        Model.to_npy. The results are read when they are first plotted"""
+
+        path = os.path.join(results, SETS_FOLDER)
+        glob_mapping = read_set_tables(path, "global")
+
+        self.data = LazyResults(results, exclude=[SETS_FOLDER])
+        self.regions = glob_mapping["Regions"]["Region"].tolist()
+        self.years = glob_mapping["Years"]["Year"].tolist()
+        self.time_fraction = glob_mapping["Timesteps"]["Timeslice_fraction"].values
+        self._init_sets(
+            glob_mapping, {reg: read_set_tables(path, reg) for reg in self.regions}
         )
 
+    def _init_sets(self, glob_mapping, mapping):
+        """Extracts the sets for plots"""
+
+        self.techs = glob_mapping["Technologies_glob"]["Technology"].tolist()
+        self.fuels = glob_mapping["Carriers_glob"]["Carrier"].tolist()
+        self.emissions = glob_mapping["Emissions"]["Emission"].tolist()
+
         reformed_sets = {}
-        for region in results._StrData.regions:
+        for region in self.regions:
             reformed_sets[region] = {}
-            for key, value in results._StrData.mapping[region].items():
+            for key, value in mapping[region].items():
                 reformed_sets[region][key] = value.set_index(
                     [main_index[key]], inplace=False
                 )
         self.sets = reformed_sets
 
         self.glob_mapping = dict(
-            techs=results._StrData.glob_mapping["Technologies_glob"].set_index(
+            techs=glob_mapping["Technologies_glob"].set_index(
                 ["Technology"], inplace=False
             ),
-            fuels=results._StrData.glob_mapping["Carriers_glob"].set_index(
-                ["Carrier"], inplace=False
-            ),
+            fuels=glob_mapping["Carriers_glob"].set_index(["Carrier"], inplace=False),
         )
 
-        self.mapping = results._StrData.mapping
-
-        years = results._StrData.main_years
-        _years = results._StrData.glob_mapping["Years"]
-        years = _years[_years["Year"].isin(years)]["Year_name"]
-        time_fraction = results._StrData.time_steps
-        year_slice = year_slice_index(years, time_fraction)
-
-        for item in ["tech_residual_cap", "carrier_ratio_in", "carrier_ratio_out"]:
-
-            self.data[item] = {}
-            for reg in self.regions:
-                if item not in results._StrData.data[reg]:
-                    continue
-                if item == "tech_residual_cap":
-                    index = years
-                else:
-                    index = year_slice
-                data = results._StrData.data[reg][item]
-                self.data[item][reg] = pd.DataFrame(
-                    data=data.values, index=index, columns=data.columns
-                )
-
-    def _init_from_csv(self, results):
-        """Extracts the data from csv files"""
-        raise NotImplementedError("Not implemented in this version")
+        self.mapping = mapping
 
     def _is_allowed(self, item):
         if item not in self.data:
@@ -874,7 +871,7 @@ class Plotter:
                         imports = (
                             value.groupby(level=0, sort=False)
                             .sum()
-                            .loc[years, fuels]
+                            .loc[years, value.columns.intersection(fuels)]
                             .sum()
                             .sum()
                         )
@@ -925,7 +922,7 @@ class Plotter:
                     exports = (
                         value.groupby(level=0, sort=False)
                         .sum()
-                        .loc[years, fuels]
+                        .loc[years, value.columns.intersection(fuels)]
                         .sum()
                         .sum()
                     )
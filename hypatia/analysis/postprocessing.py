@@ -7,40 +7,62 @@ in nested dict of results.
 RESULT_MAP = {
     "production_by_tech": {
         "index": "year_slice",
-        "var": 'results.variables["productionbyTechnology"]',
+        "var": "variables",
+        "key": "productionbyTechnology",
     },
     "use_by_tech": {
         "index": "year_slice",
-        "var": 'results.variables["usebyTechnology"]',
+        "var": "variables",
+        "key": "usebyTechnology",
     },
-    "variable_cost": {"index": "years", "var": "results.cost_variable",},
-    "decommissioning_cost": {"index": "years", "var": "results.cost_decom",},
-    "new_capacity": {"index": "years", "var": 'results.variables["newcapacity"]',},
-    "decommissioned_capacity": {
-        "index": "years",
-        "var": "results.decommissioned_capacity",
-    },
-    "total_capacity": {"index": "years", "var": "results.totalcapacity",},
-    "fix_cost": {"index": "years", "var": "results.cost_fix",},
-    "imports": {"index": "year_slice", "var": 'results.variables["line_import"]',},
-    "exports": {"index": "year_slice", "var": 'results.variables["line_export"]',},
-    "investment_cost": {"index": "years", "var": "results.cost_inv",},
-    "fix_tax_cost": {"index": "years", "var": "results.cost_fix_tax"},
-    "fix_subsidies": {"index": "years", "var": "results.cost_fix_sub"},
-    "emission_cost": {"index": "years", "var": "results.emission_cost"},
-    "emissions": {"index": "years", "var": "results.CO2_equivalent"},
-    "lines_total_capacity": {"index": "years", "var": "results.line_totalcapacity"},
+    "variable_cost": {"index": "years", "var": "cost_variable"},
+    "decommissioning_cost": {"index": "years", "var": "cost_decom"},
+    "new_capacity": {"index": "years", "var": "variables", "key": "newcapacity"},
+    "decommissioned_capacity": {"index": "years", "var": "decommissioned_capacity"},
+    "total_capacity": {"index": "years", "var": "totalcapacity"},
+    "fix_cost": {"index": "years", "var": "cost_fix"},
+    "imports": {"index": "year_slice", "var": "variables", "key": "line_import"},
+    "exports": {"index": "year_slice", "var": "variables", "key": "line_export"},
+    "investment_cost": {"index": "years", "var": "cost_inv"},
+    "fix_tax_cost": {"index": "years", "var": "cost_fix_tax"},
+    "fix_subsidies": {"index": "years", "var": "cost_fix_sub"},
+    "emission_cost": {"index": "years", "var": "emission_cost"},
+    "emissions": {"index": "years", "var": "CO2_equivalent"},
+    "lines_total_capacity": {"index": "years", "var": "line_totalcapacity"},
     "lines_decommissioned_capacity": {
         "index": "years",
-        "var": "results.line_decommissioned_capacity",
+        "var": "line_decommissioned_capacity",
     },
-    "lines_investment_cost": {"index": "years", "var": "results.cost_inv_line"},
-    "lines_fix_cost": {"index": "years", "var": "results.cost_fix_line"},
-    "lines_variable_cost": {"index": "years", "var": "results.cost_variable_line"},
-    "lines_decomisioning_cost": {"index": "years", "var": "results.cost_decom_line"},
+    "lines_investment_cost": {"index": "years", "var": "cost_inv_line"},
+    "lines_fix_cost": {"index": "years", "var": "cost_fix_line"},
+    "lines_variable_cost": {"index": "years", "var": "cost_variable_line"},
+    "lines_decomisioning_cost": {"index": "years", "var": "cost_decom_line"},
+}
+
+
+# the names of the results that can be extracted from a solved problem
+RESULT_ITEMS = list(RESULT_MAP) + ["demand"]
+
+# the columns of the long format tables of the results, besides the values
+RESULT_COLUMNS = ["region", "category", "technology", "year", "timeslice"]
+
+# the formats of the result stores and their file extensions
+RESULT_FORMATS = {"parquet": ".parquet", "hdf": ".h5"}
+
+# the inputs of the model exported with the results for the plots, with the
+# index of their frames and the number of levels of their columns
+PLOT_INPUTS = {
+    "tech_residual_cap": {"index": "years", "column_levels": 2},
+    "carrier_ratio_in": {"index": "year_slice", "column_levels": 2},
+    "carrier_ratio_out": {"index": "year_slice", "column_levels": 2},
 }
 
+# the folder of the set tables within the exported results
+SETS_FOLDER = "sets"
 
+from collections.abc import Mapping
+from hypatia.utility import algebra
+import json
 import pandas as pd
 import numpy as np
 import os
@@ -58,6 +80,162 @@ def dict_to_csv(Dict, path):
             dict_to_csv(value, new_path)
 
 
+def dict_to_npy(Dict, path):
+    """Writes nested dicts to npy files of the values and json files of the labels"""
+
+    for key, value in Dict.items():
+        if isinstance(value, pd.DataFrame):
+            np.save(f"{path}//{key}.npy", value.values, allow_pickle=False)
+            labels = {
+                "index": value.index.tolist(),
+                "index_names": list(value.index.names),
+                "columns": value.columns.tolist(),
+                "column_names": list(value.columns.names),
+            }
+            with open(f"{path}//{key}.json", "w") as file:
+                json.dump(labels, file, default=lambda label: label.item())
+        else:
+            new_path = f"{path}//{key}"
+            os.makedirs(new_path, exist_ok=True)
+            dict_to_npy(value, new_path)
+
+
+def _labels_index(labels, names):
+    """Creates an index from the labels stored by dict_to_npy"""
+
+    if len(names) > 1:
+        return pd.MultiIndex.from_tuples(
+            [tuple(label) for label in labels], names=names
+        )
+    return pd.Index(labels, name=names[0])
+
+
+def read_npy_frame(file):
+    """Reads a DataFrame written by dict_to_npy, with its values memory mapped"""
+
+    with open(f"{file}.json") as stream:
+        labels = json.load(stream)
+
+    return pd.DataFrame(
+        data=np.load(f"{file}.npy", mmap_mode="r"),
+        index=_labels_index(labels["index"], labels["index_names"]),
+        columns=_labels_index(labels["columns"], labels["column_names"]),
+        copy=False,
+    )
+
+
+def read_csv_frame(file, item):
+    """Reads a DataFrame of a result or plot input written by dict_to_csv"""
+
+    info = PLOT_INPUTS.get(item, RESULT_MAP.get(item, {"index": "year_slice"}))
+    index_levels = 2 if info["index"] == "year_slice" else 1
+
+    return pd.read_csv(
+        f"{file}.csv",
+        index_col=list(range(index_levels)),
+        header=list(range(info.get("column_levels", 1))),
+        float_precision="round_trip",
+    )
+
+
+class LazyResults(Mapping):
+
+    """
+    The nested dict of the results exported to a folder by dict_to_csv or
+    dict_to_npy. Each DataFrame is read on its first access and the values of
+    the npy files are memory mapped, so only the frames in use are loaded.
+    """
+
+    def __init__(self, path, item=None, exclude=()):
+
+        self.path = path
+        self.item = item
+        self._frames = {}
+        self._keys = []
+
+        for name in sorted(os.listdir(path)):
+            key, extension = os.path.splitext(name)
+            if os.path.isdir(os.path.join(path, name)):
+                if name not in exclude:
+                    self._keys.append(name)
+            elif extension in [".csv", ".npy"]:
+                self._keys.append(key)
+
+    def __getitem__(self, key):
+
+        if key not in self._frames:
+            if key not in self._keys:
+                raise KeyError(key)
+
+            file = os.path.join(self.path, key)
+            item = key if self.item is None else self.item
+            if os.path.isdir(file):
+                self._frames[key] = LazyResults(file, item)
+            elif os.path.exists(f"{file}.npy"):
+                self._frames[key] = read_npy_frame(file)
+            else:
+                self._frames[key] = read_csv_frame(file, item)
+
+        return self._frames[key]
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+
+def _read_only(frame):
+    """Gives a DataFrame sharing the values of the frame, with read only values"""
+
+    values = frame.values
+    values.flags.writeable = False
+
+    return pd.DataFrame(
+        data=values, index=frame.index, columns=frame.columns, copy=False
+    )
+
+
+class Results(Mapping):
+
+    """
+    The nested dict of the result DataFrames of a model, which can not be
+    changed. The values of the frames are read only, so the results are
+    shared by the backups and the plots instead of being copied. A copy is
+    taken only to change the results, with the 'copy' method.
+    """
+
+    def __init__(self, results):
+
+        self._results = {
+            key: _read_only(value)
+            if isinstance(value, pd.DataFrame)
+            else Results(value)
+            for key, value in results.items()
+        }
+
+    def __getitem__(self, key):
+        return self._results[key]
+
+    def __iter__(self):
+        return iter(self._results)
+
+    def __len__(self):
+        return len(self._results)
+
+    def __repr__(self):
+        return "Results({})".format(self._results)
+
+    def __reduce__(self):
+        # the unpickled arrays are writeable, so the frames are made read only again
+        return (Results, (self._results,))
+
+    def copy(self):
+        """Gives the results as a nested dict of changeable copies of the frames"""
+
+        return {key: value.copy() for key, value in self._results.items()}
+
+
 def year_slice_index(
     years, time_fraction,
 ):
@@ -68,71 +246,347 @@ def year_slice_index(
         return pd.MultiIndex.from_product([years, [1]])
 
 
-def set_DataFrame(
-    results, regions, years, time_fraction, glob_mapping, technologies, mode
-):
-    """Creates pd.DataFrame from results"""
+def _result_var(results, item):
+    """Gives the solved expressions of a result, or None if it is not solved"""
 
-    _years = glob_mapping["Years"]
-    years = _years[_years["Year"].isin(years)]["Year_name"]
+    if item == "demand":
+        return results.demand
 
-    year_slice = year_slice_index(years, time_fraction)
+    info = RESULT_MAP[item]
+    try:
+        var = getattr(results, info["var"])
+        return var[info["key"]] if "key" in info else var
+    except (KeyError, AttributeError):
+        return None
 
-    vars_frames = {}
 
-    for item, info in RESULT_MAP.items():
-        try:
-            var = eval(info["var"])
-        except (KeyError, AttributeError):
+def _result_blocks(results, regions, vars_frames, items=None):
+    """Gives the keys and the solved expressions of the results, or only of the
+    given items, and adds the dicts of their frames to vars_frames"""
+
+    blocks = []
+    for item in RESULT_MAP:
+        if items is not None and item not in items:
+            continue
+        var = _result_var(results, item)
+        if var is None:
             continue
         vars_frames[item] = {}
 
         if ("line" in item) and (item != "lines_variable_cost"):
             for pair_reg, values in var.items():
-
-                if isinstance(values, np.ndarray):
-                    values = values
-                elif isinstance(values, (pd.DataFrame, pd.Series)):
-                    values = values.values
-                else:
-                    values = values.value
-
-                columns = glob_mapping["Carriers_glob"]["Carrier"]
-
-                vars_frames[item][pair_reg] = pd.DataFrame(
-                    data=values, index=eval(info["index"]), columns=columns,
-                )
-
+                blocks.append(((item, pair_reg), values))
         else:
             for region in regions:
                 vars_frames[item][region] = {}
-
                 for _type, values in var[region].items():
                     if (item == "use_by_tech") and (_type == "supply"):
                         continue
-                    if item in ["imports", "exports", "lines_variable_cost"]:
-                        columns = glob_mapping["Carriers_glob"]["Carrier"]
-                    else:
-                        columns = technologies[region][_type]
-                    if isinstance(values, np.ndarray):
-                        values = values
-                    elif isinstance(values, (pd.DataFrame, pd.Series)):
-                        values = values.values
-                    else:
-                        values = values.value
-                    frame = pd.DataFrame(
-                        data=values, index=eval(info["index"]), columns=columns,
-                    )
-
-                    vars_frames[item][region][_type] = frame
-
-    vars_frames["demand"] = {
-        rr: pd.DataFrame(
-            data=results.demand[rr].values,
-            index=year_slice,
-            columns=results.demand[rr].columns,
-        )
-        for rr in regions
+                    blocks.append(((item, region, _type), values))
+
+    return blocks
+
+
+def set_DataFrame(
+    results,
+    regions,
+    years,
+    time_fraction,
+    glob_mapping,
+    technologies,
+    mode,
+    items=None,
+    line_carriers=None,
+):
+    """Creates pd.DataFrame from results, or only from the given items. The
+    results of the inter-regional links have the carriers of each link, all
+    the carriers if line_carriers is not given"""
+
+    _years = glob_mapping["Years"]
+    years = _years[_years["Year"].isin(years)]["Year_name"]
+
+    indices = {
+        "years": pd.Index(years),
+        "year_slice": year_slice_index(years, time_fraction),
     }
+    carriers = pd.Index(glob_mapping["Carriers_glob"]["Carrier"])
+
+    # the values of all the results are taken from the solution at once
+    vars_frames = {}
+    blocks = _result_blocks(results, regions, vars_frames, items)
+    values = algebra.values([expr for _, expr in blocks])
+
+    for (keys, _), value in zip(blocks, values):
+        item = keys[0]
+        if len(keys) == 2 or item in ["imports", "exports", "lines_variable_cost"]:
+            line = "{}-{}".format(*sorted(keys[1:])) if len(keys) == 3 else keys[1]
+            columns = carriers if line_carriers is None else line_carriers[line]
+        else:
+            columns = technologies[keys[1]][keys[2]]
+
+        frames = vars_frames[item]
+        for key in keys[1:-1]:
+            frames = frames[key]
+        frames[keys[-1]] = pd.DataFrame(
+            data=value, index=indices[RESULT_MAP[item]["index"]], columns=columns,
+        )
+
+    if items is None or "demand" in items:
+        vars_frames["demand"] = {
+            rr: pd.DataFrame(
+                data=results.demand[rr].values,
+                index=indices["year_slice"],
+                columns=results.demand[rr].columns,
+            )
+            for rr in regions
+        }
 
     return vars_frames
+
+
+class SolvedResults(Mapping):
+
+    """
+    The results of a solved problem, or only the given items, which are
+    converted to DataFrames on their first access. The converted results are
+    read only like the Results. The expressions of the problem are kept until
+    all the results are converted, so the values must not be changed by
+    solving the problem again.
+    """
+
+    def __init__(self, results, items=None, **sets):
+
+        self._results = results
+        self._sets = sets
+        self._frames = {}
+        self._keys = [
+            item
+            for item in RESULT_ITEMS
+            if (items is None or item in items)
+            and _result_var(results, item) is not None
+        ]
+
+    def __getitem__(self, key):
+
+        if key not in self._frames:
+            if key not in self._keys:
+                raise KeyError(key)
+
+            frames = set_DataFrame(self._results, items=[key], **self._sets)
+            self._frames[key] = Results(frames)[key]
+
+        return self._frames[key]
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __repr__(self):
+        return "SolvedResults({})".format(self._keys)
+
+    def __reduce__(self):
+        # the expressions of the problem are not pickled, only the converted results
+        return (Results, (dict(self),))
+
+    def copy(self):
+        """Gives the results as a nested dict of changeable copies of the frames"""
+
+        return Results(self).copy()
+
+
+def plot_inputs(sets):
+    """Gives the inputs of the model used by the plots, indexed as the results"""
+
+    _years = sets.glob_mapping["Years"]
+    years = _years[_years["Year"].isin(sets.main_years)]["Year_name"]
+    year_slice = year_slice_index(years, sets.time_steps)
+
+    inputs = {}
+    for item, info in PLOT_INPUTS.items():
+        inputs[item] = {}
+        for reg in sets.regions:
+            if item not in sets.data[reg]:
+                continue
+            data = sets.data[reg][item]
+            inputs[item][reg] = pd.DataFrame(
+                data=data.values,
+                index=year_slice if info["index"] == "year_slice" else years,
+                columns=data.columns,
+            )
+
+    return inputs
+
+
+def merge_DataFrames(frames):
+    """Concatenates the nested dicts of DataFrames of consecutive years"""
+
+    if isinstance(frames[0], pd.DataFrame):
+        return pd.concat(frames)
+
+    return {
+        key: merge_DataFrames([frame[key] for frame in frames]) for key in frames[0]
+    }
+
+
+def _frames(value, keys=()):
+    """Yields the keys and the DataFrames of a nested dict"""
+
+    if isinstance(value, pd.DataFrame):
+        yield keys, value
+    else:
+        for key, item in value.items():
+            yield from _frames(item, keys + (key,))
+
+
+def _categorical(values):
+    """Creates a categorical column with the categories in order of appearance"""
+
+    codes, categories = pd.factorize(np.asarray(values, dtype=object))
+    return pd.Categorical.from_codes(codes, categories=categories)
+
+
+def results_to_long(results):
+    """Turns each item of the nested dict of results into a long format table"""
+
+    tables = {}
+    for item, value in results.items():
+        columns = {name: [] for name in RESULT_COLUMNS + ["value"]}
+
+        for keys, frame in _frames(value):
+            n_rows, n_columns = frame.shape
+            size = n_rows * n_columns
+            index = frame.index
+            if isinstance(index, pd.MultiIndex):
+                years = index.get_level_values(0)
+                timeslices = np.repeat(index.get_level_values(1), n_columns)
+            else:
+                years = index
+                timeslices = np.full(size, None)
+
+            columns["region"].append(np.full(size, keys[0], dtype=object))
+            columns["category"].append(
+                np.full(size, keys[1] if len(keys) > 1 else None, dtype=object)
+            )
+            columns["technology"].append(np.tile(frame.columns, n_rows))
+            columns["year"].append(np.repeat(years, n_columns))
+            columns["timeslice"].append(timeslices)
+            columns["value"].append(frame.values.astype(float).ravel())
+
+        tables[item] = pd.DataFrame(
+            {
+                name: _categorical(np.concatenate(parts))
+                if name in RESULT_COLUMNS
+                else np.concatenate(parts)
+                for name, parts in columns.items()
+            }
+        )
+
+    return tables
+
+
+def _labels(column, rows):
+    """Takes the labels of the given rows of a categorical column"""
+
+    return column.cat.categories.take(column.cat.codes.values[rows])
+
+
+def long_to_results(tables):
+    """Turns the long format tables of the results into the nested dict"""
+
+    results = {}
+    for item, table in tables.items():
+        results[item] = {}
+
+        region = table["region"].cat.codes.values
+        category = table["category"].cat.codes.values
+        starts = np.flatnonzero(
+            np.diff(region, prepend=-2) | np.diff(category, prepend=-2)
+        )
+
+        for start, stop in zip(starts, np.append(starts[1:], len(table))):
+            rows = np.arange(start, stop)
+            n_columns = len(np.unique(table["technology"].cat.codes.values[rows]))
+            first_rows = rows[::n_columns]
+
+            years = _labels(table["year"], first_rows)
+            if table["timeslice"].cat.codes.values[start] == -1:
+                index = pd.Index(years, name="Year_name")
+            else:
+                index = pd.MultiIndex.from_arrays(
+                    [years, _labels(table["timeslice"], first_rows)],
+                    names=["Year_name", None],
+                )
+
+            frame = pd.DataFrame(
+                data=table["value"].values[rows].reshape((-1, n_columns)),
+                index=index,
+                columns=_labels(table["technology"], rows[:n_columns]),
+            )
+
+            reg = table["region"].cat.categories[region[start]]
+            if category[start] == -1:
+                results[item][reg] = frame
+            else:
+                results[item].setdefault(reg, {})[
+                    table["category"].cat.categories[category[start]]
+                ] = frame
+
+    return results
+
+
+def write_results(results, path, format):
+    """Writes the results as long format tables to a parquet folder or hdf file"""
+
+    tables = results_to_long(results)
+
+    if format == "parquet":
+        os.makedirs(path, exist_ok=True)
+        # the tables of previous results would be read as results
+        for name in os.listdir(path):
+            if name.endswith(RESULT_FORMATS[format]):
+                os.remove(os.path.join(path, name))
+        for item, table in tables.items():
+            table.to_parquet(os.path.join(path, item + RESULT_FORMATS[format]))
+    else:
+        with pd.HDFStore(path, mode="w") as store:
+            for item, table in tables.items():
+                store.put(item, table, format="table")
+
+
+def read_results(path, items=None):
+    """Reads the results written by write_results, or only the given items"""
+
+    if os.path.isdir(path):
+        extension = RESULT_FORMATS["parquet"]
+        available = [
+            name[: -len(extension)]
+            for name in sorted(os.listdir(path))
+            if name.endswith(extension)
+        ]
+        read = lambda item: pd.read_parquet(os.path.join(path, item + extension))
+    else:
+        with pd.HDFStore(path, mode="r") as store:
+            # the categories are stored as nested meta tables of each table
+            available = [
+                key.lstrip("/") for key in store.keys() if key.count("/") == 1
+            ]
+        read = lambda item: pd.read_hdf(path, item)
+
+    if items is not None:
+        missing = set(items) - set(available)
+        if missing:
+            raise KeyError(f"The results {sorted(missing)} are not found in {path}.")
+        available = [item for item in available if item in items]
+
+    tables = {}
+    for item in available:
+        table = read(item)
+        # parquet keeps only the categorical columns of string labels
+        for column in RESULT_COLUMNS:
+            if table[column].dtype.name != "category":
+                table[column] = _categorical(table[column].values)
+        tables[item] = table
+
+    return long_to_results(tables)
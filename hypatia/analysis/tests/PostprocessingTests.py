@@ -0,0 +1,245 @@
+import importlib.util
+import os
+import pickle
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+import unittest
+from collections import namedtuple
+from hypatia.analysis.postprocessing import (
+    RESULT_COLUMNS,
+    LazyResults,
+    Results,
+    SolvedResults,
+    set_DataFrame,
+    dict_to_csv,
+    dict_to_npy,
+    results_to_long,
+    long_to_results,
+    write_results,
+    read_results,
+)
+
+'''
+Unit tests for the functions in postprocessing.py
+'''
+
+def _results():
+    year_slice = pd.MultiIndex.from_product(
+        [pd.Index([2020, 2030], name="Year_name"), [1, 2, 3]]
+    )
+    years = pd.Index([2020, 2030], name="Year_name")
+    rng = np.random.default_rng(0)
+
+    return {
+        "production_by_tech": {
+            "reg1": {
+                "Supply": pd.DataFrame(
+                    rng.random((6, 2)), index=year_slice, columns=["Wind", "Coal"]
+                ),
+                "Conversion": pd.DataFrame(
+                    rng.random((6, 1)), index=year_slice, columns=["Boiler"]
+                ),
+            },
+            "reg2": {
+                "Supply": pd.DataFrame(
+                    rng.random((6, 1)), index=year_slice, columns=["Solar"]
+                ),
+            },
+        },
+        "carrier_ratio_in": {
+            "reg1": pd.DataFrame(
+                rng.random((6, 2)),
+                index=year_slice,
+                columns=pd.MultiIndex.from_tuples([("CHP", "Gas"), ("CHP", "Oil")]),
+            ),
+        },
+        "lines_total_capacity": {
+            "reg1-reg2": pd.DataFrame(
+                rng.random((2, 2)), index=years, columns=["Elec", "Gas"]
+            ),
+        },
+    }
+
+
+def _assert_same_results(test, results, expected):
+    test.assertEqual(results.keys(), expected.keys())
+    for key, value in expected.items():
+        if isinstance(value, dict):
+            _assert_same_results(test, results[key], value)
+        else:
+            test.assertTrue(value.equals(results[key]))
+            test.assertEqual(value.index.names, results[key].index.names)
+
+
+class TestLongResults(unittest.TestCase):
+    def test_long_format(self):
+        tables = results_to_long(_results())
+        production = tables["production_by_tech"]
+
+        self.assertEqual(list(production.columns), RESULT_COLUMNS + ["value"])
+        self.assertEqual(len(production), 6 * 4)
+        for column in RESULT_COLUMNS:
+            self.assertEqual(production[column].dtype.name, "category")
+        self.assertEqual(
+            list(production["technology"].cat.categories),
+            ["Wind", "Coal", "Boiler", "Solar"],
+        )
+        self.assertTrue(tables["lines_total_capacity"]["category"].isna().all())
+        self.assertTrue(tables["lines_total_capacity"]["timeslice"].isna().all())
+
+    def test_round_trip(self):
+        results = _results()
+        _assert_same_results(self, long_to_results(results_to_long(results)), results)
+
+
+class TestResults(unittest.TestCase):
+    def test_read_only(self):
+        frames = _results()
+        results = Results(frames)
+        frame = results["production_by_tech"]["reg1"]["Supply"]
+
+        self.assertTrue(
+            np.shares_memory(
+                frame.values, frames["production_by_tech"]["reg1"]["Supply"].values
+            )
+        )
+        with self.assertRaises(ValueError):
+            frame.iloc[0, 0] = 1
+        with self.assertRaises(TypeError):
+            results["demand"] = frame
+        _assert_same_results(self, dict(results), frames)
+
+    def test_pickle(self):
+        results = pickle.loads(pickle.dumps(Results(_results())))
+        frame = results["production_by_tech"]["reg1"]["Supply"]
+
+        self.assertIsInstance(results["production_by_tech"], Results)
+        self.assertFalse(frame.values.flags.writeable)
+        _assert_same_results(self, dict(results), _results())
+
+    def test_copy(self):
+        results = Results(_results())
+        copied = results.copy()
+        copied["production_by_tech"]["reg1"]["Supply"].iloc[0, 0] = -1
+
+        self.assertIsInstance(copied["production_by_tech"]["reg1"], dict)
+        self.assertNotEqual(
+            results["production_by_tech"]["reg1"]["Supply"].iloc[0, 0], -1
+        )
+
+
+def _solved():
+    rng = np.random.default_rng(1)
+    solved = namedtuple("result", ["variables", "totalcapacity", "demand"])(
+        variables={
+            "productionbyTechnology": {"reg1": {"Supply": rng.random((6, 2))}},
+        },
+        totalcapacity={"reg1": {"Supply": rng.random((2, 2))}},
+        demand={"reg1": pd.DataFrame(rng.random((6, 1)), columns=["Elec"])},
+    )
+    sets = dict(
+        regions=["reg1"],
+        years=["Y0", "Y1"],
+        time_fraction=[1, 2, 3],
+        glob_mapping={
+            "Years": pd.DataFrame(
+                {"Year": ["Y0", "Y1"], "Year_name": [2020, 2030]}
+            ),
+            "Carriers_glob": pd.DataFrame({"Carrier": ["Elec"]}),
+        },
+        technologies={"reg1": {"Supply": ["Wind", "Coal"]}},
+        mode="Operation",
+    )
+
+    return solved, sets
+
+
+class TestSolvedResults(unittest.TestCase):
+    def test_items(self):
+        solved, sets = _solved()
+        results = set_DataFrame(solved, items=["total_capacity"], **sets)
+
+        self.assertEqual(list(results), ["total_capacity"])
+        self.assertEqual(
+            list(results["total_capacity"]["reg1"]["Supply"].columns), ["Wind", "Coal"]
+        )
+
+    def test_lazy(self):
+        solved, sets = _solved()
+        results = SolvedResults(solved, **sets)
+
+        self.assertEqual(
+            list(results), ["production_by_tech", "total_capacity", "demand"]
+        )
+        self.assertEqual(results._frames, {})
+        frame = results["total_capacity"]["reg1"]["Supply"]
+
+        self.assertEqual(list(results._frames), ["total_capacity"])
+        self.assertFalse(frame.values.flags.writeable)
+        _assert_same_results(self, dict(results), set_DataFrame(solved, **sets))
+
+    def test_lazy_pickle(self):
+        solved, sets = _solved()
+        results = SolvedResults(solved, ["demand"], **sets)
+        loaded = pickle.loads(pickle.dumps(results))
+
+        self.assertIsInstance(loaded, Results)
+        self.assertEqual(list(loaded), ["demand"])
+
+
+class TestLazyResults(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder)
+        os.makedirs(os.path.join(self.folder, "sets"))
+
+    def test_csv(self):
+        dict_to_csv(_results(), self.folder)
+        results = LazyResults(self.folder, exclude=["sets"])
+
+        self.assertEqual(list(results["production_by_tech"]), ["reg1", "reg2"])
+        self.assertEqual(results["production_by_tech"]["reg1"]._frames, {})
+        _assert_same_results(self, dict(results), _results())
+
+    def test_npy(self):
+        dict_to_npy(_results(), self.folder)
+        results = LazyResults(self.folder, exclude=["sets"])
+        frame = results["production_by_tech"]["reg1"]["Supply"]
+
+        # the values are a read only memory map of the npy file
+        self.assertFalse(frame.values.flags.writeable)
+        self.assertIs(frame, results["production_by_tech"]["reg1"]["Supply"])
+        _assert_same_results(self, dict(results), _results())
+
+
+class TestResultStores(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder)
+
+    @unittest.skipUnless(
+        importlib.util.find_spec("pyarrow") or importlib.util.find_spec("fastparquet"),
+        "needs a parquet engine",
+    )
+    def test_parquet(self):
+        path = os.path.join(self.folder, "results")
+        write_results(_results(), path, "parquet")
+
+        _assert_same_results(self, read_results(path), _results())
+        self.assertEqual(
+            list(read_results(path, ["lines_total_capacity"])),
+            ["lines_total_capacity"],
+        )
+
+    @unittest.skipUnless(importlib.util.find_spec("tables"), "needs pytables")
+    def test_hdf(self):
+        path = os.path.join(self.folder, "results.h5")
+        write_results(_results(), path, "hdf")
+
+        _assert_same_results(self, read_results(path), _results())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,10 +4,13 @@ This module contains the core of the optimization model, containing
 the definiton of problem (variables,constraints,objective function,...)
 in CVXPY for planning and operation modes.
 """
-import pandas as pd
 import cvxpy as cp
 import numpy as np
+import scipy.sparse as sp
 from collections import namedtuple
+from hypatia.backend.Presolve import Presolve
+from hypatia.utility import algebra
+from hypatia.utility.problem_io import write_lp, write_mps, read_solution
 from hypatia.utility.utility import (
     invcosts,
     invcosts_annuity,
@@ -21,13 +24,18 @@ from hypatia.utility.utility import (
     decomcap,
     line_decomcap,
     available_resource_prod,
+    resource_availability_factor,
+    specific_taxsub,
     annual_activity,
     storage_state_of_charge,
     get_regions_with_storage,
     storage_max_flow,
+    storage_flow_factor,
 )
 
+import functools
 import logging
+import time
 
 
 logger = logging.getLogger(__name__)
@@ -55,6 +63,98 @@ PLANNING_RESULTS = [
 ]
 
 
+def _timed(method):
+
+    """
+    Records the seconds taken by a method of the model in its timings
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+
+        start = time.perf_counter()
+        result = method(self, *args, **kwargs)
+        seconds = time.perf_counter() - start
+        self.timings[method.__name__] = self.timings.get(method.__name__, 0) + seconds
+        logger.debug(f"{method.__name__} took {seconds:.3f} s")
+
+        return result
+
+    return wrapper
+
+
+def _named_constraints(method):
+
+    """
+    Labels the constraint blocks added by a method of the model with the name
+    of the method, used to name the rows of the exported problem files, and
+    records the seconds taken by the method
+    """
+
+    name = method.__name__.replace("_constr_", "")
+    method = _timed(method)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+
+        start = len(self.constr)
+        method(self, *args, **kwargs)
+        for block, indx in enumerate(range(start, len(self.constr))):
+            self.constr_names[indx] = f"{name}_{block}"
+
+    return wrapper
+
+
+# the input data that enter the CVXPY problem only through parameters, so
+# that their values can be updated without building the problem again
+PARAMETERS = {
+    "data": [
+        "demand",
+        "tech_var_cost",
+        "tech_fixed_cost",
+        "fix_taxsub",
+        "tech_inv",
+        "inv_taxsub",
+        "tech_decom_cost",
+        "specific_emission",
+        "carbon_tax",
+        "res_capacity_factor",
+        "tech_capacity_factor",
+        "annualprod_per_unitcapacity",
+        "tech_mintotcap",
+        "tech_maxtotcap",
+        "tech_min_newcap",
+        "tech_max_newcap",
+        "tech_max_production",
+        "tech_min_production",
+        "emission_cap_annual",
+    ],
+    "global_data": [
+        "global_mintotcap",
+        "global_maxtotcap",
+        "global_min_newcap",
+        "global_max_newcap",
+        "global_min_production",
+        "global_max_production",
+        "global_emission_cap_annual",
+    ],
+    "trade_data": [
+        "line_inv",
+        "line_fixed_cost",
+        "line_decom_cost",
+        "line_mintotcap",
+        "line_maxtotcap",
+    ],
+}
+
+# the HiGHS methods of scipy.optimize.linprog used by the sparse engine
+SPARSE_SOLVERS = {
+    "HIGHS": "highs",
+    "HIGHS-DS": "highs-ds",
+    "HIGHS-IPM": "highs-ipm",
+}
+
+
 class BuildModel:
 
     """Class that builds the variables and equations of the model
@@ -69,18 +169,82 @@ class BuildModel:
         a nested dictionary of all the decision variables including the new capacity, production
         by each technology, use (consumption) by each technology, imports and exports
 
+    engine: str
+        The way the problem is assembled, 'cvxpy' builds a CVXPY problem and
+        'sparse' assembles the sparse matrices of the linear program directly
+
+    parametrize: bool
+        If True, the inputs listed in PARAMETERS enter the CVXPY problem as
+        parameters, so that the problem can be solved again with new values
+        of them without being built and compiled again
+
+    parameters: dict
+        The CVXPY parameters of the problem with the functions that compute
+        their values from the input data
+
+    problem:
+        The CVXPY problem, kept after the first solve to be solved again with
+        new parameter values without compiling it again
+
+    timings: dict
+        The seconds taken by each method that builds the model, or by the
+        update of the parameters when the problem is solved again
+
+    stats: dict
+        The seconds taken to compile and to solve the problem and its numbers
+        of variables, constraints and nonzero coefficients, once solved, with
+        the numbers of variables and constraints eliminated by the presolve
+
+    presolve:
+        The Presolve of the input data, if the technologies fixed at zero and
+        the bounds that cannot be active are left out of the problem. It is
+        not used for parametrized problems, whose bounds can change
+
+    solution: dict
+        The values of the variables of a solved problem by their name and
+        labels. When given, the variables are these NumPy arrays and only the
+        derived results are evaluated from them, without the constraints and
+        the objective
+
+    blocks: dict
+        The variables of the model by their name and labels, with the columns
+        of all the technologies of a category
+
     """
 
-    def __init__(self, sets):
+    def __init__(
+        self, sets, engine="cvxpy", parametrize=False, presolve=False, solution=None
+    ):
 
         self.sets = sets
+        self.engine = engine
+        self.solution = solution
+        self.parametrize = parametrize and engine == "cvxpy" and solution is None
+        self.presolve = (
+            Presolve(sets)
+            if presolve and not self.parametrize and solution is None
+            else None
+        )
+        self.blocks = {}
         self.constr = []
+        self.constr_names = {}
+        self.parameters = {}
+        self.problem = None
+        self.timings = {}
+        self.stats = {}
+        if self.engine == "sparse":
+            self.program = algebra.LinearProgram()
         timeslice_fraction = self.sets.timeslice_fraction
         if not isinstance(timeslice_fraction, int):
             timeslice_fraction.shape = (len(self.sets.time_steps), 1)
         self.timeslice_fraction = timeslice_fraction
 
         self._set_variables()
+        self._calc_production_annual()
+
+        if self.solution is not None:
+            self._calc_results()
+            return
 
         # calling the methods based on the defined mode by the user
         if self.sets.mode == "Planning":
@@ -109,7 +273,6 @@ class BuildModel:
                 self._constr_totalcapacity_overall()
                 self._constr_newcapacity_overall()
                 self._constr_line_availability()
-                self._constr_trade_balance()
                 self._constr_prod_annual_overall()
                 self._set_lines_objective_planning()
                 self._set_final_objective_multinode()
@@ -135,57 +298,352 @@ class BuildModel:
 
                 self._calc_variable_operation_line()
                 self._constr_line_availability()
-                self._constr_trade_balance()
                 self._constr_prod_annual_overall()
                 self._set_lines_objective_operation()
                 self._set_final_objective_multinode()
 
-    def _solve(self, verbosity, solver, **kwargs):
+        if self.presolve is not None:
+            self.presolve.log()
+
+    def _calc_results(self):
 
         """
-        Creates a CVXPY problem instance, if the output status is optimal,
-        returns the results to the interface
+        Evaluates the derived results, such as the capacities, the costs and
+        the emissions, from the values of the variables of a solved problem
         """
 
-        objective = cp.Minimize(self.global_objective)
-        problem = cp.Problem(objective, self.constr)
-        problem.solve(solver=solver, verbose=verbosity, **kwargs)
+        if self.sets.mode == "Planning":
 
-        if problem.status == "optimal":
+            self._calc_variable_planning()
+            if len(self.sets.regions) > 1:
+                self._calc_variable_planning_line()
 
-            # Reshape the demand
-            self.demand = {
-                reg: self.sets.data[reg]["demand"] for reg in self.sets.regions
-            }
+        elif self.sets.mode == "Operation":
 
-            res = RESULTS.copy()
-            to_add = []
-            if self.sets.multi_node:
-                if self.sets.mode == "Planning":
-                    to_add = [
-                        "line_totalcapacity",
-                        "line_decommissioned_capacity",
-                        "cost_inv_line",
-                        "cost_fix_line",
-                        "cost_decom_line",
-                        "cost_variable_line",
-                    ]
-                else:
-                    to_add = [
-                        "line_totalcapacity",
-                        "cost_fix_line",
-                        "cost_variable_line",
-                    ]
-            if self.sets.mode == "Planning":
-                to_add.extend(PLANNING_RESULTS)
+            self._calc_variable_operation()
+            if len(self.sets.regions) > 1:
+                self._calc_variable_operation_line()
+
+    def _variable(
+        self, shape, nonneg=False, name=None, keys=(), index=None, columns=None
+    ):
+
+        """
+        Creates a block of decision variables for the engine of the model,
+        the name and the labels of the rows and columns are used for naming
+        the variables in the exported problem files. With a solution, the
+        block is the array of its values
+        """
+
+        if self.solution is not None:
+            variable = np.asarray(self.solution[(name,) + keys], dtype=float)
+
+        elif self.engine == "sparse":
+            variable = self.program.variable(
+                shape,
+                nonneg=nonneg,
+                name=name,
+                keys=keys,
+                index=index,
+                columns=columns,
+            )
+
+        else:
+            variable = cp.Variable(shape=shape, nonneg=nonneg)
+
+        self.blocks[(name,) + keys] = variable
+
+        return variable
+
+    def _active_bound(self, value, source, name, sense, *keys):
+
+        """
+        Tells if the lower ('>=') or upper ('<=') bound of an expression given
+        by an input parameter is added to the problem, which is always the
+        case without presolve
+        """
+
+        if self.presolve is None:
+            return True
+
+        return not self.presolve.inactive(value, source, name, sense, *keys)
+
+    def _technology_variable(self, name, reg, key, index):
+
+        """
+        Creates the nonnegative variables of the technologies of a category in
+        each row of the index. The technologies fixed at zero by the presolve
+        have no variables and their columns are zero
+        """
+
+        techs = self.sets.Technologies[reg][key]
+        selection = None
+        if self.presolve is not None:
+            selection = self.presolve.selection(reg, key)
+
+        if selection is None:
+            return self._variable(
+                shape=(len(index), len(techs)),
+                nonneg=True,
+                name=name,
+                keys=(reg, key),
+                index=index,
+                columns=techs,
+            )
+
+        fixed = self.presolve.fixed[reg][key]
+        active = [tech for tech, is_fixed in zip(techs, fixed) if not is_fixed]
+        self.presolve.eliminated["variables"] += len(index) * (
+            len(techs) - len(active)
+        )
+
+        variable = (
+            self._variable(
+                shape=(len(index), len(active)),
+                nonneg=True,
+                name=name,
+                keys=(reg, key),
+                index=index,
+                columns=active,
+            )
+            @ selection
+        )
+        self.blocks[(name, reg, key)] = variable
+
+        return variable
+
+    def _variable_values(self):
+
+        """
+        Gives the values of the variables of the solved problem by their name
+        and labels, taken from the solution at once
+        """
+
+        return dict(zip(self.blocks, algebra.values(list(self.blocks.values()))))
+
+    def _parameter(self, name, compute):
+
+        """
+        Creates a parameter of the problem with the value computed from the
+        input data. Products of several inputs are computed in one parameter
+        to keep the CVXPY problem DPP-compliant. Without parametrization the
+        values are used directly as constants
+        """
+
+        value = np.asarray(compute(), dtype=float)
+
+        if not self.parametrize:
+            return value
+
+        parameter = cp.Parameter(shape=value.shape, value=value)
+        self.parameters[name] = (parameter, compute)
+
+        return parameter
+
+    def _data_parameter(self, reg, name, key):
+
+        """
+        Creates the parameter of a regional input for the technologies of a
+        category
+        """
+
+        return self._parameter(
+            (name, reg, key), lambda: self.sets.arrays.regional(reg, name, key)
+        )
+
+    def _trade_parameter(self, name, key):
+
+        """
+        Creates the parameter of an input of the inter-regional links
+        """
 
-            res.extend(to_add)
-            result_collector = namedtuple("result", res)
-            results = result_collector(
-                **{result: getattr(self, result) for result in res}
+        return self._parameter(
+            (name, key), lambda: self.sets.arrays.trade(name, key)
+        )
+
+    def _global_parameter(self, name, key):
+
+        """
+        Creates the parameter of a global input of a technology
+        """
+
+        return self._parameter(
+            (name, key), lambda: self.sets.arrays.glob(name, key)
+        )
+
+    def _availability_parameters(self, reg, key, year):
+
+        """
+        Creates the parameters of the available production per unit of total
+        capacity of the technologies of a category in each timestep of a year
+        due to the resource availability, and of their annual available
+        production due to the technology capacity factor
+        """
+
+        arrays = self.sets.arrays
+        indx = self.sets.main_years.index(year)
+        n_steps = len(self.sets.time_steps)
+
+        def availability():
+            return resource_availability_factor(
+                arrays.regional(reg, "res_capacity_factor", key)[
+                    indx * n_steps : (indx + 1) * n_steps
+                ],
+                self.timeslice_fraction,
+                arrays.regional(reg, "annualprod_per_unitcapacity", key),
             )
 
-            return results
+        def annual_availability():
+            return np.multiply(
+                np.sum(availability(), axis=0, keepdims=True),
+                arrays.regional(reg, "tech_capacity_factor", key)[indx : indx + 1],
+            )
+
+        return (
+            self._parameter(("availability", reg, key, year), availability),
+            self._parameter(
+                ("annual_availability", reg, key, year), annual_availability
+            ),
+        )
+
+    def _storage_flow_parameter(self, reg, time, indx):
+
+        """
+        Creates the parameter of the maximum storage inflow or outflow per unit
+        of total capacity in each timestep of a year
+        """
+
+        arrays = self.sets.arrays
+
+        return self._parameter(
+            (time, reg, indx),
+            lambda: storage_flow_factor(
+                arrays.regional(reg, time),
+                arrays.regional(reg, "tech_capacity_factor", "Storage")[
+                    indx : indx + 1
+                ],
+                self.timeslice_fraction,
+            ),
+        )
+
+    def _cost_parameters(self, reg, key, cost, taxsub):
+
+        """
+        Creates the parameters of a specific cost of the technologies of a
+        category and of its specific taxes and subsidies
+        """
+
+        arrays = self.sets.arrays
+
+        return (
+            self._data_parameter(reg, cost, key),
+            self._parameter(
+                (taxsub, "Tax", reg, key),
+                lambda: specific_taxsub(
+                    arrays.regional(reg, cost, key),
+                    arrays.regional(reg, taxsub, ("Tax", key)),
+                ),
+            ),
+            self._parameter(
+                (taxsub, "Sub", reg, key),
+                lambda: specific_taxsub(
+                    arrays.regional(reg, cost, key),
+                    arrays.regional(reg, taxsub, ("Sub", key)),
+                ),
+            ),
+        )
+
+    def _emission_parameters(self, reg, key):
+
+        """
+        Creates the parameters of the specific emission of the technologies of
+        a category and of their specific emission cost
+        """
+
+        arrays = self.sets.arrays
+
+        return (
+            self._data_parameter(reg, "specific_emission", key),
+            self._parameter(
+                ("emission_cost", reg, key),
+                lambda: np.multiply(
+                    arrays.regional(reg, "specific_emission", key),
+                    arrays.regional(reg, "carbon_tax", key),
+                ),
+            ),
+        )
+
+    @_timed
+    def _update_parameters(self):
+
+        """
+        Computes the values of all the parameters again from the input data
+        """
+
+        # the timings of the next solve are only of the update
+        self.timings = {}
+        self.sets.arrays.clear()
+        for parameter, compute in self.parameters.values():
+            parameter.value = np.asarray(compute(), dtype=float)
+
+    def _solve(self, verbosity, solver, **kwargs):
+
+        """
+        Creates a CVXPY problem instance or assembles the sparse linear
+        program, if the output status is optimal, returns the results to
+        the interface
+        """
+
+        if self.engine == "sparse":
+            status = self.program.solve(
+                self.global_objective,
+                self.constr,
+                method=SPARSE_SOLVERS[solver],
+                verbose=verbosity,
+                **kwargs,
+            )
+            self.stats = dict(self.program.stats)
+
+        else:
+            start = time.perf_counter()
+            if self.problem is None:
+                objective = cp.Minimize(self.global_objective)
+                self.problem = cp.Problem(objective, self.constr)
+
+            # the problem is compiled first to time it apart from the solver,
+            # the solve reuses the compiled problem kept by CVXPY
+            data, _, _ = self.problem.get_problem_data(solver)
+            nonzeros = sum(value.nnz for value in data.values() if sp.issparse(value))
+            del data
+            compiled = time.perf_counter()
+
+            self.problem.solve(solver=solver, verbose=verbosity, **kwargs)
+            status = self.problem.status
+
+            metrics = self.problem.size_metrics
+            self.stats = {
+                "canonicalization": compiled - start,
+                "solver": time.perf_counter() - compiled,
+                "variables": int(metrics.num_scalar_variables),
+                "constraints": int(
+                    metrics.num_scalar_eq_constr + metrics.num_scalar_leq_constr
+                ),
+                "nonzeros": int(nonzeros),
+            }
+
+        if self.presolve is not None:
+            for size, value in self.presolve.eliminated.items():
+                self.stats[f"eliminated_{size}"] = value
+
+        if status == "optimal":
+
+            if self.engine == "cvxpy":
+                # the derived results are evaluated with NumPy from the values
+                # of the variables, instead of one CVXPY expression at a time
+                solution = self._variable_values()
+                return BuildModel(self.sets, solution=solution)._results()
+
+            return self._results()
 
         else:
             print(
@@ -193,6 +651,66 @@ class BuildModel:
                 "critical",
             )
 
+    def _results(self):
+
+        """
+        Collects the variables and the derived expressions of the solved
+        problem to be returned to the interface
+        """
+
+        # Reshape the demand
+        self.demand = {reg: self.sets.data[reg]["demand"] for reg in self.sets.regions}
+
+        res = RESULTS.copy()
+        to_add = []
+        if self.sets.multi_node:
+            if self.sets.mode == "Planning":
+                to_add = [
+                    "line_totalcapacity",
+                    "line_decommissioned_capacity",
+                    "cost_inv_line",
+                    "cost_fix_line",
+                    "cost_decom_line",
+                    "cost_variable_line",
+                ]
+            else:
+                to_add = [
+                    "line_totalcapacity",
+                    "cost_fix_line",
+                    "cost_variable_line",
+                ]
+        if self.sets.mode == "Planning":
+            to_add.extend(PLANNING_RESULTS)
+
+        res.extend(to_add)
+        result_collector = namedtuple("result", res)
+        results = result_collector(**{result: getattr(self, result) for result in res})
+
+        return results
+
+    def _export(self, path, format):
+
+        """
+        Writes the sparse linear program of the model to an MPS or LP file
+        """
+
+        writer = write_mps if format == "mps" else write_lp
+        writer(
+            path, self.program, self.global_objective, self.constr, self.constr_names
+        )
+
+    def _load_solution(self, path):
+
+        """
+        Loads the primal solution of an external solver into the sparse
+        linear program and returns the results to the interface
+        """
+
+        self.program.solution = read_solution(path, self.program)
+
+        return self._results()
+
+    @_timed
     def _set_variables(self):
 
         """
@@ -207,6 +725,11 @@ class BuildModel:
         line_import = {}
         line_export = {}
 
+        year_slices = [
+            f"{year},{time_step}"
+            for year in self.sets.main_years
+            for time_step in self.sets.time_steps
+        ]
         for reg in self.sets.regions:
             regional_prod = {}
             regional_use = {}
@@ -214,47 +737,44 @@ class BuildModel:
 
                 if key != "Demand":
 
-                    regional_prod[key] = cp.Variable(
-                        shape=(
-                            len(self.sets.main_years) * len(self.sets.time_steps),
-                            len(self.sets.Technologies[reg][key]),
-                        ),
-                        nonneg=True,
+                    regional_prod[key] = self._technology_variable(
+                        "productionbyTechnology", reg, key, year_slices
                     )
                 if key != "Demand" and key != "Supply":
-                    regional_use[key] = cp.Variable(
-                        shape=(
-                            len(self.sets.main_years) * len(self.sets.time_steps),
-                            len(self.sets.Technologies[reg][key]),
-                        ),
-                        nonneg=True,
+                    regional_use[key] = self._technology_variable(
+                        "usebyTechnology", reg, key, year_slices
                     )
 
             technology_prod[reg] = regional_prod
             technology_use[reg] = regional_use
 
             export_ = {}
-            import_ = {}
             for reg_ in self.sets.regions:
 
-                if reg_ != reg:
-                    export_[reg_] = cp.Variable(
+                # only the declared links with their carriers are traded
+                line = self._line(reg, reg_)
+                if line is not None:
+                    line_carriers = self.sets.line_carriers[line]
+                    export_[reg_] = self._variable(
                         shape=(
                             len(self.sets.main_years) * len(self.sets.time_steps),
-                            len(self.sets.glob_mapping["Carriers_glob"].index),
-                        ),
-                        nonneg=True,
-                    )
-                    import_[reg_] = cp.Variable(
-                        shape=(
-                            len(self.sets.main_years) * len(self.sets.time_steps),
-                            len(self.sets.glob_mapping["Carriers_glob"].index),
+                            len(line_carriers),
                         ),
                         nonneg=True,
+                        name="line_flow",
+                        keys=(reg, reg_),
+                        index=year_slices,
+                        columns=line_carriers,
                     )
 
             line_export[reg] = export_
-            line_import[reg] = import_
+
+        # each direction of a link has a single flow, exported by one region
+        # and imported, before the losses, by the other
+        for reg in self.sets.regions:
+            line_import[reg] = {
+                reg_: line_export[reg_][reg] for reg_ in line_export[reg]
+            }
 
         self.variables = {
             "productionbyTechnology": technology_prod,
@@ -275,12 +795,8 @@ class BuildModel:
 
                     if key != "Demand":
 
-                        regional_newcap[key] = cp.Variable(
-                            shape=(
-                                len(self.sets.main_years),
-                                len(self.sets.Technologies[reg][key]),
-                            ),
-                            nonneg=True,
+                        regional_newcap[key] = self._technology_variable(
+                            "newcapacity", reg, key, self.sets.main_years
                         )
 
                 new_capacity[reg] = regional_newcap
@@ -291,16 +807,39 @@ class BuildModel:
 
                 for line in self.sets.lines_list:
 
-                    line_newcapacity[line] = cp.Variable(
+                    line_newcapacity[line] = self._variable(
                         shape=(
                             len(self.sets.main_years),
-                            len(self.sets.glob_mapping["Carriers_glob"].index),
+                            len(self.sets.line_carriers[line]),
                         ),
                         nonneg=True,
+                        name="line_newcapacity",
+                        keys=(line,),
+                        index=self.sets.main_years,
+                        columns=self.sets.line_carriers[line],
                     )
 
                 self.variables.update({"line_newcapacity": line_newcapacity})
 
+    @_timed
+    def _calc_production_annual(self):
+
+        """
+        Calculates the annual production of each technology within each region
+        once, to be shared by the cost, emission and annual production limit
+        calculations
+        """
+
+        self.production_annual = {}
+
+        for reg in self.sets.regions:
+
+            self.production_annual[reg] = {
+                key: annual_activity(value, self.sets.main_years, self.sets.time_steps)
+                for key, value in self.variables["productionbyTechnology"][reg].items()
+            }
+
+    @_timed
     def _calc_variable_planning(self):
 
         """
@@ -323,7 +862,8 @@ class BuildModel:
         self.cost_variable = {}
         self.CO2_equivalent = {}
         self.emission_cost = {}
-        self.production_annual = {}
+
+        arrays = self.sets.arrays
 
         for reg in self.sets.regions:
 
@@ -342,29 +882,29 @@ class BuildModel:
             cost_variable_regional = {}
             CO2_equivalent_regional = {}
             emission_cost_regional = {}
-            production_annual_regional = {}
 
             for key in self.variables["newcapacity"][reg].keys():
 
+                inv, inv_tax, inv_sub = self._cost_parameters(
+                    reg, key, "tech_inv", "inv_taxsub"
+                )
+
                 (
                     cost_inv_regional[key],
                     cost_inv_tax_regional[key],
                     cost_inv_sub_regional[key],
                 ) = invcosts(
-                    self.sets.data[reg]["tech_inv"][key],
-                    self.variables["newcapacity"][reg][key],
-                    self.sets.data[reg]["inv_taxsub"]["Tax"][key],
-                    self.sets.data[reg]["inv_taxsub"]["Sub"][key],
+                    inv, self.variables["newcapacity"][reg][key], inv_tax, inv_sub,
                 )
 
-                salvage_inv_regional[key] = cp.multiply(
+                salvage_inv_regional[key] = algebra.multiply(
                     salvage_factor(
                         self.sets.main_years,
                         self.sets.Technologies[reg][key],
-                        self.sets.data[reg]["tech_lifetime"].loc[:, key],
-                        self.sets.data[reg]["interest_rate"].loc[:, key],
-                        self.sets.data[reg]["discount_rate"],
-                        self.sets.data[reg]["economic_lifetime"].loc[:, key],
+                        arrays.regional(reg, "tech_lifetime", key),
+                        arrays.regional(reg, "interest_rate", key),
+                        arrays.regional(reg, "discount_rate"),
+                        arrays.regional(reg, "economic_lifetime", key),
                     ),
                     cost_inv_regional[key],
                 )
@@ -373,67 +913,61 @@ class BuildModel:
                     self.variables["newcapacity"][reg][key],
                     self.sets.Technologies[reg][key],
                     self.sets.main_years,
-                    self.sets.data[reg]["tech_lifetime"].loc[:, key],
+                    arrays.regional(reg, "tech_lifetime", key),
                 )
 
-                totalcapacity_regional[key] = (
-                    accumulated_newcapacity_regional[key]
-                    + self.sets.data[reg]["tech_residual_cap"].loc[:, key]
+                totalcapacity_regional[key] = accumulated_newcapacity_regional[
+                    key
+                ] + arrays.regional(reg, "tech_residual_cap", key)
+
+                fix, fix_tax, fix_sub = self._cost_parameters(
+                    reg, key, "tech_fixed_cost", "fix_taxsub"
                 )
 
                 (
                     cost_fix_regional[key],
                     cost_fix_tax_regional[key],
                     cost_fix_Sub_regional[key],
-                ) = fixcosts(
-                    self.sets.data[reg]["tech_fixed_cost"][key],
-                    totalcapacity_regional[key],
-                    self.sets.data[reg]["fix_taxsub"]["Tax"][key],
-                    self.sets.data[reg]["fix_taxsub"]["Sub"][key],
-                )
+                ) = fixcosts(fix, totalcapacity_regional[key], fix_tax, fix_sub)
 
                 decomcapacity_regional[key] = decomcap(
                     self.variables["newcapacity"][reg][key],
                     self.sets.Technologies[reg][key],
                     self.sets.main_years,
-                    self.sets.data[reg]["tech_lifetime"].loc[:, key],
+                    arrays.regional(reg, "tech_lifetime", key),
                 )
 
-                cost_decom_regional[key] = cp.multiply(
-                    self.sets.data[reg]["tech_decom_cost"].loc[:, key].values,
+                cost_decom_regional[key] = algebra.multiply(
+                    self._data_parameter(reg, "tech_decom_cost", key),
                     decomcapacity_regional[key],
                 )
 
-                production_annual_regional[key] = annual_activity(
-                    self.variables["productionbyTechnology"][reg][key],
-                    self.sets.main_years,
-                    self.sets.time_steps,
-                )
-
-                cost_variable_regional[key] = cp.multiply(
-                    production_annual_regional[key],
-                    self.sets.data[reg]["tech_var_cost"].loc[:, key],
+                cost_variable_regional[key] = algebra.multiply(
+                    self.production_annual[reg][key],
+                    self._data_parameter(reg, "tech_var_cost", key),
                 )
 
                 if key != "Transmission" and key != "Storage":
 
-                    CO2_equivalent_regional[key] = cp.multiply(
-                        production_annual_regional[key],
-                        self.sets.data[reg]["specific_emission"].loc[:, key],
+                    specific_emission, emission_cost = self._emission_parameters(
+                        reg, key
                     )
 
-                    emission_cost_regional[key] = cp.multiply(
-                        CO2_equivalent_regional[key],
-                        self.sets.data[reg]["carbon_tax"].loc[:, key],
+                    CO2_equivalent_regional[key] = algebra.multiply(
+                        self.production_annual[reg][key], specific_emission
+                    )
+
+                    emission_cost_regional[key] = algebra.multiply(
+                        self.production_annual[reg][key], emission_cost
                     )
 
                 cost_fvalue_regional[key] = invcosts_annuity(
                     cost_inv_regional[key],
-                    self.sets.data[reg]["interest_rate"].loc[:, key],
-                    self.sets.data[reg]["economic_lifetime"].loc[:, key],
+                    arrays.regional(reg, "interest_rate", key),
+                    arrays.regional(reg, "economic_lifetime", key),
                     self.sets.Technologies[reg][key],
                     self.sets.main_years,
-                    self.sets.data[reg]["discount_rate"],
+                    arrays.regional(reg, "discount_rate"),
                 )
 
             self.cost_inv[reg] = cost_inv_regional
@@ -450,8 +984,8 @@ class BuildModel:
             self.CO2_equivalent[reg] = CO2_equivalent_regional
             self.emission_cost[reg] = emission_cost_regional
             self.cost_inv_fvalue[reg] = cost_fvalue_regional
-            self.production_annual[reg] = production_annual_regional
 
+    @_timed
     def _calc_variable_planning_line(self):
 
         """
@@ -468,42 +1002,44 @@ class BuildModel:
 
         for key in self.variables["line_newcapacity"].keys():
 
-            self.cost_inv_line[key] = cp.multiply(
-                self.sets.trade_data["line_inv"].loc[:, key].values,
+            self.cost_inv_line[key] = algebra.multiply(
+                self._trade_parameter("line_inv", key),
                 self.variables["line_newcapacity"][key],
             )
 
             self.line_accumulated_newcapacity[key] = line_newcap_accumulated(
                 self.variables["line_newcapacity"][key],
-                self.sets.glob_mapping["Carriers_glob"]["Carrier"],
+                self.sets.line_carriers[key],
                 self.sets.main_years,
-                self.sets.trade_data["line_lifetime"].loc[:, key],
+                self.sets.arrays.trade("line_lifetime", key),
             )
 
-            self.line_totalcapacity[key] = (
-                self.line_accumulated_newcapacity[key]
-                + self.sets.trade_data["line_residual_cap"].loc[:, key].values
-            )
+            self.line_totalcapacity[key] = self.line_accumulated_newcapacity[
+                key
+            ] + self.sets.arrays.trade("line_residual_cap", key)
 
-            self.cost_fix_line[key] = cp.multiply(
-                self.sets.trade_data["line_fixed_cost"].loc[:, key].values,
+            self.cost_fix_line[key] = algebra.multiply(
+                self._trade_parameter("line_fixed_cost", key),
                 self.line_totalcapacity[key],
             )
 
             self.line_decommissioned_capacity[key] = line_decomcap(
                 self.variables["line_newcapacity"][key],
-                self.sets.glob_mapping["Carriers_glob"]["Carrier"],
+                self.sets.line_carriers[key],
                 self.sets.main_years,
-                self.sets.trade_data["line_lifetime"].loc[:, key],
+                self.sets.arrays.trade("line_lifetime", key),
             )
 
-            self.cost_decom_line[key] = cp.multiply(
-                self.sets.trade_data["line_decom_cost"].loc[:, key].values,
+            self.cost_decom_line[key] = algebra.multiply(
+                self._trade_parameter("line_decom_cost", key),
                 self.line_decommissioned_capacity[key],
             )
 
         self.cost_variable_line = line_varcost(
-            self.sets.trade_data["line_var_cost"],
+            {
+                line: self.sets.arrays.trade("line_var_cost", line)
+                for line in self.sets.lines_list
+            },
             self.variables["line_import"],
             self.sets.regions,
             self.sets.main_years,
@@ -511,6 +1047,7 @@ class BuildModel:
             self.sets.lines_list,
         )
 
+    @_timed
     def _calc_variable_operation(self):
 
         """
@@ -525,7 +1062,6 @@ class BuildModel:
         self.cost_variable = {}
         self.CO2_equivalent = {}
         self.emission_cost = {}
-        self.production_annual = {}
         for reg in self.sets.regions:
 
             totalcapacity_regional = {}
@@ -535,48 +1071,42 @@ class BuildModel:
             cost_variable_regional = {}
             CO2_equivalent_regional = {}
             emission_cost_regional = {}
-            production_annual_regional = {}
 
             for key in self.sets.Technologies[reg].keys():
 
                 if key != "Demand":
 
-                    totalcapacity_regional[key] = (
-                        self.sets.data[reg]["tech_residual_cap"].loc[:, key].values
+                    totalcapacity_regional[key] = self.sets.arrays.regional(
+                        reg, "tech_residual_cap", key
+                    )
+
+                    fix, fix_tax, fix_sub = self._cost_parameters(
+                        reg, key, "tech_fixed_cost", "fix_taxsub"
                     )
 
                     (
                         cost_fix_regional[key],
                         cost_fix_tax_regional[key],
                         cost_fix_Sub_regional[key],
-                    ) = fixcosts(
-                        self.sets.data[reg]["tech_fixed_cost"][key],
-                        totalcapacity_regional[key],
-                        self.sets.data[reg]["fix_taxsub"]["Tax"][key],
-                        self.sets.data[reg]["fix_taxsub"]["Sub"][key],
-                    )
-
-                    production_annual_regional[key] = annual_activity(
-                        self.variables["productionbyTechnology"][reg][key],
-                        self.sets.main_years,
-                        self.sets.time_steps,
-                    )
+                    ) = fixcosts(fix, totalcapacity_regional[key], fix_tax, fix_sub)
 
-                    cost_variable_regional[key] = cp.multiply(
-                        production_annual_regional[key],
-                        self.sets.data[reg]["tech_var_cost"].loc[:, key],
+                    cost_variable_regional[key] = algebra.multiply(
+                        self.production_annual[reg][key],
+                        self._data_parameter(reg, "tech_var_cost", key),
                     )
 
                     if key != "Transmission" and key != "Storage":
 
-                        CO2_equivalent_regional[key] = cp.multiply(
-                            production_annual_regional[key],
-                            self.sets.data[reg]["specific_emission"].loc[:, key],
+                        specific_emission, emission_cost = self._emission_parameters(
+                            reg, key
+                        )
+
+                        CO2_equivalent_regional[key] = algebra.multiply(
+                            self.production_annual[reg][key], specific_emission
                         )
 
-                        emission_cost_regional[key] = cp.multiply(
-                            CO2_equivalent_regional[key],
-                            self.sets.data[reg]["carbon_tax"].loc[:, key],
+                        emission_cost_regional[key] = algebra.multiply(
+                            self.production_annual[reg][key], emission_cost
                         )
 
             self.totalcapacity[reg] = totalcapacity_regional
@@ -586,8 +1116,8 @@ class BuildModel:
             self.cost_variable[reg] = cost_variable_regional
             self.CO2_equivalent[reg] = CO2_equivalent_regional
             self.emission_cost[reg] = emission_cost_regional
-            self.production_annual[reg] = production_annual_regional
 
+    @_timed
     def _calc_variable_operation_line(self):
 
         """
@@ -599,16 +1129,19 @@ class BuildModel:
         self.cost_fix_line = {}
         for key in self.sets.lines_list:
 
-            self.line_totalcapacity[key] = (
-                self.sets.trade_data["line_residual_cap"].loc[:, key].values
+            self.line_totalcapacity[key] = self.sets.arrays.trade(
+                "line_residual_cap", key
             )
-            self.cost_fix_line[key] = cp.multiply(
-                self.sets.trade_data["line_fixed_cost"].loc[:, key].values,
+            self.cost_fix_line[key] = algebra.multiply(
+                self._trade_parameter("line_fixed_cost", key),
                 self.line_totalcapacity[key],
             )
 
         self.cost_variable_line = line_varcost(
-            self.sets.trade_data["line_var_cost"],
+            {
+                line: self.sets.arrays.trade("line_var_cost", line)
+                for line in self.sets.lines_list
+            },
             self.variables["line_import"],
             self.sets.regions,
             self.sets.main_years,
@@ -616,6 +1149,7 @@ class BuildModel:
             self.sets.lines_list,
         )
 
+    @_timed
     def _calc_variable_storage_SOC(self):
 
         """
@@ -628,21 +1162,27 @@ class BuildModel:
         for reg in get_regions_with_storage(self.sets):
 
             self.storage_SOC[reg] = storage_state_of_charge(
-                self.sets.data[reg]["storage_initial_SOC"],
+                self.sets.arrays.regional(reg, "storage_initial_SOC"),
                 self.variables["usebyTechnology"][reg]["Storage"],
                 self.variables["productionbyTechnology"][reg]["Storage"],
                 self.sets.main_years,
                 self.sets.time_steps,
-                self.sets.data[reg]["storage_charge_efficiency"],
-                self.sets.data[reg]["storage_discharge_efficiency"],
+                self.sets.arrays.regional(
+                    reg, "storage_charge_efficiency", timesteps=True
+                ),
+                self.sets.arrays.regional(
+                    reg, "storage_discharge_efficiency", timesteps=True
+                ),
             )
 
+    @_timed
     def _balance_(self):
 
         """
         Creates the dictionaries for the annual total production by each technology,
         total consumption by each technology, total import,total exports and total final demand
-        of each energy carrier within each region
+        of each energy carrier within each region, as (timesteps x carriers)
+        expressions built with one incidence matrix product per technology category
         """
 
         self.totalusebycarrier = {}
@@ -651,146 +1191,68 @@ class BuildModel:
         self.totalexportbycarrier = {}
         self.totaldemandbycarrier = {}
 
+        carriers = list(self.sets.glob_mapping["Carriers_glob"]["Carrier"])
+        shape = (len(self.sets.main_years) * len(self.sets.time_steps), len(carriers))
+
         for reg in self.sets.regions:
 
-            totalusebycarrier_regional = {}
-            totalprodbycarrier_regional = {}
-            totalimportbycarrier_regional = {}
-            totalexportbycarrier_regional = {}
-            totaldemandbycarrier_regional = {}
+            incidence = self.sets.carrier_incidence[reg]
 
-            for carr in self.sets.glob_mapping["Carriers_glob"]["Carrier"]:
+            totalusebycarrier_regional = np.zeros(shape)
+            totalprodbycarrier_regional = np.zeros(shape)
+            totalimportbycarrier_regional = np.zeros(shape)
+            totalexportbycarrier_regional = np.zeros(shape)
+            totaldemandbycarrier_regional = np.zeros(shape)
 
-                totalusebycarrier_regional[carr] = np.zeros(
-                    (len(self.sets.main_years) * len(self.sets.time_steps),)
-                )
-                totalprodbycarrier_regional[carr] = np.zeros(
-                    (len(self.sets.main_years) * len(self.sets.time_steps),)
-                )
-                totalimportbycarrier_regional[carr] = np.zeros(
-                    (len(self.sets.main_years) * len(self.sets.time_steps),)
-                )
-                totalexportbycarrier_regional[carr] = np.zeros(
-                    (len(self.sets.main_years) * len(self.sets.time_steps),)
-                )
-                totaldemandbycarrier_regional[carr] = np.zeros(
-                    (len(self.sets.main_years) * len(self.sets.time_steps),)
+            for key, matrix in incidence["in"].items():
+
+                if key == "Demand":
+
+                    totaldemandbycarrier_regional = (
+                        totaldemandbycarrier_regional
+                        + self._demand_parameter(reg, matrix)
+                    )
+
+                elif key != "Supply":
+
+                    totalusebycarrier_regional = (
+                        totalusebycarrier_regional
+                        + self._carrier_flow(
+                            self.variables["usebyTechnology"][reg][key], matrix, key
+                        )
+                    )
+
+            for key, matrix in incidence["out"].items():
+
+                totalprodbycarrier_regional = (
+                    totalprodbycarrier_regional
+                    + self._carrier_flow(
+                        self.variables["productionbyTechnology"][reg][key], matrix, key
+                    )
                 )
 
-                for key in self.sets.Technologies[reg].keys():
+            if len(self.sets.regions) > 1:
 
-                    for indx, tech in enumerate(self.sets.Technologies[reg][key]):
-
-                        if (
-                            carr
-                            in self.sets.mapping[reg]["Carrier_input"]
-                            .loc[
-                                self.sets.mapping[reg]["Carrier_input"]["Technology"]
-                                == tech
-                            ]["Carrier_in"]
-                            .values
-                        ):
-
-                            if key == "Conversion_plus":
-
-                                totalusebycarrier_regional[carr] += cp.multiply(
-                                    self.variables["usebyTechnology"][reg][key][
-                                        :, indx
-                                    ],
-                                    self.sets.data[reg]["carrier_ratio_in"][
-                                        (tech, carr)
-                                    ].values,
-                                )
-
-                            elif key == "Demand":
-
-                                totaldemandbycarrier_regional[carr] += self.sets.data[
-                                    reg
-                                ]["demand"][tech].values
-
-                            elif key != "Supply":
-
-                                totalusebycarrier_regional[carr] += self.variables[
-                                    "usebyTechnology"
-                                ][reg][key][:, indx]
-
-                        if (
-                            carr
-                            in self.sets.mapping[reg]["Carrier_output"]
-                            .loc[
-                                self.sets.mapping[reg]["Carrier_output"]["Technology"]
-                                == tech
-                            ]["Carrier_out"]
-                            .values
-                        ):
-                            if key == "Conversion_plus":
-
-                                totalprodbycarrier_regional[carr] += cp.multiply(
-                                    self.variables["productionbyTechnology"][reg][key][
-                                        :, indx
-                                    ],
-                                    self.sets.data[reg]["carrier_ratio_out"][
-                                        (tech, carr)
-                                    ].values,
-                                )
-                            else:
-
-                                totalprodbycarrier_regional[carr] += self.variables[
-                                    "productionbyTechnology"
-                                ][reg][key][:, indx]
-
-                if len(self.sets.regions) > 1:
-
-                    for key in self.variables["line_import"][reg].keys():
-
-                        if "{}-{}".format(reg, key) in self.sets.lines_list:
-
-                            line_eff = (
-                                pd.concat(
-                                    [
-                                        self.sets.trade_data["line_eff"][
-                                            ("{}-{}".format(reg, key), carr)
-                                        ]
-                                    ]
-                                    * len(self.sets.time_steps)
-                                )
-                                .sort_index()
-                                .values
-                            )
+                for key in self.variables["line_import"][reg].keys():
 
-                        elif "{}-{}".format(key, reg) in self.sets.lines_list:
-
-                            line_eff = (
-                                pd.concat(
-                                    [
-                                        self.sets.trade_data["line_eff"][
-                                            ("{}-{}".format(key, reg), carr)
-                                        ]
-                                    ]
-                                    * len(self.sets.time_steps)
-                                )
-                                .sort_index()
-                                .values
-                            )
+                    line = self._line(reg, key)
 
-                        totalimportbycarrier_regional[carr] += cp.multiply(
-                            self.variables["line_import"][reg][key][
-                                :,
-                                list(
-                                    self.sets.glob_mapping["Carriers_glob"]["Carrier"]
-                                ).index(carr),
-                            ],
-                            line_eff,
+                    line_eff = self.sets.arrays.trade("line_eff", line, timesteps=True)
+
+                    totalimportbycarrier_regional = (
+                        totalimportbycarrier_regional
+                        + self._line_flow(
+                            algebra.multiply(
+                                self.variables["line_import"][reg][key], line_eff
+                            ),
+                            line,
                         )
+                    )
 
-                        totalexportbycarrier_regional[carr] += self.variables[
-                            "line_export"
-                        ][reg][key][
-                            :,
-                            list(
-                                self.sets.glob_mapping["Carriers_glob"]["Carrier"]
-                            ).index(carr),
-                        ]
+                    totalexportbycarrier_regional = (
+                        totalexportbycarrier_regional
+                        + self._line_flow(self.variables["line_export"][reg][key], line)
+                    )
 
             self.totalusebycarrier[reg] = totalusebycarrier_regional
             self.totalprodbycarrier[reg] = totalprodbycarrier_regional
@@ -798,45 +1260,79 @@ class BuildModel:
             self.totalexportbycarrier[reg] = totalexportbycarrier_regional
             self.totaldemandbycarrier[reg] = totaldemandbycarrier_regional
 
-    def _constr_balance(self):
+    def _line(self, reg, other):
 
         """
-        Ensures the energy balance of each carrier within each region
+        Gives the name of the inter-regional link between two regions, or None
+        if they are not linked
         """
-        for reg in self.sets.regions:
-            for carr in self.sets.glob_mapping["Carriers_glob"]["Carrier"]:
 
-                self.totalusebycarrier[reg][carr] = cp.reshape(
-                    self.totalusebycarrier[reg][carr],
-                    self.totalprodbycarrier[reg][carr].shape,
-                )
+        line = "{}-{}".format(*sorted([reg, other]))
+        if reg != other and line in self.sets.line_carriers:
+            return line
 
-                self.constr.append(
-                    self.totalprodbycarrier[reg][carr]
-                    + self.totalimportbycarrier[reg][carr]
-                    - self.totalusebycarrier[reg][carr]
-                    - self.totalexportbycarrier[reg][carr]
-                    - self.totaldemandbycarrier[reg][carr]
-                    == 0
-                )
+        return None
 
-    def _constr_trade_balance(self):
+    def _line_flow(self, flow, line):
 
         """
-        Ensure sthe trade balance among any pairs of regions before the transmission
-        loss
+        Maps the flow of the carriers of an inter-regional link to the global
+        carriers
         """
 
-        for reg in self.sets.regions:
+        incidence = self.sets.line_incidence[line]
+        if incidence.shape[0] == incidence.shape[1]:
+            # the link transmits all the carriers
+            return flow
 
-            for key in self.variables["line_import"][reg].keys():
+        return flow @ incidence
 
-                self.constr.append(
-                    self.variables["line_import"][reg][key]
-                    - self.variables["line_export"][key][reg]
-                    == 0
-                )
+    def _demand_parameter(self, reg, incidence):
 
+        """
+        Creates the parameter of the final demand of each carrier within a
+        region, as (timesteps x carriers)
+        """
+
+        return self._parameter(
+            ("demand", reg),
+            lambda: self.sets.arrays.regional(reg, "demand") @ incidence,
+        )
+
+    def _carrier_flow(self, activity, incidence, key):
+
+        """
+        Maps the activity of the technologies of a category to the carriers
+        through their incidence matrix
+        """
+
+        if key == "Conversion_plus":
+
+            return algebra.reshape(
+                incidence @ algebra.vec(activity),
+                (activity.shape[0], incidence.shape[0] // activity.shape[0]),
+            )
+
+        return activity @ incidence
+
+    @_named_constraints
+    def _constr_balance(self):
+
+        """
+        Ensures the energy balance of each carrier within each region
+        """
+        for reg in self.sets.regions:
+
+            self.constr.append(
+                self.totalprodbycarrier[reg]
+                + self.totalimportbycarrier[reg]
+                - self.totalusebycarrier[reg]
+                - self.totalexportbycarrier[reg]
+                - self.totaldemandbycarrier[reg]
+                == 0
+            )
+
+    @_named_constraints
     def _constr_resource_tech_availability(self):
 
         """
@@ -852,15 +1348,14 @@ class BuildModel:
 
                     for indx, year in enumerate(self.sets.main_years):
 
+                        (
+                            availability,
+                            annual_availability,
+                        ) = self._availability_parameters(reg, key, year)
+
                         self.available_prod = available_resource_prod(
                             self.totalcapacity[reg][key][indx : indx + 1, :],
-                            self.sets.data[reg]["res_capacity_factor"]
-                            .loc[(year, slice(None)), (key, slice(None))]
-                            .values,
-                            self.timeslice_fraction,
-                            self.sets.data[reg]["annualprod_per_unitcapacity"]
-                            .loc[:, (key, slice(None))]
-                            .values,
+                            availability,
                         )
 
                         self.constr.append(
@@ -875,13 +1370,14 @@ class BuildModel:
                         )
 
                         self.constr.append(
-                            cp.multiply(
-                                cp.sum(self.available_prod, axis=0),
-                                self.sets.data[reg]["tech_capacity_factor"].loc[
-                                    year, (key, slice(None))
-                                ],
+                            algebra.sum(
+                                available_resource_prod(
+                                    self.totalcapacity[reg][key][indx : indx + 1, :],
+                                    annual_availability,
+                                ),
+                                axis=0,
                             )
-                            - cp.sum(
+                            - algebra.sum(
                                 self.variables["productionbyTechnology"][reg][key][
                                     indx
                                     * len(self.sets.time_steps) : (indx + 1)
@@ -893,6 +1389,7 @@ class BuildModel:
                             >= 0
                         )
 
+    @_named_constraints
     def _constr_line_availability(self):
 
         """
@@ -904,41 +1401,19 @@ class BuildModel:
 
             for key, value in self.variables["line_import"][reg].items():
 
-                for indx, year in enumerate(self.sets.main_years):
-
-                    if "{}-{}".format(reg, key) in self.sets.lines_list:
-
-                        capacity_factor = (
-                            self.sets.trade_data["line_capacity_factor"]
-                            .loc[year, ("{}-{}".format(reg, key), slice(None))]
-                            .values
-                        )
-                        capacity_to_production = (
-                            self.sets.trade_data["annualprod_per_unitcapacity"]
-                            .loc[:, ("{}-{}".format(reg, key), slice(None))]
-                            .values
-                        )
-                        capacity = self.line_totalcapacity["{}-{}".format(reg, key)][
-                            indx : indx + 1, :
-                        ]
+                line = self._line(reg, key)
 
-                    elif "{}-{}".format(key, reg) in self.sets.lines_list:
+                for indx, year in enumerate(self.sets.main_years):
 
-                        capacity_factor = (
-                            self.sets.trade_data["line_capacity_factor"]
-                            .loc[year, ("{}-{}".format(key, reg), slice(None))]
-                            .values
-                        )
-                        capacity_to_production = (
-                            self.sets.trade_data["annualprod_per_unitcapacity"]
-                            .loc[:, ("{}-{}".format(key, reg), slice(None))]
-                            .values
-                        )
-                        capacity = self.line_totalcapacity["{}-{}".format(key, reg)][
-                            indx : indx + 1, :
-                        ]
+                    capacity_to_production = self.sets.arrays.trade(
+                        "annualprod_per_unitcapacity", line
+                    )
+                    capacity_factor = self.sets.arrays.trade(
+                        "line_capacity_factor", line
+                    )[indx : indx + 1]
+                    capacity = self.line_totalcapacity[line][indx : indx + 1, :]
 
-                    line_import = cp.sum(
+                    line_import = algebra.sum(
                         value[
                             indx
                             * len(self.sets.time_steps) : (indx + 1)
@@ -947,12 +1422,13 @@ class BuildModel:
                         ],
                         axis=0,
                     )
-                    line_import = cp.reshape(line_import, capacity_to_production.shape)
-                    capacity_factor.shape = capacity_to_production.shape
+                    line_import = algebra.reshape(
+                        line_import, capacity_to_production.shape
+                    )
 
                     self.constr.append(
-                        cp.multiply(
-                            cp.multiply(capacity, capacity_to_production),
+                        algebra.multiply(
+                            algebra.multiply(capacity, capacity_to_production),
                             self.timeslice_fraction,
                         )
                         - value[
@@ -964,14 +1440,15 @@ class BuildModel:
                         >= 0
                     )
                     self.constr.append(
-                        cp.multiply(
-                            cp.multiply(capacity, capacity_factor),
+                        algebra.multiply(
+                            algebra.multiply(capacity, capacity_factor),
                             capacity_to_production,
                         )
                         - line_import
                         >= 0
                     )
 
+    @_named_constraints
     def _constr_totalcapacity_regional(self):
 
         """
@@ -982,14 +1459,16 @@ class BuildModel:
 
             for key, value in self.totalcapacity[reg].items():
 
-                self.constr.append(
-                    value - self.sets.data[reg]["tech_mintotcap"].loc[:, key].values
-                    >= 0
-                )
-                self.constr.append(
-                    value - self.sets.data[reg]["tech_maxtotcap"].loc[:, key] <= 0
-                )
+                if self._active_bound(value, "data", "tech_mintotcap", ">=", reg, key):
+                    self.constr.append(
+                        value - self._data_parameter(reg, "tech_mintotcap", key) >= 0
+                    )
+                if self._active_bound(value, "data", "tech_maxtotcap", "<=", reg, key):
+                    self.constr.append(
+                        value - self._data_parameter(reg, "tech_maxtotcap", key) <= 0
+                    )
 
+    @_named_constraints
     def _constr_totalcapacity_overall(self):
 
         """
@@ -1007,15 +1486,16 @@ class BuildModel:
 
         for tech, value in self.totalcapacity_overall.items():
 
-            self.constr.append(
-                value - self.sets.global_data["global_mintotcap"].loc[:, tech].values
-                >= 0
-            )
-            self.constr.append(
-                value - self.sets.global_data["global_maxtotcap"].loc[:, tech].values
-                <= 0
-            )
+            if self._active_bound(value, "global_data", "global_mintotcap", ">=", tech):
+                self.constr.append(
+                    value - self._global_parameter("global_mintotcap", tech) >= 0
+                )
+            if self._active_bound(value, "global_data", "global_maxtotcap", "<=", tech):
+                self.constr.append(
+                    value - self._global_parameter("global_maxtotcap", tech) <= 0
+                )
 
+    @_named_constraints
     def _constr_totalcapacity_line(self):
 
         """
@@ -1025,13 +1505,16 @@ class BuildModel:
 
         for key, value in self.line_totalcapacity.items():
 
-            self.constr.append(
-                value <= self.sets.trade_data["line_maxtotcap"][key].values
-            )
-            self.constr.append(
-                value >= self.sets.trade_data["line_mintotcap"][key].values
-            )
+            if self._active_bound(value, "trade_data", "line_maxtotcap", "<=", key):
+                self.constr.append(
+                    value <= self._trade_parameter("line_maxtotcap", key)
+                )
+            if self._active_bound(value, "trade_data", "line_mintotcap", ">=", key):
+                self.constr.append(
+                    value >= self._trade_parameter("line_mintotcap", key)
+                )
 
+    @_named_constraints
     def _constr_newcapacity_regional(self):
 
         """
@@ -1043,13 +1526,16 @@ class BuildModel:
 
             for key, value in self.variables["newcapacity"][reg].items():
 
-                self.constr.append(
-                    value >= self.sets.data[reg]["tech_min_newcap"].loc[:, key]
-                )
-                self.constr.append(
-                    value <= self.sets.data[reg]["tech_max_newcap"].loc[:, key]
-                )
+                if self._active_bound(value, "data", "tech_min_newcap", ">=", reg, key):
+                    self.constr.append(
+                        value >= self._data_parameter(reg, "tech_min_newcap", key)
+                    )
+                if self._active_bound(value, "data", "tech_max_newcap", "<=", reg, key):
+                    self.constr.append(
+                        value <= self._data_parameter(reg, "tech_max_newcap", key)
+                    )
 
+    @_named_constraints
     def _constr_newcapacity_overall(self):
 
         """
@@ -1066,13 +1552,20 @@ class BuildModel:
         )
 
         for tech, value in self.newcapacity_overall.items():
-            self.constr.append(
-                value - self.sets.global_data["global_min_newcap"].loc[:, tech] >= 0
-            )
-            self.constr.append(
-                value - self.sets.global_data["global_max_newcap"].loc[:, tech] <= 0
-            )
+            if self._active_bound(
+                value, "global_data", "global_min_newcap", ">=", tech
+            ):
+                self.constr.append(
+                    value - self._global_parameter("global_min_newcap", tech) >= 0
+                )
+            if self._active_bound(
+                value, "global_data", "global_max_newcap", "<=", tech
+            ):
+                self.constr.append(
+                    value - self._global_parameter("global_max_newcap", tech) <= 0
+                )
 
+    @_named_constraints
     def _constr_newcapacity_line(self):
 
         """
@@ -1082,9 +1575,10 @@ class BuildModel:
 
         for key, value in self.variables["newcapaciy"].items():
 
-            self.constr.append(value <= self.sets.trade_data["line_max_newcap"][key])
-            self.constr.append(value >= self.sets.trade_data["line_min_newcap"][key])
+            self.constr.append(value <= self.sets.arrays.trade("line_max_newcap", key))
+            self.constr.append(value >= self.sets.arrays.trade("line_min_newcap", key))
 
+    @_named_constraints
     def _constr_tech_efficiency(self):
 
         """
@@ -1098,20 +1592,20 @@ class BuildModel:
 
                 if key != "Supply" and key != "Storage":
 
-                    tech_efficiency_reshape = pd.concat(
-                        [self.sets.data[reg]["tech_efficiency"][key]]
-                        * len(self.sets.time_steps)
-                    ).sort_index()
+                    tech_efficiency = self.sets.arrays.regional(
+                        reg, "tech_efficiency", key, timesteps=True
+                    )
 
                     self.constr.append(
                         value
-                        - cp.multiply(
+                        - algebra.multiply(
                             self.variables["usebyTechnology"][reg][key],
-                            tech_efficiency_reshape.values,
+                            tech_efficiency,
                         )
                         == 0
                     )
 
+    @_named_constraints
     def _constr_prod_annual(self):
 
         """
@@ -1121,28 +1615,28 @@ class BuildModel:
 
         for reg in self.sets.regions:
 
-            for key, value in self.variables["productionbyTechnology"][reg].items():
+            for key, production_annual in self.production_annual[reg].items():
 
-                production_annual = annual_activity(
-                    value, self.sets.main_years, self.sets.time_steps,
-                )
                 if key != "Transmission" and key != "Storage":
 
-                    self.constr.append(
-                        production_annual
-                        - self.sets.data[reg]["tech_max_production"].loc[
-                            :, (key, slice(None))
-                        ]
-                        <= 0
-                    )
-                    self.constr.append(
-                        production_annual
-                        - self.sets.data[reg]["tech_min_production"].loc[
-                            :, (key, slice(None))
-                        ]
-                        >= 0
-                    )
+                    if self._active_bound(
+                        production_annual, "data", "tech_max_production", "<=", reg, key
+                    ):
+                        self.constr.append(
+                            production_annual
+                            - self._data_parameter(reg, "tech_max_production", key)
+                            <= 0
+                        )
+                    if self._active_bound(
+                        production_annual, "data", "tech_min_production", ">=", reg, key
+                    ):
+                        self.constr.append(
+                            production_annual
+                            - self._data_parameter(reg, "tech_min_production", key)
+                            >= 0
+                        )
 
+    @_named_constraints
     def _constr_prod(self):
 
         """
@@ -1158,19 +1652,16 @@ class BuildModel:
 
                     self.constr.append(
                         value
-                        - self.sets.data[reg]["tech_max_production_h"].loc[
-                            :, (key, slice(None))
-                        ]
+                        - self.sets.arrays.regional(reg, "tech_max_production_h", key)
                         <= 0
                     )
                     self.constr.append(
                         value
-                        - self.sets.data[reg]["tech_min_production_h"].loc[
-                            :, (key, slice(None))
-                        ]
+                        - self.sets.arrays.regional(reg, "tech_min_production_h", key)
                         >= 0
                     )
 
+    @_named_constraints
     def _constr_prod_annual_overall(self):
 
         """
@@ -1188,13 +1679,20 @@ class BuildModel:
 
         for tech, value in self.production_overall.items():
 
-            self.constr.append(
-                value - self.sets.global_data["global_min_production"].loc[:, tech] >= 0
-            )
-            self.constr.append(
-                value - self.sets.global_data["global_max_production"].loc[:, tech] <= 0
-            )
+            if self._active_bound(
+                value, "global_data", "global_min_production", ">=", tech
+            ):
+                self.constr.append(
+                    value - self._global_parameter("global_min_production", tech) >= 0
+                )
+            if self._active_bound(
+                value, "global_data", "global_max_production", "<=", tech
+            ):
+                self.constr.append(
+                    value - self._global_parameter("global_max_production", tech) <= 0
+                )
 
+    @_named_constraints
     def _constr_emission_cap(self):
 
         """
@@ -1212,25 +1710,39 @@ class BuildModel:
 
             for key, value in self.CO2_equivalent[reg].items():
 
-                self.regional_emission[reg] += cp.sum(value, axis=1)
+                self.regional_emission[reg] = self.regional_emission[reg] + algebra.sum(
+                    value, axis=1
+                )
 
-                emission_cap = self.sets.data[reg]["emission_cap_annual"].values
+            self.global_emission = self.global_emission + self.regional_emission[reg]
 
-                emission_cap.shape = self.regional_emission[reg].shape
+            if self._active_bound(
+                self.regional_emission[reg], "data", "emission_cap_annual", "<=", reg
+            ):
+                shape = self.regional_emission[reg].shape
+                emission_cap = self._parameter(
+                    ("emission_cap_annual", reg),
+                    lambda reg=reg, shape=shape: np.reshape(
+                        self.sets.arrays.regional(reg, "emission_cap_annual"), shape
+                    ),
+                )
 
-            self.global_emission += self.regional_emission[reg]
+                self.constr.append(emission_cap - self.regional_emission[reg] >= 0)
 
-            self.constr.append(emission_cap - self.regional_emission[reg] >= 0)
+        if len(self.sets.regions) > 1 and self._active_bound(
+            self.global_emission, "global_data", "global_emission_cap_annual", "<="
+        ):
 
-        if len(self.sets.regions) > 1:
-
-            global_emission_cap = self.sets.global_data[
-                "global_emission_cap_annual"
-            ].values
-            global_emission_cap.shape = self.global_emission.shape
+            global_emission_cap = self._parameter(
+                ("global_emission_cap_annual",),
+                lambda shape=self.global_emission.shape: np.reshape(
+                    self.sets.arrays.glob("global_emission_cap_annual"), shape
+                ),
+            )
 
             self.constr.append(global_emission_cap - self.global_emission >= 0)
 
+    @_named_constraints
     def _constr_storage_max_min_charge(self):
 
         """
@@ -1260,15 +1772,16 @@ class BuildModel:
                         * len(self.sets.time_steps),
                         :,
                     ]
-                    - cp.multiply(
+                    - algebra.multiply(
                         self.totalcapacity[reg]["Storage"][indx : indx + 1, :],
-                        self.sets.data[reg]["storage_min_SOC"].values[
-                            indx : indx + 1, :
+                        self.sets.arrays.regional(reg, "storage_min_SOC")[
+                            indx : indx + 1
                         ],
                     )
                     >= 0
                 )
 
+    @_named_constraints
     def _constr_storage_max_flow_in_out(self):
 
         """
@@ -1283,20 +1796,12 @@ class BuildModel:
 
                 max_storage_flow_in = storage_max_flow(
                     self.totalcapacity[reg]["Storage"][indx : indx + 1, :],
-                    self.sets.data[reg]["storage_charge_time"].values,
-                    self.sets.data[reg]["tech_capacity_factor"]["Storage"].values[
-                        indx : indx + 1, :
-                    ],
-                    self.timeslice_fraction,
+                    self._storage_flow_parameter(reg, "storage_charge_time", indx),
                 )
 
                 max_storage_flow_out = storage_max_flow(
                     self.totalcapacity[reg]["Storage"][indx : indx + 1, :],
-                    self.sets.data[reg]["storage_discharge_time"].values,
-                    self.sets.data[reg]["tech_capacity_factor"]["Storage"].values[
-                        indx : indx + 1, :
-                    ],
-                    self.timeslice_fraction,
+                    self._storage_flow_parameter(reg, "storage_discharge_time", indx),
                 )
 
                 self.constr.append(
@@ -1321,6 +1826,7 @@ class BuildModel:
                     >= 0
                 )
 
+    @_timed
     def _set_regional_objective_planning(self):
 
         """
@@ -1339,7 +1845,7 @@ class BuildModel:
 
                 if ctgry != "Demand":
 
-                    totalcost_regional += cp.sum(
+                    totalcost_regional = totalcost_regional + algebra.sum(
                         self.cost_inv_tax[reg][ctgry]
                         - self.cost_inv_sub[reg][ctgry]
                         + self.cost_fix[reg][ctgry]
@@ -1351,23 +1857,28 @@ class BuildModel:
                         axis=1,
                     )
 
-                    self.inv_allregions += self.cost_inv_fvalue[reg][ctgry]
+                    self.inv_allregions = (
+                        self.inv_allregions + self.cost_inv_fvalue[reg][ctgry]
+                    )
 
                     if ctgry != "Transmission" and ctgry != "Storage":
 
-                        totalcost_regional += cp.sum(
+                        totalcost_regional = totalcost_regional + algebra.sum(
                             self.emission_cost[reg][ctgry], axis=1
                         )
 
-            discount_factor = (
-                1 + self.sets.data[reg]["discount_rate"]["Annual Discount Rate"].values
+            discount_factor = 1 + np.ravel(
+                self.sets.arrays.regional(reg, "discount_rate")
             )
 
-            totalcost_regional_discounted = cp.multiply(
+            totalcost_regional_discounted = algebra.multiply(
                 totalcost_regional, np.power(discount_factor, years)
             )
-            self.totalcost_allregions += totalcost_regional_discounted
+            self.totalcost_allregions = (
+                self.totalcost_allregions + totalcost_regional_discounted
+            )
 
+    @_timed
     def _set_regional_objective_operation(self):
 
         """
@@ -1382,7 +1893,7 @@ class BuildModel:
 
                 if ctgry != "Demand":
 
-                    totalcost_regional += cp.sum(
+                    totalcost_regional = totalcost_regional + algebra.sum(
                         self.cost_fix[reg][ctgry]
                         + self.cost_fix_tax[reg][ctgry]
                         - self.cost_fix_sub[reg][ctgry]
@@ -1391,12 +1902,13 @@ class BuildModel:
 
                     if ctgry != "Transmission" and ctgry != "Storage":
 
-                        totalcost_regional += cp.sum(
+                        totalcost_regional = totalcost_regional + algebra.sum(
                             self.emission_cost[reg][ctgry], axis=1
                         )
 
-            self.totalcost_allregions += totalcost_regional
+            self.totalcost_allregions = self.totalcost_allregions + totalcost_regional
 
+    @_timed
     def _set_lines_objective_planning(self):
 
         """
@@ -1409,7 +1921,7 @@ class BuildModel:
 
         for line in self.sets.lines_list:
 
-            self.totalcost_lines += cp.sum(
+            self.totalcost_lines = self.totalcost_lines + algebra.sum(
                 self.cost_inv_line[line]
                 + self.cost_fix_line[line]
                 + self.cost_decom_line[line],
@@ -1420,19 +1932,17 @@ class BuildModel:
 
             for key, value in self.cost_variable_line[reg].items():
 
-                self.totalcost_lines += cp.sum(value, axis=1)
+                self.totalcost_lines = self.totalcost_lines + algebra.sum(value, axis=1)
 
-        discount_factor_global = (
-            1
-            + self.sets.global_data["global_discount_rate"][
-                "Annual Discount Rate"
-            ].values
+        discount_factor_global = 1 + np.ravel(
+            self.sets.arrays.glob("global_discount_rate")
         )
 
-        self.totalcost_lines_discounted = cp.multiply(
+        self.totalcost_lines_discounted = algebra.multiply(
             self.totalcost_lines, np.power(discount_factor_global, years)
         )
 
+    @_timed
     def _set_lines_objective_operation(self):
 
         """
@@ -1444,14 +1954,17 @@ class BuildModel:
 
         for line in self.sets.lines_list:
 
-            self.totalcost_lines += cp.sum(self.cost_fix_line[line], axis=1)
+            self.totalcost_lines = self.totalcost_lines + algebra.sum(
+                self.cost_fix_line[line], axis=1
+            )
 
         for reg in self.sets.regions:
 
             for key, value in self.cost_variable_line[reg].items():
 
-                self.totalcost_lines += cp.sum(value, axis=1)
+                self.totalcost_lines = self.totalcost_lines + algebra.sum(value, axis=1)
 
+    @_timed
     def _set_final_objective_singlenode(self):
 
         """
@@ -1461,13 +1974,14 @@ class BuildModel:
         if self.sets.mode == "Planning":
 
             self.global_objective = (
-                cp.sum(self.totalcost_allregions) + self.inv_allregions
+                algebra.sum(self.totalcost_allregions) + self.inv_allregions
             )
 
         elif self.sets.mode == "Operation":
 
             self.global_objective = self.totalcost_allregions
 
+    @_timed
     def _set_final_objective_multinode(self):
 
         """
@@ -1479,7 +1993,7 @@ class BuildModel:
         if self.sets.mode == "Planning":
 
             self.global_objective = (
-                cp.sum(self.totalcost_lines_discounted + self.totalcost_allregions)
+                algebra.sum(self.totalcost_lines_discounted + self.totalcost_allregions)
                 + self.inv_allregions
             )
 
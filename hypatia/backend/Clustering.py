@@ -0,0 +1,344 @@
+# -*- coding: utf-8 -*-
+"""
+This module contains the clustering of the hourly input profiles into
+representative periods, such as days or weeks, to reduce the number of
+timesteps of a model, and the disaggregation of the results of the clustered
+model back to the original timesteps.
+"""
+import copy
+from collections.abc import Mapping
+import numpy as np
+import pandas as pd
+
+# the timestep dependent inputs whose profiles define the clusters
+CLUSTERED_INPUTS = ["demand", "res_capacity_factor"]
+
+# the timestep dependent inputs given as energy per timestep, which are scaled
+# with the number of timesteps represented by a representative timestep
+ENERGY_INPUTS = ["demand", "tech_max_production_h", "tech_min_production_h"]
+
+# the results given as energy per timestep, the other timestep dependent
+# results, such as the carrier ratios, are only repeated when disaggregated
+ENERGY_RESULTS = ["production_by_tech", "use_by_tech", "imports", "exports", "demand"]
+
+
+def _squared_distances(features, centers):
+
+    return (
+        np.sum(features ** 2, axis=1)[:, np.newaxis]
+        - 2 * features @ centers.T
+        + np.sum(centers ** 2, axis=1)[np.newaxis, :]
+    )
+
+
+def _initial_centers(features, n_clusters, rng):
+
+    """
+    Chooses the initial centers among the features with the k-means++ seeding
+    """
+
+    centers = [rng.integers(len(features))]
+    for _ in range(1, n_clusters):
+        distances = _squared_distances(features, features[centers]).min(axis=1)
+        distances = np.maximum(distances, 0)
+        if distances.sum() == 0:
+            probabilities = None
+        else:
+            probabilities = distances / distances.sum()
+        centers.append(rng.choice(len(features), p=probabilities))
+
+    return np.array(centers)
+
+
+def kmeans(features, n_clusters, seed=0, n_init=10, max_iter=300):
+
+    """
+    Clusters the rows of the features with the k-means algorithm and returns
+    the cluster of each row and the centers of the clusters
+    """
+
+    rng = np.random.default_rng(seed)
+    best = None
+
+    for _ in range(n_init):
+
+        centers = features[_initial_centers(features, n_clusters, rng)]
+        for _ in range(max_iter):
+            labels = np.argmin(_squared_distances(features, centers), axis=1)
+            new_centers = np.array(
+                [
+                    features[labels == cluster].mean(axis=0)
+                    if np.any(labels == cluster)
+                    else centers[cluster]
+                    for cluster in range(n_clusters)
+                ]
+            )
+            if np.allclose(new_centers, centers):
+                break
+            centers = new_centers
+
+        inertia = np.sum((features - centers[labels]) ** 2)
+        if best is None or inertia < best[0]:
+            best = (inertia, labels, centers)
+
+    return best[1], best[2]
+
+
+def kmedoids(features, n_clusters, seed=0, max_iter=300):
+
+    """
+    Clusters the rows of the features with the k-medoids algorithm and returns
+    the cluster of each row and the row of the medoid of each cluster
+    """
+
+    rng = np.random.default_rng(seed)
+    distances = np.maximum(_squared_distances(features, features), 0)
+    medoids = _initial_centers(features, n_clusters, rng)
+
+    for _ in range(max_iter):
+        labels = np.argmin(distances[:, medoids], axis=1)
+        new_medoids = medoids.copy()
+        for cluster in range(n_clusters):
+            members = np.flatnonzero(labels == cluster)
+            if len(members):
+                costs = distances[np.ix_(members, members)].sum(axis=0)
+                new_medoids[cluster] = members[np.argmin(costs)]
+        if np.array_equal(new_medoids, medoids):
+            break
+        medoids = new_medoids
+
+    # the medoids are their own cluster even if they are repeated
+    labels = np.argmin(distances[:, medoids], axis=1)
+    labels[medoids] = np.arange(n_clusters)
+
+    return labels, medoids
+
+
+class TimeClusters:
+
+    """
+    The mapping between the original timesteps of a model and the
+    representative timesteps of its clustered version
+
+    Attributes
+    -----------
+    time_steps: list
+        The original timesteps
+
+    timeslice_fraction: numpy.ndarray
+        The original timeslice fractions
+
+    representative: numpy.ndarray
+        The position of the representative timestep of each original timestep
+
+    weights: numpy.ndarray
+        The number of original timesteps represented by each representative
+        timestep
+    """
+
+    def __init__(self, time_steps, timeslice_fraction, representative, weights):
+
+        self.time_steps = list(time_steps)
+        self.timeslice_fraction = np.ravel(timeslice_fraction)
+        self.representative = representative
+        self.weights = weights
+
+    def disaggregate(self, frame, energy=True):
+
+        """
+        Maps a DataFrame indexed by the years and the representative timesteps
+        to the original timesteps. The energy of a representative timestep is
+        divided among the timesteps it represents, other values are repeated
+        """
+
+        years = frame.index.get_level_values(0).unique()
+        n_steps = len(self.weights)
+        rows = np.concatenate(
+            [indx * n_steps + self.representative for indx in range(len(years))]
+        )
+        values = frame.values[rows]
+        if energy:
+            weights = np.tile(self.weights[self.representative], len(years))
+            values = values / weights[:, np.newaxis]
+
+        return pd.DataFrame(
+            data=values,
+            index=pd.MultiIndex.from_product(
+                [years, self.time_steps], names=frame.index.names
+            ),
+            columns=frame.columns,
+        )
+
+    def disaggregate_results(self, results):
+
+        """
+        Maps the timestep dependent results of a clustered model to the
+        original timesteps, the other results are kept as they are
+        """
+
+        def walk(value, energy):
+            if isinstance(value, Mapping):
+                return {key: walk(item, energy) for key, item in value.items()}
+            if (
+                isinstance(value.index, pd.MultiIndex)
+                and len(value) % len(self.weights) == 0
+            ):
+                return self.disaggregate(value, energy)
+            return value
+
+        disaggregated = {}
+        for item, value in results.items():
+            disaggregated[item] = walk(value, item in ENERGY_RESULTS)
+
+        return disaggregated
+
+
+def _periods(values, n_years, n_steps, period):
+
+    """
+    Splits the rows of a timestep dependent input into the full periods of
+    each year, as (years x periods x period x columns), and the remaining
+    timesteps of each year, as (years x remainder x columns)
+    """
+
+    n_periods = n_steps // period
+    values = values.reshape((n_years, n_steps, -1))
+
+    return (
+        values[:, : n_periods * period].reshape((n_years, n_periods, period, -1)),
+        values[:, n_periods * period :],
+    )
+
+
+def _features(sets, period):
+
+    """
+    Creates the features of the periods from the profiles of the clustered
+    inputs of all the regions and years, each column scaled by its maximum
+    """
+
+    n_years, n_steps = len(sets.main_years), len(sets.time_steps)
+    features = []
+
+    for reg in sets.regions:
+        for name in CLUSTERED_INPUTS:
+            if name not in sets.data[reg]:
+                continue
+            values = sets.data[reg][name].values.astype(float)
+            scale = np.abs(values).max(axis=0)
+            values = values / np.where(scale > 0, scale, 1)
+            full, _ = _periods(values, n_years, n_steps, period)
+            # (periods x years x period x columns) flattened per period
+            features.append(full.transpose((1, 0, 2, 3)).reshape((full.shape[1], -1)))
+
+    return np.hstack(features)
+
+
+def cluster_sets(sets, n_clusters, period=24, method="kmeans", seed=0):
+
+    """
+    Clusters the periods of the timesteps of a model into representative
+    periods and returns a copy of the sets and input data with the
+    representative timesteps, together with the mapping to the original
+    timesteps. The timesteps that do not fill a whole period at the end of the
+    year are kept as they are
+    """
+
+    n_years, n_steps = len(sets.main_years), len(sets.time_steps)
+    n_periods = n_steps // period
+    remainder = n_steps - n_periods * period
+
+    features = _features(sets, period)
+    if method == "kmeans":
+        labels, _ = kmeans(features, n_clusters, seed=seed)
+        medoids = None
+    else:
+        labels, medoids = kmedoids(features, n_clusters, seed=seed)
+
+    counts = np.bincount(labels, minlength=n_clusters)
+    clusters = np.flatnonzero(counts)
+
+    # weights and positions of the representative timesteps
+    weights = np.concatenate([np.repeat(counts[clusters], period), np.ones(remainder)])
+    position = np.full(n_clusters, -1)
+    position[clusters] = np.arange(len(clusters))
+    representative = np.concatenate(
+        [
+            (position[labels][:, np.newaxis] * period + np.arange(period)).ravel(),
+            len(clusters) * period + np.arange(remainder),
+        ]
+    )
+
+    def represent(values, energy):
+        full, rest = _periods(values, n_years, n_steps, period)
+        if medoids is None:
+            profiles = np.stack(
+                [full[:, labels == cluster].mean(axis=1) for cluster in clusters],
+                axis=1,
+            )
+        else:
+            profiles = full[:, medoids[clusters]]
+        if energy:
+            profiles = profiles * counts[clusters][:, np.newaxis, np.newaxis]
+        profiles = profiles.reshape((n_years, len(clusters) * period, -1))
+        return np.concatenate([profiles, rest], axis=1).reshape(
+            (n_years * len(weights), -1)
+        )
+
+    timeslice_fraction = np.ravel(sets.timeslice_fraction)
+    full, rest = _periods(timeslice_fraction, 1, n_steps, period)
+    new_fraction = np.concatenate(
+        [
+            np.ravel(
+                [full[0, labels == cluster].sum(axis=0) for cluster in clusters]
+            ),
+            np.ravel(rest),
+        ]
+    )
+
+    time_steps = list(range(1, len(weights) + 1))
+    names = [
+        f"Cluster{cluster}_{step}" for cluster in clusters for step in range(period)
+    ] + [
+        str(name)
+        for name in sets.glob_mapping["Timesteps"]["Timeslice_name"].values[
+            n_periods * period :
+        ]
+    ]
+
+    clustered = copy.copy(sets)
+    clustered.time_steps = time_steps
+    clustered.timeslice_fraction = new_fraction
+    clustered.glob_mapping = dict(
+        sets.glob_mapping,
+        Timesteps=pd.DataFrame(
+            {
+                "Timeslice": time_steps,
+                "Timeslice_name": names,
+                "Timeslice_fraction": new_fraction,
+            }
+        ),
+    )
+
+    n_rows = n_years * n_steps
+    clustered.data = {}
+    for reg, data in sets.data.items():
+        clustered.data[reg] = {}
+        for name, frame in data.items():
+            if isinstance(frame.index, pd.MultiIndex) and len(frame) == n_rows:
+                frame = pd.DataFrame(
+                    data=represent(frame.values.astype(float), name in ENERGY_INPUTS),
+                    index=pd.MultiIndex.from_product(
+                        [sets.main_years, time_steps], names=frame.index.names
+                    ),
+                    columns=frame.columns,
+                )
+            clustered.data[reg][name] = frame
+
+    # the carrier ratios of the conversion plus technologies are timestep dependent
+    clustered._create_carrier_incidence()
+
+    return (
+        clustered,
+        TimeClusters(sets.time_steps, timeslice_fraction, representative, weights),
+    )
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+This module contains the solution of the operation mode over several years.
+The capacities are fixed in the operation mode, so the years are independent
+problems that are solved one after the other, or in parallel processes, and
+their results are merged.
+"""
+import copy
+from concurrent.futures import ProcessPoolExecutor
+from hypatia.backend.Build import BuildModel
+from hypatia.backend.RollingHorizon import solve_rolling_horizon
+from hypatia.analysis.postprocessing import set_DataFrame, merge_DataFrames
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _year_frames(frames, years, year):
+
+    """
+    Takes the rows of a year from the inputs indexed by the years
+    """
+
+    return {
+        name: frame.loc[[year]]
+        if frame.index.get_level_values(0).isin(years).all()
+        else frame
+        for name, frame in frames.items()
+    }
+
+
+def year_sets(sets, year):
+
+    """
+    Creates a copy of the sets and the input data of a model restricted to
+    one of its years
+    """
+
+    yearly = copy.copy(sets)
+    yearly.main_years = [year]
+    yearly.data = {
+        reg: _year_frames(data, sets.main_years, year)
+        for reg, data in sets.data.items()
+    }
+    yearly.trade_data = _year_frames(sets.trade_data, sets.main_years, year)
+    yearly.global_data = _year_frames(sets.global_data, sets.main_years, year)
+
+    # the carrier ratios of the conversion plus technologies are year dependent
+    yearly._create_carrier_incidence()
+
+    return yearly
+
+
+def solve_year(
+    sets,
+    year,
+    solver,
+    verbosity,
+    engine="cvxpy",
+    window=None,
+    overlap=0,
+    items=None,
+    presolve=False,
+    **kwargs,
+):
+
+    """
+    Solves the operation model of one year, with a rolling horizon if a
+    window is given, and returns its results, or only the given items, as
+    DataFrames. With presolve, the technologies fixed at zero and the bounds
+    that cannot be active are left out of the problem
+    """
+
+    sets = year_sets(sets, year)
+    logger.info(f"Solving the year {year}")
+
+    if window is None:
+        model = BuildModel(sets=sets, engine=engine, presolve=presolve)
+        results = model._solve(verbosity=verbosity, solver=solver, **kwargs)
+    else:
+        results = solve_rolling_horizon(
+            sets, window, overlap, solver, verbosity, engine, presolve, **kwargs
+        )
+
+    if results is None:
+        return None
+
+    return set_DataFrame(
+        results=results,
+        regions=sets.regions,
+        years=sets.main_years,
+        time_fraction=sets.time_steps,
+        glob_mapping=sets.glob_mapping,
+        technologies=sets.Technologies,
+        mode=sets.mode,
+        items=items,
+        line_carriers=getattr(sets, "line_carriers", None),
+    )
+
+
+def solve_years(sets, solver, verbosity, processes=1, **kwargs):
+
+    """
+    Solves the years of the operation model and merges their results. The
+    years are solved one after the other in the current process, or in a
+    pool of the given number of processes, as many as the processors with
+    None
+    """
+
+    if processes == 1:
+        frames = [
+            solve_year(sets, year, solver, verbosity, **kwargs)
+            for year in sets.main_years
+        ]
+
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            futures = [
+                executor.submit(solve_year, sets, year, solver, verbosity, **kwargs)
+                for year in sets.main_years
+            ]
+            frames = [future.result() for future in futures]
+
+    if any(frame is None for frame in frames):
+        return None
+
+    return merge_DataFrames(frames)
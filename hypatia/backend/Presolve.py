@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""
+This module contains the presolve of the input data of a model. It finds the
+technologies whose capacity and activity are fixed at zero and the bounds
+that cannot be active, so that the builder leaves their variables and
+constraints out of the problem.
+"""
+import numpy as np
+import scipy.sparse as sp
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+# the technology categories whose activity is not bounded by their capacity
+# alone, as the demand has no capacity and the carrier ratios of the
+# conversion plus technologies tie their activity with other carriers
+FREE_CATEGORIES = ["Demand", "Conversion_plus"]
+
+# the technology categories whose use is tied to their production by the
+# technology efficiency
+EFFICIENCY_CATEGORIES = ["Conversion", "Transmission"]
+
+
+class Presolve:
+
+    """
+    Finds, from the input data of a ReadSets, the technologies fixed at zero
+    and the bounds that cannot be active, and counts the variables and the
+    constraints left out of the problem
+
+    Attributes
+    -----------
+    fixed: dict
+        The boolean masks of the technologies of each region and category
+        whose new capacity, production and use are fixed at zero, as their
+        total capacity is bounded to zero without residual capacity
+
+    defaults: dict
+        The default values of the parameters, whose upper bounds at or above
+        the default stand for no limit
+
+    eliminated: dict
+        The numbers of variables and constraints left out of the problem
+    """
+
+    def __init__(self, sets):
+
+        self.sets = sets
+        self.defaults = {
+            name: sheet_ids[value["sheet_name"]]["value"]
+            for _, ids, sheet_ids, _ in sets._parameter_files()
+            for name, value in ids.items()
+        }
+        self.fixed = self._fixed_technologies()
+        self.eliminated = {"variables": 0, "constraints": 0}
+
+    def _fixed_technologies(self):
+
+        """
+        Finds the technologies without residual capacity that cannot have a
+        new capacity, either as their maximum total capacity is zero or in
+        the operation mode
+        """
+
+        arrays = self.sets.arrays
+        fixed = {}
+
+        for reg in self.sets.regions:
+
+            fixed[reg] = {}
+
+            for key in self.sets.Technologies[reg]:
+
+                if key in FREE_CATEGORIES:
+                    continue
+
+                mask = np.all(
+                    arrays.regional(reg, "tech_residual_cap", key) <= 0, axis=0
+                )
+
+                if self.sets.mode == "Planning":
+                    mask &= np.all(
+                        arrays.regional(reg, "tech_maxtotcap", key) <= 0, axis=0
+                    )
+
+                if key in EFFICIENCY_CATEGORIES:
+                    # without efficiency the use is free of the production
+                    mask &= np.all(
+                        arrays.regional(reg, "tech_efficiency", key) > 0, axis=0
+                    )
+
+                # a category keeps its variables if all its technologies are fixed
+                if mask.any() and not mask.all():
+                    fixed[reg][key] = mask
+
+        return fixed
+
+    def selection(self, reg, key):
+
+        """
+        Gives the sparse (active technologies x technologies) matrix that puts
+        the variables of the active technologies of a category in their
+        columns, or None if none of them is fixed
+        """
+
+        if key not in self.fixed[reg]:
+            return None
+
+        active = np.flatnonzero(~self.fixed[reg][key])
+
+        return sp.csr_matrix(
+            (np.ones(len(active)), (np.arange(len(active)), active)),
+            shape=(len(active), len(self.fixed[reg][key])),
+        )
+
+    def inactive(self, value, source, name, sense, *keys):
+
+        """
+        Tells if the lower ('>=') or upper ('<=') bound of a nonnegative
+        expression given by a parameter of the source ('data', 'trade_data'
+        or 'global_data') cannot be active, as a lower bound not above zero
+        or an upper bound at or above the default value of the parameter,
+        and counts its constraints as eliminated
+        """
+
+        arrays = self.sets.arrays
+        if source == "data":
+            reg, *key = keys
+            bound = arrays.regional(reg, name, *key)
+        elif source == "trade_data":
+            bound = arrays.trade(name, *keys)
+        else:
+            bound = arrays.glob(name, *keys)
+
+        if sense == ">=":
+            inactive = np.all(bound <= 0)
+        else:
+            inactive = np.all(bound >= self.defaults[name])
+
+        if inactive:
+            self.eliminated["constraints"] += int(np.prod(value.shape))
+
+        return bool(inactive)
+
+    def log(self):
+
+        """
+        Logs the numbers of fixed technologies and of eliminated variables
+        and constraints
+        """
+
+        fixed = sum(
+            int(mask.sum()) for masks in self.fixed.values() for mask in masks.values()
+        )
+        logger.info(
+            f"Presolve fixed {fixed} technologies at zero and eliminated "
+            f"{self.eliminated['variables']} variables and "
+            f"{self.eliminated['constraints']} constraints"
+        )
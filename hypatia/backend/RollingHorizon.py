@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+"""
+This module contains the rolling horizon solution of the operation mode. The
+timesteps are split into windows that are solved one after the other, each
+one looking ahead over an overlap with the next window, and the kept part of
+the windows is stitched into the results of the whole horizon.
+"""
+import copy
+import numpy as np
+import pandas as pd
+from hypatia.backend.Build import BuildModel
+from hypatia.utility.utility import get_regions_with_storage
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+# the annual limits of the inputs that are scaled with the share of the kept
+# timesteps of each window in the year, so that the overlap with the next
+# window does not count twice, the other annual inputs are summed over the
+# timesteps of the window by the model itself
+ANNUAL_LIMITS = {
+    "data": ["tech_max_production", "tech_min_production", "emission_cap_annual"],
+    "trade_data": ["line_capacity_factor"],
+    "global_data": [
+        "global_max_production",
+        "global_min_production",
+        "global_emission_cap_annual",
+    ],
+}
+
+
+def rolling_windows(n_steps, window, overlap):
+
+    """
+    Gives the positions of the timesteps solved in each window and the number
+    of them kept in the results, the rest being the overlap with the next window
+    """
+
+    for start in range(0, n_steps, window):
+
+        yield (
+            np.arange(start, min(start + window + overlap, n_steps)),
+            min(window, n_steps - start),
+        )
+
+
+def _window_frames(frames, rows, n_rows, share, annual_limits):
+
+    """
+    Takes the rows of the timestep dependent inputs within a window and scales
+    the annual limits with the share of the window
+    """
+
+    windowed = {}
+    for name, frame in frames.items():
+
+        if isinstance(frame.index, pd.MultiIndex) and len(frame) == n_rows:
+            windowed[name] = frame.iloc[rows]
+
+        elif name in annual_limits:
+            windowed[name] = frame * share
+
+        else:
+            windowed[name] = frame
+
+    return windowed
+
+
+def window_sets(sets, steps, initial_SOC=None, kept=None):
+
+    """
+    Creates a copy of the sets and the input data of a model restricted to
+    the given timestep positions, with the initial state of charge of the
+    storages carried from the previous window. The annual limits are scaled
+    with the share of the first kept timesteps, all of them by default
+    """
+
+    n_steps = len(sets.time_steps)
+    n_rows = len(sets.main_years) * n_steps
+    rows = np.concatenate(
+        [indx * n_steps + steps for indx in range(len(sets.main_years))]
+    )
+    timeslice_fraction = np.ravel(sets.timeslice_fraction)
+    share = timeslice_fraction[steps[:kept]].sum() / timeslice_fraction.sum()
+
+    windowed = copy.copy(sets)
+    windowed.time_steps = [sets.time_steps[indx] for indx in steps]
+    windowed.timeslice_fraction = timeslice_fraction[steps]
+    windowed.data = {
+        reg: _window_frames(data, rows, n_rows, share, ANNUAL_LIMITS["data"])
+        for reg, data in sets.data.items()
+    }
+    windowed.trade_data = _window_frames(
+        sets.trade_data, rows, n_rows, share, ANNUAL_LIMITS["trade_data"]
+    )
+    windowed.global_data = _window_frames(
+        sets.global_data, rows, n_rows, share, ANNUAL_LIMITS["global_data"]
+    )
+
+    for reg, state_of_charge in (initial_SOC or {}).items():
+        windowed.data[reg]["storage_initial_SOC"] = state_of_charge
+
+    # the carrier ratios of the conversion plus technologies are timestep dependent
+    windowed._create_carrier_incidence()
+
+    return windowed
+
+
+def solve_rolling_horizon(
+    sets, window, overlap, solver, verbosity, engine="cvxpy", presolve=False, **kwargs
+):
+
+    """
+    Solves the operation model window by window and returns the results of
+    the whole horizon. The kept values of the variables of the windows are
+    stitched together and the costs, the emissions and the other derived
+    results are evaluated from them, without building the constraints of
+    the whole horizon
+    """
+
+    stitched = {}
+    n_steps = len(sets.time_steps)
+    years = range(len(sets.main_years))
+    initial_SOC = None
+
+    for steps, kept in rolling_windows(n_steps, window, overlap):
+
+        logger.info(
+            f"Solving the timesteps {sets.time_steps[steps[0]]} to "
+            f"{sets.time_steps[steps[-1]]}"
+        )
+        model = BuildModel(
+            sets=window_sets(sets, steps, initial_SOC, kept),
+            engine=engine,
+            presolve=presolve,
+        )
+        if model._solve(verbosity=verbosity, solver=solver, **kwargs) is None:
+            return None
+
+        window_rows = np.concatenate(
+            [indx * len(steps) + np.arange(kept) for indx in years]
+        )
+        horizon_rows = np.concatenate([indx * n_steps + steps[:kept] for indx in years])
+        for key, value in model._variable_values().items():
+            if key not in stitched:
+                stitched[key] = np.zeros((len(years) * n_steps, value.shape[1]))
+            stitched[key][horizon_rows] = value[window_rows]
+
+        # the state of charge at the end of the kept timesteps of each year
+        last_rows = [indx * len(steps) + kept - 1 for indx in years]
+        initial_SOC = {}
+        for reg in get_regions_with_storage(sets):
+            initial = sets.data[reg]["storage_initial_SOC"]
+            initial_SOC[reg] = pd.DataFrame(
+                data=model.storage_SOC[reg].value[last_rows],
+                index=initial.index,
+                columns=initial.columns,
+            )
+
+    return BuildModel(sets=sets, solution=stitched)._results()
@@ -6,9 +6,24 @@ the build class, creating and reading the parameter files and
 checking the errors in the definition of the sets and parameters
 """
 
+import glob
 import itertools as it
+import os
+import posixpath
+import re
+import zipfile
+from xml.etree import ElementTree
+from concurrent.futures import ProcessPoolExecutor
 from openpyxl import load_workbook
+from openpyxl.utils.cell import range_boundaries
 import pandas as pd
+import scipy.sparse as sp
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
 from hypatia.error_log.Checks import (
     check_nan,
     check_index,
@@ -16,13 +31,19 @@ from hypatia.error_log.Checks import (
     check_table_name,
     check_mapping_values,
     check_mapping_ctgry,
+    check_lines,
     check_sheet_name,
     check_tech_category,
     check_carrier_type,
     check_years_mode_consistency,
 )
 
-from hypatia.error_log.Exceptions import WrongInputMode
+from hypatia.error_log.Exceptions import (
+    MissingDependency,
+    WrongInputMode,
+    WrongSheetName,
+)
+from hypatia.utility.cache import files_key, load_entry, save_entry
 import numpy as np
 from hypatia.utility.constants import (
     global_set_ids,
@@ -35,6 +56,371 @@ from hypatia.utility.constants import (list_connection_operation, list_connectio
 
 MODES = ["Planning", "Operation"]
 
+# the attributes holding the parameters read from the parameter files
+DATA_ATTRIBUTES = ["data", "trade_data", "global_data", "carrier_incidence"]
+
+
+# the extensions of the columnar parameter formats, where each parameter file
+# is a directory with one file per sheet
+COLUMNAR_FORMATS = {"parquet": ".parquet", "csv": ".csv"}
+
+
+class ColumnarFile:
+
+    """
+    Reads the sheets of a parameter file stored as a directory with one
+    Parquet or CSV file per sheet, with the same interface of pd.ExcelFile
+    """
+
+    def __init__(self, directory):
+
+        self.directory = directory
+        self.files = {}
+        for name in sorted(os.listdir(directory)):
+            sheet_name, extension = os.path.splitext(name)
+            if extension in COLUMNAR_FORMATS.values():
+                self.files[sheet_name] = os.path.join(directory, name)
+
+        self.sheet_names = list(self.files)
+
+    def parse(self, sheet_name, index_col, header):
+
+        file = self.files[sheet_name]
+        if file.endswith(COLUMNAR_FORMATS["csv"]):
+            return pd.read_csv(
+                file, index_col=index_col, header=header, float_precision="round_trip"
+            )
+
+        # the index and the columns are restored from the parquet metadata
+        return pd.read_parquet(file)
+
+    def __enter__(self):
+
+        return self
+
+    def __exit__(self, *args):
+
+        pass
+
+
+def open_parameter_file(path, file_name):
+
+    """
+    Opens a parameter file, given either as an excel file or as a directory
+    of columnar files
+    """
+
+    excel = r"{}/{}.xlsx".format(path, file_name)
+    directory = os.path.join(path, file_name)
+    if not os.path.exists(excel) and os.path.isdir(directory):
+        return ColumnarFile(directory)
+
+    return pd.ExcelFile(excel)
+
+
+def write_parameter_file(path, file_name, ids, data, format):
+
+    """
+    Writes the sheets of a parameter file as a directory with one columnar
+    file per sheet
+    """
+
+    directory = os.path.join(path, file_name)
+    os.makedirs(directory, exist_ok=True)
+
+    for key, value in ids.items():
+        file = os.path.join(
+            directory, "{}{}".format(value["sheet_name"], COLUMNAR_FORMATS[format])
+        )
+        if format == "csv":
+            data[key].to_csv(file)
+        else:
+            data[key].to_parquet(file)
+
+
+def read_parameter_file(path, file_name, ids, sheet_ids, index_file_name):
+
+    """
+    Reads all the sheets of a parameter file from one pass over the workbook,
+    or from the directory of its columnar files, and checks their names,
+    missing values, indices and columns
+    """
+
+    data = {}
+    with open_parameter_file(path, file_name) as file:
+
+        check_sheet_name(path, file_name, ids, file.sheet_names)
+
+        for key, value in ids.items():
+
+            data[key] = file.parse(
+                sheet_name=value["sheet_name"],
+                index_col=value["index_col"],
+                header=value["header"],
+            )
+            check_nan(value["sheet_name"], data[key], file_name)
+
+            check_index_data(
+                data[key].index,
+                value["sheet_name"],
+                index_file_name,
+                pd.Index(sheet_ids[value["sheet_name"]]["index"]),
+            )
+
+            check_index_data(
+                data[key].columns,
+                value["sheet_name"],
+                index_file_name,
+                pd.Index(sheet_ids[value["sheet_name"]]["columns"]),
+            )
+
+    return data
+
+
+# the sheet holding the tables of the set files
+SETS_SHEET = "Sets"
+
+# the extensions of the set files given as yaml
+YAML_EXTENSIONS = [".yaml", ".yml"]
+
+RELATIONSHIPS = "http://schemas.openxmlformats.org/package/2006/relationships"
+OFFICE_RELATIONSHIPS = (
+    "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+)
+SPREADSHEET = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+
+
+def _relationships(archive, part):
+
+    """
+    Gives the targets of the relationships of a part of an xlsx archive
+    """
+
+    folder, name = posixpath.split(part)
+    rels = ElementTree.fromstring(
+        archive.read(posixpath.join(folder, "_rels", "{}.rels".format(name)))
+    )
+
+    targets = {}
+    for relationship in rels.iter("{{{}}}Relationship".format(RELATIONSHIPS)):
+        target = relationship.get("Target")
+        if target.startswith("/"):
+            target = target[1:]
+        else:
+            target = posixpath.normpath(posixpath.join(folder, target))
+        targets[relationship.get("Id")] = target
+
+    return targets
+
+
+def xlsx_table_ranges(file, sheet_name):
+
+    """
+    Finds the names and the cell ranges of the tables of a sheet from the xml
+    parts of an xlsx file, in the order of the sheet, without loading it
+    """
+
+    with zipfile.ZipFile(file) as archive:
+
+        workbook = ElementTree.fromstring(archive.read("xl/workbook.xml"))
+        sheet_ids = {
+            sheet.get("name"): sheet.get("{{{}}}id".format(OFFICE_RELATIONSHIPS))
+            for sheet in workbook.iter("{{{}}}sheet".format(SPREADSHEET))
+        }
+        if sheet_name not in sheet_ids:
+            raise WrongSheetName(
+                f"The '{sheet_name}' sheet is missing in {file}, the sets should "
+                "be given as tables of this sheet."
+            )
+
+        sheet = _relationships(archive, "xl/workbook.xml")[sheet_ids[sheet_name]]
+        targets = _relationships(archive, sheet)
+        table_ids = re.findall(
+            rb'<(?:\w+:)?tablePart\b[^>]*?(?:\w+:)?id="([^"]+)"', archive.read(sheet)
+        )
+
+        ranges = {}
+        for table_id in table_ids:
+            table = ElementTree.fromstring(archive.read(targets[table_id.decode()]))
+            ranges[table.get("name")] = table.get("ref")
+
+    return ranges
+
+
+def read_set_tables(path, file_name):
+
+    """
+    Reads the tables of a set file, given as the tables of the 'Sets' sheet of
+    an excel file, as a directory with one csv file per table or as a yaml
+    file mapping the name of each table to its rows
+    """
+
+    excel = r"{}/{}.xlsx".format(path, file_name)
+    directory = os.path.join(path, file_name)
+
+    if os.path.exists(excel):
+
+        ranges = xlsx_table_ranges(excel, SETS_SHEET)
+        boundaries = {
+            name: range_boundaries(cell_range) for name, cell_range in ranges.items()
+        }
+
+        # all the tables are taken from one pass over the rows of the sheet
+        workbook = load_workbook(excel, read_only=True)
+        try:
+            rows = list(
+                workbook[SETS_SHEET].iter_rows(
+                    min_row=1,
+                    max_row=max(bound[3] for bound in boundaries.values()),
+                    min_col=1,
+                    max_col=max(bound[2] for bound in boundaries.values()),
+                    values_only=True,
+                )
+            )
+        finally:
+            workbook.close()
+
+        tables = {}
+        for name, (min_col, min_row, max_col, max_row) in boundaries.items():
+            content = [
+                row[min_col - 1 : max_col] for row in rows[min_row - 1 : max_row]
+            ]
+            tables[name] = pd.DataFrame(content[1:], columns=content[0])
+
+        return tables
+
+    if os.path.isdir(directory):
+
+        return {
+            os.path.splitext(name)[0]: pd.read_csv(os.path.join(directory, name))
+            for name in sorted(os.listdir(directory))
+            if name.endswith(COLUMNAR_FORMATS["csv"])
+        }
+
+    for extension in YAML_EXTENSIONS:
+
+        if os.path.exists(directory + extension):
+
+            if yaml is None:
+                raise MissingDependency(
+                    f"Reading the set file {directory + extension} needs the "
+                    "pyyaml package, installed with the yaml extra of "
+                    "hypatia-py: pip install hypatia-py[yaml]"
+                )
+
+            with open(directory + extension) as stream:
+                content = yaml.safe_load(stream)
+
+            return {name: pd.DataFrame(rows) for name, rows in content.items()}
+
+    raise FileNotFoundError(
+        f"No set file named {file_name} is found in {path} as an excel, csv or "
+        "yaml file."
+    )
+
+
+def write_set_tables(path, file_name, tables):
+
+    """
+    Writes the tables of a set file as a directory with one csv file per
+    table, which is read by read_set_tables
+    """
+
+    directory = os.path.join(path, file_name)
+    os.makedirs(directory, exist_ok=True)
+
+    for name, table in tables.items():
+        table.to_csv(
+            os.path.join(directory, name + COLUMNAR_FORMATS["csv"]), index=False
+        )
+
+
+class ParameterArrays:
+
+    """
+    Compiled NumPy arrays of the input parameters of a ReadSets, used by the
+    builder of the model. Each array is computed from the parameter frames
+    on its first lookup and kept for the next ones, as a contiguous float
+    array with the columns of a technology category or of an inter-regional
+    link. The yearly parameters can be repeated for each timestep to match
+    the (years*timesteps) rows of the activities
+    """
+
+    def __init__(self, sets):
+
+        self.sets = sets
+        self._arrays = {}
+
+    def regional(self, reg, name, key=None, timesteps=False):
+
+        """
+        Gives the array of a regional parameter, or of its columns of the
+        given technology category
+        """
+
+        return self._array(
+            ("data", reg, name, key, timesteps),
+            lambda: self.sets.data[reg][name],
+        )
+
+    def trade(self, name, key=None, timesteps=False):
+
+        """
+        Gives the array of a parameter of the inter-regional links, or of its
+        columns of the given link
+        """
+
+        return self._array(
+            ("trade_data", name, key, timesteps), lambda: self.sets.trade_data[name]
+        )
+
+    def glob(self, name, key=None, timesteps=False):
+
+        """
+        Gives the array of a global parameter, or of its column of the given
+        technology
+        """
+
+        return self._array(
+            ("global_data", name, key, timesteps),
+            lambda: self.sets.global_data[name],
+        )
+
+    def clear(self, name=None):
+
+        """
+        Drops the arrays of a parameter, or all the arrays, after the values
+        of the parameter frames are changed
+        """
+
+        if name is None:
+            self._arrays = {}
+        else:
+            self._arrays = {
+                lookup: value
+                for lookup, value in self._arrays.items()
+                if name not in lookup[:-2]
+            }
+
+    def _array(self, lookup, frame):
+
+        *_, key, timesteps = lookup
+        if lookup not in self._arrays:
+
+            frame = frame()
+            if key is not None:
+                frame = frame.loc[:, key]
+
+            value = np.ascontiguousarray(frame.values, dtype=float)
+            if timesteps:
+                value = np.repeat(value, len(self.sets.time_steps), axis=0)
+
+            # the arrays are shared by all the lookups
+            value.flags.writeable = False
+            self._arrays[lookup] = value
+
+        return self._arrays[lookup]
+
 
 class ReadSets:
 
@@ -48,6 +434,10 @@ class ReadSets:
         
     path:
         The path of the set files given by the user
+
+    cache:
+        The directory of the cache of the parsed set and parameter files, if
+        the cache is used
         
     glob_mapping : dict
         A dictionary of the global set tables given by the user in the global.xlsx file
@@ -76,35 +466,61 @@ class ReadSets:
         
     data : dict
         A nested dictionary for storing the regional data
+
+    carrier_incidence : dict
+        A nested dictionary of the sparse technology-carrier incidence matrices
+        of each region, direction ('in' and 'out') and technology category
+
+    arrays : ParameterArrays
+        The compiled NumPy arrays of the parameters, computed once for each
+        lookup of the builder
     """
 
-    def __init__(self, path, mode="Planning"):
+    def __init__(self, path, mode="Planning", cache=None):
 
         self.mode = mode
         self.path = path
+        self.cache = cache
 
-        self._init_by_xlsx()
+        if cache is None:
+            self._init_by_xlsx()
+        else:
+            self._init_by_cache()
 
-    def _init_by_xlsx(self,):
+    def _init_by_cache(self):
 
         """
-        Reads and organizes the global and regional sets
+        Takes the sets from the cache, or reads and caches them if the set
+        files are changed
         """
-        glob_mapping = {}
-        wb_glob = load_workbook(r"{}/global.xlsx".format(self.path))
-        sets_glob = wb_glob["Sets"]
-        set_glob_category = {key: value for key, value in sets_glob.tables.items()}
 
-        for entry, data_boundary in sets_glob.tables.items():
+        files = sorted(
+            file
+            for pattern in ["*.xlsx", "*/*.csv"] + ["*" + ext for ext in YAML_EXTENSIONS]
+            for file in glob.glob(os.path.join(self.path, pattern))
+        )
+        self._sets_key = files_key(self.path, files, "sets", self.mode)
+
+        state = load_entry(self.cache, self._sets_key)
+        if state is None:
+            self._init_by_xlsx()
+            state = {
+                key: value
+                for key, value in vars(self).items()
+                if key not in ["path", "cache", "_sets_key"]
+            }
+            save_entry(self.cache, self._sets_key, state)
+
+        else:
+            self.__dict__.update(state)
 
-            data_glob = sets_glob[data_boundary]
-            content = [[cell.value for cell in ent] for ent in data_glob]
-            header = content[0]
-            rest = content[1:]
-            df = pd.DataFrame(rest, columns=header)
-            glob_mapping[entry] = df
+    def _init_by_xlsx(self,):
+
+        """
+        Reads and organizes the global and regional sets
+        """
+        self.glob_mapping = read_set_tables(self.path, "global")
 
-        self.glob_mapping = glob_mapping
 
         check_years_mode_consistency(
             mode=self.mode, main_years=list(self.glob_mapping["Years"]["Year"])
@@ -147,23 +563,12 @@ class ReadSets:
         # possible connections among the regions
 
         if len(self.regions) > 1:
-            lines_obj = it.permutations(self.regions, r=2)
-
-            self.lines_list = []
-            for item in lines_obj:
-
-                if item[0] < item[1]:
-
-                    self.lines_list.append("{}-{}".format(item[0], item[1]))
+            self._create_lines()
 
         mapping = {}
 
         for reg in self.regions:
 
-            wb = load_workbook(r"{}/{}.xlsx".format(self.path, reg))
-
-            sets = wb["Sets"]
-
             self._setbase_reg = [
                 "Technologies",
                 "Carriers",
@@ -171,24 +576,7 @@ class ReadSets:
                 "Carrier_output",
             ]
 
-            set_category = {key: value for key, value in sets.tables.items()}
-
-            reg_mapping = {}
-
-            for entry, data_boundary in sets.tables.items():
-
-                data = sets[data_boundary]
-                content = [[cell.value for cell in ent] for ent in data]
-
-                header = content[0]
-
-                rest = content[1:]
-
-                df = pd.DataFrame(rest, columns=header)
-
-                reg_mapping[entry] = df
-
-            mapping[reg] = reg_mapping
+            mapping[reg] = read_set_tables(self.path, reg)
 
             for key, value in mapping[reg].items():
 
@@ -280,6 +668,80 @@ class ReadSets:
 
         self._create_input_data()
 
+    def _create_lines(self):
+
+        """
+        Creates the inter-regional links and the carriers transmitted by each
+        of them. The links are declared in the 'Lines' table of the global
+        set file, otherwise all the pairs of regions are linked for all the
+        carriers
+        """
+
+        carriers = list(self.glob_mapping["Carriers_glob"]["Carrier"])
+        lines_obj = it.permutations(self.regions, r=2)
+
+        self.lines_list = []
+        for item in lines_obj:
+
+            if item[0] < item[1]:
+
+                self.lines_list.append("{}-{}".format(item[0], item[1]))
+
+        if "Lines" in self.glob_mapping:
+
+            lines = self.glob_mapping["Lines"]
+            for column in ["Region_from", "Region_to"]:
+                check_mapping_values(
+                    lines,
+                    "Lines",
+                    self.glob_mapping["Regions"],
+                    "Regions",
+                    column,
+                    "Region",
+                    "global",
+                )
+            check_mapping_values(
+                lines,
+                "Lines",
+                self.glob_mapping["Carriers_glob"],
+                "Carriers_glob",
+                "Carrier",
+                "Carrier",
+                "global",
+            )
+            check_lines(lines, "global")
+
+            declared = {}
+            for reg_from, reg_to, carrier in lines[
+                ["Region_from", "Region_to", "Carrier"]
+            ].itertuples(index=False):
+                line = "{}-{}".format(*sorted([reg_from, reg_to]))
+                declared.setdefault(line, set()).add(carrier)
+
+            self.lines_list = [line for line in self.lines_list if line in declared]
+            self.line_carriers = {
+                line: [carr for carr in carriers if carr in declared[line]]
+                for line in self.lines_list
+            }
+
+        else:
+            self.line_carriers = {line: carriers for line in self.lines_list}
+
+        # maps the carriers of each link to the global carriers
+        self.line_incidence = {
+            line: sp.csr_matrix(
+                (
+                    np.ones(len(line_carriers)),
+                    (
+                        np.arange(len(line_carriers)),
+                        [carriers.index(carr) for carr in line_carriers],
+                    ),
+                ),
+                shape=(len(line_carriers), len(carriers)),
+            )
+            for line, line_carriers in self.line_carriers.items()
+        }
+
     def _create_input_data(self):
         """
         Defines the sheets, indices and columns of the parameter files
@@ -289,8 +751,12 @@ class ReadSets:
 
             # Create the columns of inter-regional links as a multi-index of the
             # pairs of regions and the transmitted carriers
-            indexer = pd.MultiIndex.from_product(
-                [self.lines_list, self.glob_mapping["Carriers_glob"]["Carrier"]],
+            indexer = pd.MultiIndex.from_tuples(
+                [
+                    (line, carr)
+                    for line in self.lines_list
+                    for carr in self.line_carriers[line]
+                ],
                 names=["Line", "Transmitted Carrier"],
             )
 
@@ -935,111 +1401,221 @@ class ReadSets:
                     )
                     regional_data.to_excel(writer, sheet_name=key)
 
-    def _read_data(self, path):
+    def _parameter_files(self):
 
         """
-        Reads the parameters with the given values by the user
+        Gives the name, the sheet ids, the sheets with their indices and
+        columns and the name used in the error messages of each parameter file
         """
 
+        files = []
         if len(self.regions) > 1:
 
-            trade_data_ids = take_trade_ids(mode=self.mode)
-            global_data_ids = take_global_ids(mode=self.mode)
-            check_sheet_name(path, "parameters_connections", trade_data_ids)
-            check_sheet_name(path, "parameters_global", global_data_ids)
-
-            trade_data = {}
-            for key, value in trade_data_ids.items():
-
-                trade_data[key] = pd.read_excel(
-                    r"{}/parameters_connections.xlsx".format(path),
-                    sheet_name=value["sheet_name"],
-                    index_col=value["index_col"],
-                    header=value["header"],
-                )
-                check_nan(
-                    value["sheet_name"], trade_data[key], "parameters_connections"
-                )
-                check_index_data(
-                    trade_data[key].index,
-                    value["sheet_name"],
+            files.append(
+                (
                     "parameters_connections",
-                    pd.Index(self.connection_sheet_ids[value["sheet_name"]]["index"]),
-                )
-
-                check_index_data(
-                    trade_data[key].columns,
-                    value["sheet_name"],
+                    take_trade_ids(mode=self.mode),
+                    self.connection_sheet_ids,
                     "parameters_connections",
-                    pd.Index(self.connection_sheet_ids[value["sheet_name"]]["columns"]),
                 )
+            )
+            files.append(
+                (
+                    "parameters_global",
+                    take_global_ids(mode=self.mode),
+                    self.global_sheet_ids,
+                    "parameters_global",
+                )
+            )
 
-            global_data = {}
-            for key, value in global_data_ids.items():
-                global_data[key] = pd.read_excel(
-                    r"{}/parameters_global.xlsx".format(path),
-                    sheet_name=value["sheet_name"],
-                    index_col=value["index_col"],
-                    header=value["header"],
+        ids = take_ids(self.regions, self.Technologies, self.mode)
+        for reg in self.regions:
+            files.append(
+                (
+                    "parameters_{}".format(reg),
+                    ids[reg],
+                    self.regional_sheets_ids[reg],
+                    "parameters_{}.xlsx".format(reg),
                 )
-                check_nan(value["sheet_name"], global_data[key], "parameters_global")
+            )
 
-                check_index_data(
-                    global_data[key].index,
-                    value["sheet_name"],
-                    "parameters_global",
-                    pd.Index(self.global_sheet_ids[value["sheet_name"]]["index"]),
+        return files
+
+    def _write_data(self, path, format):
+
+        """
+        Writes the parameters that are read to a directory of columnar files
+        for each parameter file
+        """
+
+        frames = [self.data[reg] for reg in self.regions]
+        if len(self.regions) > 1:
+            frames = [self.trade_data, self.global_data] + frames
+
+        for (file_name, ids, _, _), data in zip(self._parameter_files(), frames):
+            write_parameter_file(path, file_name, ids, data, format)
+
+    def _read_data(self, path, processes=1):
+
+        """
+        Reads the parameters with the given values by the user. Each parameter
+        file is read in one pass and the files are read one after the other,
+        or in a pool of the given number of processes, as many as the
+        processors with None. A parameter file can be an excel file or a
+        directory of columnar files with the same name
+        """
+
+        files = self._parameter_files()
+        self.arrays.clear()
+
+        if self.cache is not None:
+            key = files_key(
+                path, self._input_files(path, files), "data", self._sets_key
+            )
+            cached = load_entry(self.cache, key)
+            if cached is not None:
+                self.__dict__.update(cached)
+                return
+
+        if processes is None:
+            processes = os.cpu_count()
+
+        if processes == 1 or len(files) == 1:
+            frames = [read_parameter_file(path, *file) for file in files]
+
+        else:
+            with ProcessPoolExecutor(max_workers=processes) as executor:
+                frames = list(
+                    executor.map(
+                        read_parameter_file, it.repeat(path), *zip(*files)
+                    )
                 )
 
-                check_index_data(
-                    global_data[key].columns,
-                    value["sheet_name"],
-                    "parameters_global",
-                    pd.Index(self.global_sheet_ids[value["sheet_name"]]["columns"]),
+        if len(self.regions) > 1:
+            self.trade_data, self.global_data = frames[:2]
+            frames = frames[2:]
+
+        self.data = dict(zip(self.regions, frames))
+
+        self._create_carrier_incidence()
+
+        if self.cache is not None:
+            save_entry(
+                self.cache,
+                key,
+                {
+                    name: getattr(self, name)
+                    for name in DATA_ATTRIBUTES
+                    if hasattr(self, name)
+                },
+            )
+
+    def _input_files(self, path, files):
+
+        """
+        Gives the excel files, or the files of the columnar directories, that
+        are read for the given parameter files
+        """
+
+        input_files = []
+        for file_name, *_ in files:
+            excel = r"{}/{}.xlsx".format(path, file_name)
+            directory = os.path.join(path, file_name)
+            if os.path.exists(excel):
+                input_files.append(excel)
+            elif os.path.isdir(directory):
+                input_files.extend(
+                    os.path.join(directory, name)
+                    for name in sorted(os.listdir(directory))
                 )
 
-            self.trade_data = trade_data
-            self.global_data = global_data
+        return input_files
+
+    def _create_carrier_incidence(self):
+
+        """
+        Creates the sparse incidence matrices between the technologies of each
+        category and the global carriers, used for the carrier balance.
+        The carrier ratios of the conversion plus technologies change over the
+        timesteps, so for them the ratios are folded into an operator acting
+        on the stacked columns of the activity instead
+        """
+
+        carriers = list(self.glob_mapping["Carriers_glob"]["Carrier"])
+        n_rows = len(self.main_years) * len(self.time_steps)
+        rows = np.arange(n_rows)[:, np.newaxis]
+
+        self.carrier_incidence = {}
 
-        data = {}
-        ids = take_ids(self.regions, self.Technologies, self.mode)
         for reg in self.regions:
 
-            check_sheet_name(path, "parameters_{}".format(reg), ids[reg])
-            reg_data = {}
-            for key, value in ids[reg].items():
+            self.carrier_incidence[reg] = {}
 
-                reg_data[key] = pd.read_excel(
-                    r"{}/parameters_{}.xlsx".format(path, reg),
-                    sheet_name=value["sheet_name"],
-                    index_col=value["index_col"],
-                    header=value["header"],
-                )
-                check_nan(
-                    value["sheet_name"], reg_data[key], "parameters_{}".format(reg)
-                )
+            for direction, table, column in [
+                ("in", "Carrier_input", "Carrier_in"),
+                ("out", "Carrier_output", "Carrier_out"),
+            ]:
 
-                check_index_data(
-                    reg_data[key].index,
-                    value["sheet_name"],
-                    "parameters_{}.xlsx".format(reg),
-                    pd.Index(
-                        self.regional_sheets_ids[reg][value["sheet_name"]]["index"]
-                    ),
+                links = self.mapping[reg][table].drop_duplicates(
+                    ["Technology", column]
                 )
+                incidence = {}
 
-                check_index_data(
-                    reg_data[key].columns,
-                    value["sheet_name"],
-                    "parameters_{}.xlsx".format(reg),
-                    pd.Index(
-                        self.regional_sheets_ids[reg][value["sheet_name"]]["columns"]
-                    ),
-                )
+                for key, techs in self.Technologies[reg].items():
+
+                    tech_links = links.loc[links["Technology"].isin(techs)]
+
+                    if tech_links.empty:
+                        continue
+
+                    tech_indx = np.array(
+                        [techs.index(tech) for tech in tech_links["Technology"]]
+                    )
+                    carr_indx = np.array(
+                        [carriers.index(carr) for carr in tech_links[column]]
+                    )
+
+                    if key == "Conversion_plus":
+
+                        ratio = (
+                            self.data[reg]["carrier_ratio_{}".format(direction)]
+                            .loc[
+                                :,
+                                list(zip(tech_links["Technology"], tech_links[column])),
+                            ]
+                            .values
+                        )
+
+                        incidence[key] = sp.csr_matrix(
+                            (
+                                ratio.ravel(),
+                                (
+                                    (rows + carr_indx * n_rows).ravel(),
+                                    (rows + tech_indx * n_rows).ravel(),
+                                ),
+                            ),
+                            shape=(n_rows * len(carriers), n_rows * len(techs)),
+                        )
+
+                    else:
+
+                        incidence[key] = sp.csr_matrix(
+                            (np.ones(len(tech_indx)), (tech_indx, carr_indx)),
+                            shape=(len(techs), len(carriers)),
+                        )
+
+                self.carrier_incidence[reg][direction] = incidence
+
+    @property
+    def arrays(self):
 
-            data[reg] = reg_data
+        # the copies of the sets, restricted to a year or to a window of
+        # timesteps, have their own data and so their own arrays
+        arrays = self.__dict__.get("_arrays")
+        if arrays is None or arrays.sets is not self:
+            arrays = self._arrays = ParameterArrays(self)
 
-        self.data = data
+        return arrays
 
     @property
     def multi_node(self):
@@ -0,0 +1,216 @@
+import os
+import shutil
+import tempfile
+import cvxpy as cp
+import numpy as np
+import pandas as pd
+import unittest
+from hypatia.backend.StrData import ReadSets, read_set_tables, write_set_tables
+from hypatia.backend.Build import BuildModel
+
+'''
+Unit tests for the functions in Build.py
+'''
+
+class TestParametrizedModel(unittest.TestCase):
+    path = os.path.join(
+        os.path.dirname(__file__), "..", "..", "examples", "Planning"
+    )
+
+    def setUp(self):
+        self.sets = ReadSets(path=os.path.join(self.path, "sets"), mode="Planning")
+        self.sets._read_data(os.path.join(self.path, "parameters"))
+        self.region = self.sets.regions[0]
+
+    def solve(self, model):
+        model._solve(verbosity=False, solver="SCIPY")
+        return model.problem.value
+
+    def test_dpp_compliant(self):
+        model = BuildModel(sets=self.sets, parametrize=True)
+        problem = cp.Problem(cp.Minimize(model.global_objective), model.constr)
+
+        self.assertTrue(len(model.parameters) > 0)
+        self.assertTrue(problem.is_dcp(dpp=True))
+
+    def test_update_parameters(self):
+        model = BuildModel(sets=self.sets, parametrize=True)
+        self.solve(model)
+
+        data = self.sets.data[self.region]
+        data["demand"].iloc[:, :] = data["demand"].values * 1.1
+        data["tech_var_cost"].iloc[:, :] = data["tech_var_cost"].values * 2
+        model._update_parameters()
+
+        self.assertAlmostEqual(
+            self.solve(model) / self.solve(BuildModel(sets=self.sets)), 1, places=6
+        )
+
+
+class TestModelStats(unittest.TestCase):
+    path = TestParametrizedModel.path
+
+    def setUp(self):
+        self.sets = ReadSets(path=os.path.join(self.path, "sets"), mode="Planning")
+        self.sets._read_data(os.path.join(self.path, "parameters"))
+
+    def test_stats(self):
+        stats = {}
+        for engine, solver in [("cvxpy", "SCIPY"), ("sparse", "HIGHS")]:
+            model = BuildModel(sets=self.sets, engine=engine)
+            model._solve(verbosity=False, solver=solver)
+            stats[engine] = model.stats
+
+            self.assertIn("_set_variables", model.timings)
+            self.assertIn("_constr_balance", model.timings)
+            self.assertGreater(model.stats["nonzeros"], 0)
+
+        for phase in ["canonicalization", "solver"]:
+            self.assertGreaterEqual(stats["cvxpy"][phase], 0)
+        self.assertIn("assembly", stats["sparse"])
+        for size in ["variables", "constraints"]:
+            self.assertEqual(stats["cvxpy"][size], stats["sparse"][size])
+
+
+class TestSolutionResults(unittest.TestCase):
+    path = TestParametrizedModel.path
+
+    def setUp(self):
+        self.sets = ReadSets(path=os.path.join(self.path, "sets"), mode="Planning")
+        self.sets._read_data(os.path.join(self.path, "parameters"))
+
+    def test_cvxpy_results(self):
+        model = BuildModel(sets=self.sets)
+        results = model._solve(verbosity=False, solver="SCIPY")
+
+        for name in ["totalcapacity", "cost_fix", "cost_variable", "cost_inv"]:
+            for reg, expressions in getattr(model, name).items():
+                for key, expression in expressions.items():
+                    value = getattr(results, name)[reg][key]
+                    self.assertIsInstance(value, np.ndarray)
+                    self.assertTrue(np.allclose(value, expression.value))
+
+    def test_solution_of_sparse_engine(self):
+        model = BuildModel(sets=self.sets, engine="sparse")
+        model._solve(verbosity=False, solver="HIGHS")
+        evaluated = BuildModel(sets=self.sets, solution=model._variable_values())
+
+        self.assertEqual(evaluated.constr, [])
+        for reg, expressions in model.emission_cost.items():
+            for key, expression in expressions.items():
+                self.assertTrue(
+                    np.allclose(evaluated.emission_cost[reg][key], expression.value)
+                )
+
+
+class TestDeclaredLines(unittest.TestCase):
+    path = os.path.join(
+        os.path.dirname(__file__), "..", "..", "examples", "Operation"
+    )
+
+    def setUp(self):
+        self.sets = ReadSets(path=os.path.join(self.path, "sets"), mode="Operation")
+        self.sets._read_data(os.path.join(self.path, "parameters"), processes=1)
+
+        folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, folder)
+        for file_name in ["global"] + self.sets.regions:
+            tables = read_set_tables(os.path.join(self.path, "sets"), file_name)
+            if file_name == "global":
+                tables["Lines"] = pd.DataFrame(
+                    {"Region_from": ["reg2"], "Region_to": ["reg1"], "Carrier": ["Elec"]}
+                )
+            write_set_tables(folder, file_name, tables)
+
+        # only the electricity has a residual capacity in the example
+        self.declared = ReadSets(path=folder, mode="Operation")
+        self.declared.data = self.sets.data
+        self.declared.global_data = self.sets.global_data
+        self.declared.trade_data = {
+            key: value.loc[:, [("reg1-reg2", "Elec")]]
+            for key, value in self.sets.trade_data.items()
+        }
+        self.declared._create_carrier_incidence()
+
+    def test_single_flow_per_direction(self):
+        model = BuildModel(sets=self.declared, engine="sparse")
+        variables = model.variables
+
+        for reg, other in [("reg1", "reg2"), ("reg2", "reg1")]:
+            self.assertIs(
+                variables["line_import"][reg][other],
+                variables["line_export"][other][reg],
+            )
+            self.assertEqual(variables["line_import"][reg][other].shape[1], 1)
+
+    def test_same_solution(self):
+        models = {}
+        for name, sets in [("all", self.sets), ("declared", self.declared)]:
+            models[name] = BuildModel(sets=sets, engine="sparse")
+            models[name]._solve(verbosity=False, solver="HIGHS")
+
+        self.assertLess(
+            models["declared"].stats["variables"], models["all"].stats["variables"]
+        )
+        objective = {
+            name: float(model.global_objective.value) for name, model in models.items()
+        }
+        self.assertAlmostEqual(objective["declared"] / objective["all"], 1, places=6)
+
+
+class TestPresolve(unittest.TestCase):
+    path = TestParametrizedModel.path
+
+    def setUp(self):
+        self.sets = ReadSets(path=os.path.join(self.path, "sets"), mode="Planning")
+        self.sets._read_data(os.path.join(self.path, "parameters"))
+        self.region = self.sets.regions[0]
+
+        # no residual nor new capacity of the hydro power plants
+        data = self.sets.data[self.region]
+        for name in ["tech_residual_cap", "tech_maxtotcap"]:
+            data[name].loc[:, ("Supply", "Hydro_PP")] = 0
+        self.sets.arrays.clear()
+
+    def test_fixed_technologies(self):
+        model = BuildModel(sets=self.sets, presolve=True)
+
+        fixed = model.presolve.fixed[self.region]
+        self.assertEqual(list(fixed), ["Supply"])
+        self.assertEqual(fixed["Supply"].tolist(), [False, True])
+
+    def test_same_solution(self):
+        for engine, solver in [("cvxpy", "SCIPY"), ("sparse", "HIGHS")]:
+            models = {}
+            for presolve in [False, True]:
+                models[presolve] = BuildModel(
+                    sets=self.sets, engine=engine, presolve=presolve
+                )
+                models[presolve]._solve(verbosity=False, solver=solver)
+
+            stats = models[True].stats
+            self.assertGreater(stats["eliminated_variables"], 0)
+            self.assertGreater(stats["eliminated_constraints"], 0)
+            self.assertEqual(
+                stats["variables"] + stats["eliminated_variables"],
+                models[False].stats["variables"],
+            )
+            self.assertNotIn("eliminated_variables", models[False].stats)
+
+            objective = {
+                presolve: float(model.global_objective.value)
+                for presolve, model in models.items()
+            }
+            self.assertAlmostEqual(objective[True] / objective[False], 1, places=5)
+
+            production = models[True].variables["productionbyTechnology"][self.region]
+            self.assertTrue((production["Supply"].value[:, 1] == 0).all())
+
+    def test_ignored_when_parametrized(self):
+        model = BuildModel(sets=self.sets, parametrize=True, presolve=True)
+
+        self.assertIsNone(model.presolve)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import os
+import numpy as np
+import unittest
+from hypatia.backend.StrData import ReadSets
+from hypatia.backend.Clustering import kmeans, kmedoids, cluster_sets
+
+'''
+Unit tests for the functions in Clustering.py
+'''
+
+class TestClusteringAlgorithms(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(1)
+        self.features = np.vstack(
+            [rng.normal(center, 0.1, size=(20, 3)) for center in [0, 5, 10]]
+        )
+        self.groups = np.repeat([0, 1, 2], 20)
+
+    def assertSameGroups(self, labels):
+        for group in range(3):
+            self.assertEqual(len(set(labels[self.groups == group])), 1)
+        self.assertEqual(len(set(labels)), 3)
+
+    def test_kmeans(self):
+        labels, centers = kmeans(self.features, 3)
+
+        self.assertSameGroups(labels)
+        self.assertTrue(
+            np.allclose(np.sort(centers.mean(axis=1)), [0, 5, 10], atol=0.1)
+        )
+
+    def test_kmedoids(self):
+        labels, medoids = kmedoids(self.features, 3)
+
+        self.assertSameGroups(labels)
+        self.assertTrue(np.array_equal(labels[medoids], [0, 1, 2]))
+
+
+class TestClusterSets(unittest.TestCase):
+    path = os.path.join(
+        os.path.dirname(__file__), "..", "..", "examples", "Operation"
+    )
+
+    @classmethod
+    def setUpClass(cls):
+        cls.sets = ReadSets(path=os.path.join(cls.path, "sets"), mode="Operation")
+        cls.sets._read_data(os.path.join(cls.path, "parameters"))
+        cls.region = cls.sets.regions[0]
+
+    def test_representative_timesteps(self):
+        for method in ["kmeans", "kmedoids"]:
+            clustered, clusters = cluster_sets(self.sets, 10, period=168, method=method)
+            demand = clustered.data[self.region]["demand"]
+
+            # 10 weeks and the 24 hours left at the end of the year
+            self.assertEqual(len(clustered.time_steps), 10 * 168 + 24)
+            self.assertEqual(len(demand), len(clustered.time_steps))
+            self.assertEqual(clusters.weights.sum(), len(self.sets.time_steps))
+            self.assertAlmostEqual(clustered.timeslice_fraction.sum(), 1)
+
+    def test_energy_preserved(self):
+        clustered, clusters = cluster_sets(self.sets, 12)
+        demand = clustered.data[self.region]["demand"]
+
+        self.assertTrue(
+            np.allclose(
+                demand.values.sum(axis=0),
+                self.sets.data[self.region]["demand"].values.sum(axis=0),
+            )
+        )
+
+        hourly = clusters.disaggregate(demand)
+        self.assertEqual(len(hourly), len(self.sets.time_steps))
+        self.assertTrue(
+            np.allclose(hourly.values.sum(axis=0), demand.values.sum(axis=0))
+        )
+        self.assertEqual(
+            list(hourly.index.get_level_values(1)), list(self.sets.time_steps)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
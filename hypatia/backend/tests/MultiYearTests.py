@@ -0,0 +1,97 @@
+import os
+import numpy as np
+import pandas as pd
+import unittest
+from hypatia.backend.StrData import ReadSets
+from hypatia.backend.MultiYear import year_sets, solve_year, solve_years
+
+'''
+Unit tests for the functions in MultiYear.py
+'''
+
+def _add_year(frames, year, new_year, scale):
+
+    """Repeats the inputs of a year for a new year, with the demand scaled"""
+
+    extended = {}
+    for name, frame in frames.items():
+        if frame.index.get_level_values(0).isin([year]).all():
+            new = frame * scale if name == "demand" else frame.copy()
+            if isinstance(new.index, pd.MultiIndex):
+                new.index = new.index.set_levels([new_year], level=0)
+            else:
+                new.index = pd.Index([new_year], name=frame.index.name)
+            frame = pd.concat([frame, new])
+        extended[name] = frame
+
+    return extended
+
+
+class TestMultiYear(unittest.TestCase):
+    path = os.path.join(
+        os.path.dirname(__file__), "..", "..", "examples", "Operation"
+    )
+
+    @classmethod
+    def setUpClass(cls):
+        sets = ReadSets(path=os.path.join(cls.path, "sets"), mode="Operation")
+        sets._read_data(os.path.join(cls.path, "parameters"))
+        cls.first = solve_year(sets, "Y0", "HIGHS", False, engine="sparse")
+
+        years = sets.glob_mapping["Years"]
+        sets.glob_mapping = dict(
+            sets.glob_mapping,
+            Years=pd.concat(
+                [years, years.assign(Year="Y1", Year_name="Second")],
+                ignore_index=True,
+            ),
+        )
+        sets.main_years = ["Y0", "Y1"]
+        sets.data = {
+            reg: _add_year(data, "Y0", "Y1", 1.2) for reg, data in sets.data.items()
+        }
+        sets.trade_data = _add_year(sets.trade_data, "Y0", "Y1", 1)
+        sets.global_data = _add_year(sets.global_data, "Y0", "Y1", 1)
+        cls.sets = sets
+
+    def test_year_sets(self):
+        sets = year_sets(self.sets, "Y1")
+        region = self.sets.regions[0]
+
+        self.assertEqual(sets.main_years, ["Y1"])
+        self.assertEqual(len(sets.data[region]["demand"]), len(sets.time_steps))
+        self.assertTrue(
+            np.allclose(
+                sets.data[region]["demand"].values,
+                self.sets.data[region]["demand"].loc["Y0"].values * 1.2,
+            )
+        )
+
+    def test_solve_years(self):
+        results = solve_years(self.sets, "HIGHS", False, engine="sparse")
+        region = self.sets.regions[0]
+        n_steps = len(self.sets.time_steps)
+
+        for key, frame in results["production_by_tech"][region].items():
+            self.assertEqual(len(frame), 2 * n_steps)
+            self.assertTrue(
+                np.allclose(
+                    frame.iloc[:n_steps].values,
+                    self.first["production_by_tech"][region][key].values,
+                    atol=1e-4,
+                )
+            )
+        self.assertEqual(
+            list(results["variable_cost"][region]["Supply"].index), [2021, "Second"]
+        )
+
+    def test_process_pool(self):
+        results = solve_years(self.sets, "HIGHS", False, processes=2, engine="sparse")
+        region = self.sets.regions[0]
+
+        for key, frame in results["production_by_tech"][region].items():
+            self.assertEqual(len(frame), 2 * len(self.sets.time_steps))
+
+
+if __name__ == "__main__":
+    unittest.main()
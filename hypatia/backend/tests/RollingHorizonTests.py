@@ -0,0 +1,226 @@
+import os
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+import unittest
+from unittest import mock
+from hypatia.backend import RollingHorizon
+from hypatia.backend.StrData import ReadSets, read_set_tables, write_set_tables
+from hypatia.backend.Build import BuildModel
+from hypatia.backend.RollingHorizon import (
+    rolling_windows,
+    window_sets,
+    solve_rolling_horizon,
+)
+from hypatia.utility.utility import storage_state_of_charge
+
+'''
+Unit tests for the functions in RollingHorizon.py
+'''
+
+class TestRollingHorizon(unittest.TestCase):
+    path = os.path.join(
+        os.path.dirname(__file__), "..", "..", "examples", "Operation"
+    )
+
+    @classmethod
+    def setUpClass(cls):
+        cls.sets = ReadSets(path=os.path.join(cls.path, "sets"), mode="Operation")
+        cls.sets._read_data(os.path.join(cls.path, "parameters"))
+
+    def test_rolling_windows(self):
+        windows = list(rolling_windows(10, 4, 2))
+
+        self.assertEqual([kept for _, kept in windows], [4, 4, 2])
+        self.assertEqual([list(steps) for steps, _ in windows][1], [4, 5, 6, 7, 8, 9])
+        self.assertEqual(list(windows[-1][0]), [8, 9])
+
+    def test_window_sets(self):
+        steps = np.arange(24, 48)
+        sets = window_sets(self.sets, steps)
+        region = self.sets.regions[0]
+        share = 24 / len(self.sets.time_steps)
+
+        self.assertEqual(sets.time_steps, self.sets.time_steps[24:48])
+        self.assertEqual(len(sets.timeslice_fraction), 24)
+        self.assertTrue(
+            sets.data[region]["demand"].equals(
+                self.sets.data[region]["demand"].iloc[24:48]
+            )
+        )
+        self.assertTrue(
+            np.allclose(
+                sets.data[region]["tech_max_production"].values,
+                self.sets.data[region]["tech_max_production"].values * share,
+            )
+        )
+        self.assertEqual(len(self.sets.data[region]["demand"]), 8760)
+
+    def test_same_as_single_solve(self):
+        model = BuildModel(sets=self.sets, engine="sparse")
+        model._solve(verbosity=False, solver="HIGHS")
+        results = solve_rolling_horizon(
+            self.sets, 4380, 24, solver="HIGHS", verbosity=False, engine="sparse"
+        )
+
+        for reg, costs in model.cost_variable.items():
+            for key, cost in costs.items():
+                self.assertTrue(
+                    np.allclose(
+                        results.cost_variable[reg][key], cost.value, rtol=1e-6
+                    )
+                )
+
+
+def add_battery(sets, folder):
+
+    """
+    Gives the sets of the operation example with a battery storing the
+    electricity of the first region, keeping the values of the example for
+    the other technologies
+    """
+
+    battery = {
+        "Technology": "Battery",
+        "Tech_name": "Battery",
+        "Tech_category": "Storage",
+    }
+    added = {
+        "Technologies_glob": [dict(battery, Tech_cap_unit="MW", Tech_act_unit="MWh")],
+        "Technologies": [battery],
+        "Carrier_input": [{"Technology": "Battery", "Carrier_in": "Elec"}],
+        "Carrier_output": [{"Technology": "Battery", "Carrier_out": "Elec"}],
+    }
+    for file_name in ["global"] + sets.regions:
+        tables = read_set_tables(sets.path, file_name)
+        for name, rows in added.items():
+            if name in tables and file_name in ["global", sets.regions[0]]:
+                tables[name] = pd.concat(
+                    [tables[name], pd.DataFrame(rows)], ignore_index=True
+                )
+        write_set_tables(folder, file_name, tables)
+
+    stored = ReadSets(path=folder, mode="Operation")
+    frames = [sets.trade_data, sets.global_data]
+    frames.extend(sets.data[reg] for reg in sets.regions)
+    data = []
+    for (_, ids, sheet_ids, _), example in zip(stored._parameter_files(), frames):
+        data.append({})
+        for name, ids_of_name in ids.items():
+            sheet = sheet_ids[ids_of_name["sheet_name"]]
+            frame = pd.DataFrame(
+                sheet["value"], index=sheet["index"], columns=sheet["columns"]
+            ).astype(float)
+            if name in example:
+                common = [col for col in frame.columns if col in example[name].columns]
+                frame.loc[:, common] = example[name].loc[:, common].values
+            data[-1][name] = frame
+
+    stored.trade_data, stored.global_data = data[:2]
+    stored.data = dict(zip(stored.regions, data[2:]))
+    battery_data = stored.data[stored.regions[0]]
+    battery_data["tech_residual_cap"].loc[:, ("Storage", "Battery")] = 100
+    battery_data["storage_initial_SOC"].iloc[:, :] = 50
+    for name in ["storage_charge_efficiency", "storage_discharge_efficiency"]:
+        battery_data[name].iloc[:, :] = 0.9
+    for name in ["storage_charge_time", "storage_discharge_time"]:
+        battery_data[name].iloc[:, :] = 4
+    stored._create_carrier_incidence()
+
+    return stored
+
+
+class TestRollingHorizonWithStorage(unittest.TestCase):
+    path = TestRollingHorizon.path
+
+    @classmethod
+    def setUpClass(cls):
+        sets = ReadSets(path=os.path.join(cls.path, "sets"), mode="Operation")
+        sets._read_data(os.path.join(cls.path, "parameters"))
+
+        folder = tempfile.mkdtemp()
+        try:
+            cls.sets = add_battery(sets, folder)
+        finally:
+            shutil.rmtree(folder)
+        cls.region = cls.sets.regions[0]
+
+        # half of the hydro power produced without an annual limit
+        cls.limit = 3e7
+        cls.sets.data[cls.region]["tech_max_production"].loc[
+            :, ("Supply", "Hydro_PP")
+        ] = cls.limit
+
+        cls.models = []
+
+        def build(*args, **kwargs):
+            model = BuildModel(*args, **kwargs)
+            if model.solution is None:
+                cls.models.append(model)
+            return model
+
+        # windows of a month shorter than the year, looking a day ahead
+        cls.window, cls.overlap = 720, 24
+        with mock.patch.object(RollingHorizon, "BuildModel", side_effect=build):
+            cls.results = solve_rolling_horizon(
+                cls.sets,
+                cls.window,
+                cls.overlap,
+                solver="HIGHS",
+                verbosity=False,
+                engine="sparse",
+            )
+
+    def test_storage_carry_over(self):
+        windows = rolling_windows(len(self.sets.time_steps), self.window, self.overlap)
+        kept = [n_kept for _, n_kept in windows]
+        self.assertEqual(len(self.models), len(kept))
+
+        for model, next_model, n_kept in zip(self.models, self.models[1:], kept):
+            self.assertTrue(
+                np.allclose(
+                    next_model.sets.data[self.region]["storage_initial_SOC"].values,
+                    model.storage_SOC[self.region].value[n_kept - 1],
+                )
+            )
+
+        # the stitched flows of the battery give the states of charge of the windows
+        variables = self.results.variables
+        data = self.sets.data[self.region]
+        state_of_charge = storage_state_of_charge(
+            data["storage_initial_SOC"].values,
+            variables["usebyTechnology"][self.region]["Storage"],
+            variables["productionbyTechnology"][self.region]["Storage"],
+            self.sets.main_years,
+            self.sets.time_steps,
+            data["storage_charge_efficiency"].values,
+            data["storage_discharge_efficiency"].values,
+        )
+        windows = np.concatenate(
+            [
+                model.storage_SOC[self.region].value[:n_kept]
+                for model, n_kept in zip(self.models, kept)
+            ]
+        )
+        self.assertGreater(np.ptp(windows), 0)
+        self.assertTrue(np.allclose(state_of_charge, windows))
+
+    def test_scaled_annual_limits(self):
+        n_steps = len(self.sets.time_steps)
+        windows = rolling_windows(n_steps, self.window, self.overlap)
+        for model, (_, n_kept) in zip(self.models, windows):
+            limit = model.sets.data[self.region]["tech_max_production"].loc[
+                :, ("Supply", "Hydro_PP")
+            ]
+            self.assertTrue(np.allclose(limit, self.limit * n_kept / n_steps))
+
+        production = self.results.variables["productionbyTechnology"][self.region]
+        hydro = self.sets.Technologies[self.region]["Supply"].index("Hydro_PP")
+        annual = production["Supply"][:, hydro].sum()
+        self.assertLessEqual(annual, self.limit * (1 + 1e-6))
+        self.assertGreater(annual, self.limit * 0.9)
+
+
+if __name__ == "__main__":
+    unittest.main()
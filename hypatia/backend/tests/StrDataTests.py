@@ -1,6 +1,27 @@
+import copy
+import importlib.util
+import os
+import shutil
+import tempfile
+import numpy as np
 import pandas as pd
 import unittest
-from hypatia.backend.StrData import create_technology_columns
+from unittest import mock
+from openpyxl import load_workbook
+from hypatia.backend import StrData
+from hypatia.backend.StrData import (
+    ReadSets,
+    create_technology_columns,
+    read_parameter_file,
+    read_set_tables,
+    write_set_tables,
+)
+from hypatia.error_log.Exceptions import (
+    MissingDependency,
+    WrongMappingData,
+    WrongSheetName,
+)
+from hypatia.utility.constants import take_ids
 
 '''
 Unit tests for the functions in StrData.py
@@ -84,5 +105,429 @@ class TestCreateTechnologyColumns(unittest.TestCase):
         )
 
 
+class TestCarrierIncidence(unittest.TestCase):
+    path = os.path.join(
+        os.path.dirname(__file__), "..", "..", "examples", "Planning"
+    )
+
+    @classmethod
+    def setUpClass(cls):
+        cls.sets = ReadSets(path=os.path.join(cls.path, "sets"), mode="Planning")
+        cls.sets._read_data(os.path.join(cls.path, "parameters"))
+
+    def test_carrier_incidence(self):
+        carriers = list(self.sets.glob_mapping["Carriers_glob"]["Carrier"])
+
+        for reg in self.sets.regions:
+            for direction, table, column in [
+                ("in", "Carrier_input", "Carrier_in"),
+                ("out", "Carrier_output", "Carrier_out"),
+            ]:
+                expected = set(
+                    zip(
+                        self.sets.mapping[reg][table]["Technology"],
+                        self.sets.mapping[reg][table][column],
+                    )
+                )
+
+                links = set()
+                for key, matrix in self.sets.carrier_incidence[reg][direction].items():
+                    techs = self.sets.Technologies[reg][key]
+                    self.assertEqual(matrix.shape, (len(techs), len(carriers)))
+                    for tech_indx, carr_indx in zip(*matrix.nonzero()):
+                        links.add((techs[tech_indx], carriers[carr_indx]))
+
+                self.assertEqual(links, expected)
+
+    def test_conversion_plus_incidence(self):
+        # a combined heat and power plant with two inputs and two outputs
+        folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, folder)
+        chp = {
+            "Technology": "CHP",
+            "Tech_name": "Combined Heat and Power",
+            "Tech_category": "Conversion_plus",
+        }
+        added = {
+            "Technologies_glob": [dict(chp, Tech_cap_unit="GW", Tech_act_unit="GWh")],
+            "Technologies": [chp],
+            "Carrier_input": [
+                {"Technology": "CHP", "Carrier_in": carrier}
+                for carrier in ["Raw Oil", "Oil"]
+            ],
+            "Carrier_output": [
+                {"Technology": "CHP", "Carrier_out": carrier}
+                for carrier in ["Elec", "Oil_final"]
+            ],
+        }
+        for file_name in ["global"] + self.sets.regions:
+            tables = read_set_tables(os.path.join(self.path, "sets"), file_name)
+            for name, rows in added.items():
+                if name in tables:
+                    tables[name] = pd.concat(
+                        [tables[name], pd.DataFrame(rows)], ignore_index=True
+                    )
+            write_set_tables(folder, file_name, tables)
+
+        sets = ReadSets(path=folder, mode="Planning")
+        region = sets.regions[0]
+        rng = np.random.default_rng(0)
+        ratios = {}
+        for _, ids, sheet_ids, _ in sets._parameter_files():
+            for direction in ["in", "out"]:
+                name = "carrier_ratio_{}".format(direction)
+                if name in ids:
+                    sheet = sheet_ids[ids[name]["sheet_name"]]
+                    ratios[name] = pd.DataFrame(
+                        rng.uniform(
+                            0.1, 1, size=(len(sheet["index"]), len(sheet["columns"]))
+                        ),
+                        index=sheet["index"],
+                        columns=sheet["columns"],
+                    )
+        sets.data = {region: ratios}
+        sets._create_carrier_incidence()
+
+        carriers = list(sets.glob_mapping["Carriers_glob"]["Carrier"])
+        n_rows = len(sets.main_years) * len(sets.time_steps)
+        techs = sets.Technologies[region]["Conversion_plus"]
+        for direction, carriers_of_chp in [
+            ("in", ["Raw Oil", "Oil"]),
+            ("out", ["Elec", "Oil_final"]),
+        ]:
+            ratio = ratios["carrier_ratio_{}".format(direction)]
+            matrix = sets.carrier_incidence[region][direction]["Conversion_plus"]
+            expected = np.zeros((n_rows * len(carriers), n_rows * len(techs)))
+            for carrier in carriers_of_chp:
+                carr_indx = carriers.index(carrier)
+                tech_indx = techs.index("CHP")
+                expected[
+                    carr_indx * n_rows + np.arange(n_rows),
+                    tech_indx * n_rows + np.arange(n_rows),
+                ] = ratio.loc[:, ("CHP", carrier)].values
+
+            self.assertEqual(matrix.shape, expected.shape)
+            self.assertTrue(np.array_equal(matrix.toarray(), expected))
+
+
+class TestReadParameterFile(unittest.TestCase):
+    path = os.path.join(
+        os.path.dirname(__file__), "..", "..", "examples", "Planning"
+    )
+
+    def setUp(self):
+        self.sets = ReadSets(path=os.path.join(self.path, "sets"), mode="Planning")
+        self.region = self.sets.regions[0]
+        self.ids = take_ids(self.sets.regions, self.sets.Technologies, "Planning")
+        self.file_name = "parameters_{}".format(self.region)
+
+    def read(self, path):
+        return read_parameter_file(
+            path,
+            self.file_name,
+            self.ids[self.region],
+            self.sets.regional_sheets_ids[self.region],
+            "{}.xlsx".format(self.file_name),
+        )
+
+    def test_same_as_reading_each_sheet(self):
+        parameters = os.path.join(self.path, "parameters")
+        data = self.read(parameters)
+
+        for key, value in self.ids[self.region].items():
+            expected = pd.read_excel(
+                os.path.join(parameters, "{}.xlsx".format(self.file_name)),
+                sheet_name=value["sheet_name"],
+                index_col=value["index_col"],
+                header=value["header"],
+            )
+            self.assertTrue(expected.equals(data[key]))
+
+    def test_missing_sheet(self):
+        folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, folder)
+        file = os.path.join(folder, "{}.xlsx".format(self.file_name))
+        shutil.copy(
+            os.path.join(self.path, "parameters", "{}.xlsx".format(self.file_name)),
+            file,
+        )
+        workbook = load_workbook(file)
+        workbook.remove(workbook[workbook.sheetnames[0]])
+        workbook.save(file)
+
+        with self.assertRaises(WrongSheetName):
+            self.read(folder)
+
+
+class TestReadSetTables(unittest.TestCase):
+    path = os.path.join(
+        os.path.dirname(__file__), "..", "..", "examples", "Planning", "sets"
+    )
+
+    def test_same_as_reading_each_cell(self):
+        tables = read_set_tables(self.path, "global")
+        sheet = load_workbook(os.path.join(self.path, "global.xlsx"))["Sets"]
+
+        self.assertEqual(list(tables), list(sheet.tables))
+        for name, cell_range in sheet.tables.items():
+            content = [[cell.value for cell in row] for row in sheet[cell_range]]
+            expected = pd.DataFrame(content[1:], columns=content[0])
+            self.assertTrue(expected.equals(tables[name]))
+
+    def test_csv_sets(self):
+        folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, folder)
+        for file_name in ["global", "reg1"]:
+            write_set_tables(folder, file_name, read_set_tables(self.path, file_name))
+
+        sets = ReadSets(path=folder, mode="Planning")
+        expected = ReadSets(path=self.path, mode="Planning")
+
+        self.assertEqual(sets.main_years, expected.main_years)
+        self.assertEqual(sets.Technologies, expected.Technologies)
+        self.assertEqual(
+            sets.regional_sheets_ids.keys(), expected.regional_sheets_ids.keys()
+        )
+
+    def test_missing_file(self):
+        with self.assertRaises(FileNotFoundError):
+            read_set_tables(self.path, "reg2")
+
+    def write_yaml(self, folder):
+        tables = read_set_tables(self.path, "global")
+        content = {name: table.to_dict("records") for name, table in tables.items()}
+        with open(os.path.join(folder, "global.yaml"), "w") as stream:
+            StrData.yaml.safe_dump(content, stream, sort_keys=False)
+
+        return tables
+
+    @unittest.skipUnless(importlib.util.find_spec("yaml"), "needs pyyaml")
+    def test_yaml_sets(self):
+        folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, folder)
+        tables = self.write_yaml(folder)
+
+        read = read_set_tables(folder, "global")
+        self.assertEqual(list(read), list(tables))
+        for name, table in tables.items():
+            self.assertTrue(table.equals(read[name]))
+
+    @unittest.skipUnless(importlib.util.find_spec("yaml"), "needs pyyaml")
+    def test_yaml_without_pyyaml(self):
+        folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, folder)
+        self.write_yaml(folder)
+
+        with mock.patch.object(StrData, "yaml", None):
+            with self.assertRaisesRegex(MissingDependency, "hypatia-py\\[yaml\\]"):
+                read_set_tables(folder, "global")
+
+
+class TestDeclaredLines(unittest.TestCase):
+    path = os.path.join(
+        os.path.dirname(__file__), "..", "..", "examples", "Operation", "sets"
+    )
+
+    def write_sets(self, lines):
+        folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, folder)
+        for file_name in ["global", "reg1", "reg2"]:
+            tables = read_set_tables(self.path, file_name)
+            if file_name == "global":
+                tables["Lines"] = pd.DataFrame(
+                    lines, columns=["Region_from", "Region_to", "Carrier"]
+                )
+            write_set_tables(folder, file_name, tables)
+
+        return folder
+
+    def test_connection_columns(self):
+        folder = self.write_sets([("reg2", "reg1", "Heat"), ("reg1", "reg2", "Elec")])
+        sets = ReadSets(path=folder, mode="Operation")
+
+        self.assertEqual(sets.lines_list, ["reg1-reg2"])
+        self.assertEqual(sets.line_carriers["reg1-reg2"], ["Elec", "Heat"])
+        self.assertEqual(
+            list(sets.connection_sheet_ids["F_OM"]["columns"]),
+            [("reg1-reg2", "Elec"), ("reg1-reg2", "Heat")],
+        )
+
+    def test_all_lines_by_default(self):
+        sets = ReadSets(path=self.path, mode="Operation")
+        carriers = list(sets.glob_mapping["Carriers_glob"]["Carrier"])
+
+        self.assertEqual(sets.line_carriers, {"reg1-reg2": carriers})
+
+    def test_self_link(self):
+        folder = self.write_sets([("reg1", "reg1", "Elec")])
+
+        with self.assertRaises(WrongMappingData):
+            ReadSets(path=folder, mode="Operation")
+
+
+class TestColumnarParameters(unittest.TestCase):
+    path = os.path.join(
+        os.path.dirname(__file__), "..", "..", "examples", "Operation"
+    )
+
+    @classmethod
+    def setUpClass(cls):
+        cls.sets = ReadSets(path=os.path.join(cls.path, "sets"), mode="Operation")
+        cls.sets._read_data(os.path.join(cls.path, "parameters"), processes=1)
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder)
+        self.sets._write_data(self.folder, "csv")
+
+    def assert_round_trip(self, folder):
+        sets = ReadSets(path=os.path.join(self.path, "sets"), mode="Operation")
+        sets._read_data(folder, processes=1)
+
+        for reg in self.sets.regions:
+            for key, value in self.sets.data[reg].items():
+                self.assertTrue(value.equals(sets.data[reg][key]))
+                self.assertEqual(value.index.names, sets.data[reg][key].index.names)
+        for key, value in self.sets.trade_data.items():
+            self.assertTrue(value.equals(sets.trade_data[key]))
+
+    def test_csv_round_trip(self):
+        self.assert_round_trip(self.folder)
+
+    @unittest.skipUnless(
+        importlib.util.find_spec("pyarrow") or importlib.util.find_spec("fastparquet"),
+        "needs a parquet engine",
+    )
+    def test_parquet_round_trip(self):
+        folder = os.path.join(self.folder, "parquet")
+        os.makedirs(folder)
+        self.sets._write_data(folder, "parquet")
+
+        self.assert_round_trip(folder)
+
+    def test_process_pool(self):
+        sets = ReadSets(path=os.path.join(self.path, "sets"), mode="Operation")
+        sets._read_data(self.folder, processes=2)
+
+        for reg in self.sets.regions:
+            for key, value in self.sets.data[reg].items():
+                self.assertTrue(value.equals(sets.data[reg][key]))
+
+    def test_missing_sheet(self):
+        directory = os.path.join(self.folder, "parameters_global")
+        os.remove(os.path.join(directory, sorted(os.listdir(directory))[0]))
+
+        sets = ReadSets(path=os.path.join(self.path, "sets"), mode="Operation")
+        with self.assertRaises(WrongSheetName):
+            sets._read_data(self.folder, processes=1)
+
+
+class TestParameterArrays(unittest.TestCase):
+    path = os.path.join(
+        os.path.dirname(__file__), "..", "..", "examples", "Planning"
+    )
+
+    def setUp(self):
+        self.sets = ReadSets(path=os.path.join(self.path, "sets"), mode="Planning")
+        self.sets._read_data(os.path.join(self.path, "parameters"), processes=1)
+        self.region = self.sets.regions[0]
+        self.data = self.sets.data[self.region]
+
+    def test_columns_of_category(self):
+        value = self.sets.arrays.regional(self.region, "tech_var_cost", "Supply")
+
+        self.assertTrue(
+            np.array_equal(value, self.data["tech_var_cost"]["Supply"].values)
+        )
+        self.assertIs(
+            value, self.sets.arrays.regional(self.region, "tech_var_cost", "Supply")
+        )
+        self.assertFalse(value.flags.writeable)
+
+    def test_timesteps(self):
+        efficiency = self.data["tech_efficiency"]["Conversion"]
+        expected = pd.concat([efficiency] * len(self.sets.time_steps)).sort_index()
+
+        self.assertTrue(
+            np.array_equal(
+                self.sets.arrays.regional(
+                    self.region, "tech_efficiency", "Conversion", timesteps=True
+                ),
+                expected.values,
+            )
+        )
+
+    def test_clear(self):
+        before = self.sets.arrays.regional(self.region, "demand")
+        self.data["demand"].iloc[:, :] = self.data["demand"].values * 2
+        self.sets.arrays.clear("demand")
+
+        self.assertTrue(
+            np.array_equal(
+                self.sets.arrays.regional(self.region, "demand"), before * 2
+            )
+        )
+
+    def test_copies_have_own_arrays(self):
+        self.sets.arrays.regional(self.region, "demand")
+        copied = copy.copy(self.sets)
+
+        self.assertIsNot(copied.arrays, self.sets.arrays)
+        self.assertIs(copied.arrays.sets, copied)
+
+
+class TestCachedInputs(unittest.TestCase):
+    path = os.path.join(
+        os.path.dirname(__file__), "..", "..", "examples", "Planning"
+    )
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder)
+        shutil.copytree(self.path, os.path.join(self.folder, "model"))
+        self.sets_path = os.path.join(self.folder, "model", "sets")
+        self.parameters = os.path.join(self.folder, "model", "parameters")
+        self.cache = os.path.join(self.folder, "cache")
+
+    def read(self, parameters):
+        sets = ReadSets(path=self.sets_path, mode="Planning", cache=self.cache)
+        sets._read_data(parameters, processes=1)
+        return sets
+
+    def test_warm_start(self):
+        cold = self.read(self.parameters)
+        warm = self.read(self.parameters)
+
+        self.assertEqual(len(os.listdir(self.cache)), 2)
+        self.assertEqual(cold.Technologies, warm.Technologies)
+        for reg in cold.regions:
+            for key, value in cold.data[reg].items():
+                self.assertTrue(value.equals(warm.data[reg][key]))
+
+    def test_changed_file(self):
+        parameters = os.path.join(self.folder, "csv")
+        self.read(self.parameters)._write_data(parameters, "csv")
+        cold = self.read(parameters)
+
+        region = cold.regions[0]
+        directory = os.path.join(parameters, "parameters_{}".format(region))
+        file = os.path.join(directory, sorted(os.listdir(directory))[0])
+        with open(file) as stream:
+            lines = stream.readlines()
+        row = lines[-1].split(",")
+        lines[-1] = ",".join(row[:-1] + [str(float(row[-1]) + 1)]) + "\n"
+        with open(file, "w") as stream:
+            stream.writelines(lines)
+
+        changed = self.read(parameters)
+
+        self.assertEqual(len(os.listdir(self.cache)), 4)
+        self.assertFalse(
+            all(
+                value.equals(changed.data[region][key])
+                for key, value in cold.data[region].items()
+            )
+        )
+
 if __name__ == '__main__':
     unittest.main()
@@ -10,31 +10,73 @@ from hypatia.error_log.Exceptions import (
     DataNotImported,
     ResultOverWrite,
     SolverNotFound,
+    WrongEngine,
+    WrongFileFormat,
+    WrongHorizon,
+    NanValues,
 )
 
-from hypatia.backend.StrData import ReadSets
-from hypatia.backend.Build import BuildModel
-from copy import deepcopy
+from hypatia.backend.StrData import ReadSets, COLUMNAR_FORMATS, write_set_tables
+from hypatia.backend.Build import BuildModel, SPARSE_SOLVERS, PARAMETERS
+from hypatia.backend.RollingHorizon import solve_rolling_horizon
+from hypatia.backend.MultiYear import solve_years
+from hypatia.backend.Clustering import cluster_sets
 from hypatia.analysis.postprocessing import (
     set_DataFrame,
     dict_to_csv,
+    dict_to_npy,
+    plot_inputs,
+    SETS_FOLDER,
+    Results,
+    SolvedResults,
+    RESULT_ITEMS,
+    write_results,
+    read_results,
 )
 import os
 import shutil
+import time
+import numpy as np
 import pandas as pd
 
 import logging
 
 logger = logging.getLogger(__name__)
 
+# the stages of the compile and solve phases of the problem in run_stats
+RUN_PHASES = [
+    ("compile", "canonicalization"),
+    ("compile", "assembly"),
+    ("solve", "solver"),
+]
+
+# the sizes of the solved problem in run_stats, with the sizes eliminated by
+# the presolve
+RUN_SIZES = [
+    "variables",
+    "constraints",
+    "nonzeros",
+    "eliminated_variables",
+    "eliminated_constraints",
+]
+
 
 class Model:
 
     """
     A Hypatia Model
+
+    Attributes
+    -----------
+    run_stats: dict
+        Set by :meth:`run`. 'timings' is a pandas.Series of the seconds taken
+        by each phase of the run, indexed by the stage ('build', 'compile',
+        'solve' or 'results') and the phase, such as the methods that build
+        the constraints. 'variables', 'constraints' and 'nonzeros' are the
+        sizes of the solved problem, when it is solved as a single problem.
     """
 
-    def __init__(self, path, mode, name="unknown"):
+    def __init__(self, path, mode, name="unknown", cache=None):
 
         """Initializes a Hypatia model by passing the optimization mode and
         the path of the structural input files
@@ -54,11 +96,20 @@ class Model:
 
         name : str (Optional)
             Defines the name of the model.
+
+        cache : str (Optional)
+            The directory of a cache of the parsed set and parameter files.
+            The files are parsed once and cached by a hash of their content,
+            so the next models with the same files are created and read their
+            input data without parsing the excel files again. Any change in
+            the files is detected by the hash and the files are parsed again.
         """
 
-        self._StrData = ReadSets(path=path, mode=mode,)
+        self._StrData = ReadSets(path=path, mode=mode, cache=cache)
 
         self.name = name
+        self._model = None
+        self._clusters = None
 
     def create_data_excels(self, path, force_rewrite=False):
 
@@ -94,7 +145,7 @@ class Model:
         os.mkdir(path)
         self._StrData._write_input_excel(path)
 
-    def read_input_data(self, path):
+    def read_input_data(self, path, processes=1):
 
         """Reades the filled input data excel files by passing the path
         where they are located
@@ -104,21 +155,156 @@ class Model:
         path : str
             path defines the directory where the filled input parameter files
             are located. It can be different from the path where the parameter
-            files with default values were written
+            files with default values were written. The parameter files can
+            also be given in the columnar formats written by
+            :meth:`convert_input_data`
+
+        processes : int (Optional)
+            By default the parameter files are read one after the other. With
+            more than one, the files of the regions are read in a pool of this
+            many processes, and with None as many as the processors of the
+            machine. On Windows and macOS, the processes import the main
+            script again, so a script that uses a pool must run the model
+            under an ``if __name__ == "__main__":`` guard.
 
         """
 
-        self._StrData._read_data(path)
+        self._StrData._read_data(path, processes=processes)
+        self._model = None
+        self._clusters = None
 
-    def run(self, solver, verbosity=True, force_rewrite=False, **kwargs):
+    def convert_input_data(self, path, new_path, format="csv"):
+
+        """Converts the filled input data excel files to a columnar format,
+        which is much faster to read. Each parameter file is written as a
+        directory with the same name and one file per sheet, keeping the
+        indices and the columns of the sheets. :meth:`read_input_data` reads
+        the converted files from new_path as the excel files. The converted
+        data are also imported to the model.
+
+        Parameters
+        -------
+        path : str
+            The directory where the filled input parameter excel files are
+            located.
+
+        new_path : str
+            The directory where the converted parameter files are written.
+
+        format : str (Optional)
+            The format of the converted files. Acceptable values are :
+
+                * 'csv' (default)
+                * 'parquet' : needs the pyarrow or the fastparquet package,
+                  installed with the parquet extra of hypatia-py
+        """
+
+        if format not in COLUMNAR_FORMATS:
+            raise WrongFileFormat(
+                f"{format} is not a valid format. Acceptable formats are "
+                f"{list(COLUMNAR_FORMATS)}."
+            )
+
+        self.read_input_data(path)
+        os.makedirs(new_path, exist_ok=True)
+        self._StrData._write_data(new_path, format)
+
+    def cluster_time_series(self, n_clusters, period=24, method="kmeans", seed=0):
+
+        """Reduces the timesteps of the model to representative periods by
+        clustering the hourly demand and resource capacity factor profiles
+
+        Parameters
+        ----------
+        n_clusters : int
+            The number of representative periods.
+
+        period : int (Optional)
+            The number of timesteps of a period, such as 24 for days or 168
+            for weeks. The timesteps at the end of the year that do not fill
+            a whole period are kept as they are.
+
+        method : str (Optional)
+            The clustering algorithm. Acceptable values are :
+
+                * 'kmeans' : the representative periods are the means of
+                  the periods in each cluster
+                * 'kmedoids' : the representative periods are the most
+                  central periods of each cluster
+
+        seed : int (Optional)
+            The seed of the random initialization of the clusters.
+
+        .. note::
+
+            The timesteps of the model are replaced by the representative
+            timesteps, weighted by the number of timesteps they represent.
+            :meth:`disaggregate_results` maps the results back to the
+            original timesteps.
+        """
+
+        self._check_data_imported()
+
+        if self._clusters is not None:
+            raise WrongInputMode("The time series of the model are already clustered.")
+
+        if method not in ["kmeans", "kmedoids"]:
+            raise WrongInputMode(
+                f"{method} is not a valid clustering method. Acceptable methods "
+                "are 'kmeans' and 'kmedoids'."
+            )
+
+        n_periods = len(self._StrData.time_steps) // period
+        if not 0 < n_clusters <= n_periods:
+            raise WrongInputMode(
+                f"The number of clusters should be between 1 and {n_periods}, the "
+                f"number of periods of {period} timesteps."
+            )
+
+        self._StrData, self._clusters = cluster_sets(
+            self._StrData, n_clusters, period=period, method=method, seed=seed
+        )
+        self._model = None
+
+    def disaggregate_results(self):
+
+        """Gives the results of a model with clustered time series mapped
+        back to the original timesteps. The energy of each representative
+        timestep is divided equally among the timesteps it represents.
+        """
+
+        if not hasattr(self, "results"):
+            raise DataNotImported("The model is not solved yet.")
+
+        if self._clusters is None:
+            return self.results
+
+        return Results(self._clusters.disaggregate_results(self.results))
+
+    def run(
+        self,
+        solver,
+        verbosity=True,
+        force_rewrite=False,
+        engine="cvxpy",
+        parametrize=False,
+        window=None,
+        overlap=0,
+        processes=1,
+        results=None,
+        lazy=False,
+        presolve=False,
+        **kwargs,
+    ):
 
         """
         Run the model by passing the solver, verbosity and force_rewrite.
 
         .. note::
 
-            The passed solver must be in the installed solvers package of the DSL
-            (CVXPY).
+            With the 'cvxpy' engine, the passed solver must be in the installed
+            solvers package of the DSL (CVXPY). The 'sparse' engine solves the
+            problem with the HiGHS solvers of scipy.
 
         Parameters
         ---------
@@ -133,20 +319,345 @@ class Model:
             be overwritten and the previous results will be saved
             in a back-up file.
 
+        engine : str (Optional)
+            Defines how the problem is built. Acceptable values are :
+
+                * 'cvxpy' : the problem is built and canonicalized by CVXPY
+                * 'sparse' : the linear program is assembled directly as sparse
+                  matrices and solved by scipy with 'HIGHS', 'HIGHS-DS' or
+                  'HIGHS-IPM' as the solver, which is faster for large models
+
+        parametrize : boolean (Optional)
+            If True, the costs, demand, capacity factors and caps enter the
+            CVXPY problem as parameters and the compiled problem is kept on
+            the model. After changing them with :meth:`update_parameters`,
+            the next run only refreshes the parameter values and solves the
+            problem again. The first compilation of a parametrized problem is
+            slower, so this pays off when the same model is solved for many
+            scenarios. It is ignored by the 'sparse' engine.
+
+        window : int (Optional)
+            If given, the operation model is solved with a rolling horizon:
+            the timesteps are split into windows of this many timesteps (e.g.
+            168 for weeks) that are solved one after the other. The state of
+            charge of the storages at the end of a window is the initial state
+            of charge of the next one and the annual production and emission
+            limits are shared among the windows by the timeslice fraction of
+            their kept timesteps, without the overlap. The results of the windows are stitched into the usual results.
+
+        overlap : int (Optional)
+            The number of timesteps each window looks ahead into the next one.
+            The overlapping timesteps are solved but only kept from the next
+            window.
+
+        processes : int (Optional)
+            The years of an operation model with more than one year are solved
+            as separate problems, by default one after the other. With more
+            than one, they are solved in a pool of this many processes, and
+            with None as many as the processors of the machine. On Windows and
+            macOS, the processes import the main script again, so a script
+            that uses a pool must run the model under an
+            ``if __name__ == "__main__":`` guard.
+
+        results : list (Optional)
+            The names of the results to be extracted from the solved problem,
+            such as ['production_by_tech', 'total_capacity']. By default, all
+            the results are extracted.
+
+        lazy : boolean (Optional)
+            If True, each result is converted to DataFrames on its first
+            access instead of after solving the problem. The results of the
+            operation models with more than one year are always converted,
+            as their years are solved as separate problems.
+
+        presolve : boolean (Optional)
+            If True, the technologies whose capacity is bounded to zero
+            without residual capacity are fixed at zero and have no
+            variables, and the bounds that cannot be active, such as a
+            minimum of zero or a maximum at the default value of its
+            parameter, are not added to the problem. The numbers of the
+            eliminated variables and constraints are kept in run_stats. It
+            is ignored by parametrized problems, whose bounds can change.
+
         kwargs : Optional
             solver specific options. for more information refer to `cvxpy documentation <https://www.cvxpy.org/api_reference/cvxpy.problems.html?highlight=solve#cvxpy.problems.problem.Problem.solve>`_
 
         """
 
-        # checks if the input parameters are imported to the model
+        self._check_data_imported()
+
+        if results is not None:
+            unknown = [item for item in results if item not in RESULT_ITEMS]
+            if unknown:
+                raise WrongInputMode(
+                    f"{unknown} are not results of the model. Acceptable results "
+                    f"are {RESULT_ITEMS}"
+                )
+
+        self._backup_results(force_rewrite)
+
+        # checks if the given solver is available for the given engine
+        if engine == "cvxpy":
+            if solver.upper() not in installed_solvers():
+
+                raise SolverNotFound(
+                    f"Installed solvers on your system are {installed_solvers()}"
+                )
+
+        elif engine == "sparse":
+            if solver.upper() not in SPARSE_SOLVERS:
+
+                raise SolverNotFound(
+                    f"Solvers of the sparse engine are {list(SPARSE_SOLVERS)}"
+                )
+
+        else:
+            raise WrongEngine(
+                f"{engine} is not a valid engine. Acceptable engines are "
+                "'cvxpy' and 'sparse'."
+            )
+
+        if window is not None:
+            self._check_horizon(window, overlap)
+
+        start = time.perf_counter()
+        if self._StrData.mode == "Operation" and len(self._StrData.main_years) > 1:
+            self._model = None
+            frames = solve_years(
+                sets=self._StrData,
+                solver=solver.upper(),
+                verbosity=verbosity,
+                processes=processes,
+                engine=engine,
+                window=window,
+                overlap=overlap,
+                items=results,
+                presolve=presolve,
+                **kwargs,
+            )
+            self.check = frames
+            if frames is not None:
+                self.results = Results(frames)
+            self._set_run_stats(solve={"years": time.perf_counter() - start})
+            return
+
+        if window is not None:
+            self._model = None
+            solved = solve_rolling_horizon(
+                sets=self._StrData,
+                window=window,
+                overlap=overlap,
+                solver=solver.upper(),
+                verbosity=verbosity,
+                engine=engine,
+                presolve=presolve,
+                **kwargs,
+            )
+            solved_at = time.perf_counter()
+            self._set_results(solved, results, lazy)
+            self._set_run_stats(
+                solve={"windows": solved_at - start},
+                results=time.perf_counter() - solved_at,
+            )
+            return
+
+        if parametrize and engine == "cvxpy" and self._model is not None:
+            model = self._model
+            model._update_parameters()
+
+        else:
+            model = BuildModel(
+                sets=self._StrData,
+                engine=engine,
+                parametrize=parametrize,
+                presolve=presolve,
+            )
+
+        # keeps the compiled problem for solving it again with new parameters
+        self._model = model if model.parametrize else None
+
+        solved = model._solve(verbosity=verbosity, solver=solver.upper(), **kwargs)
+        solved_at = time.perf_counter()
+        self._set_results(solved, results, lazy)
+        self._set_run_stats(
+            build=model.timings,
+            stats=model.stats,
+            results=time.perf_counter() - solved_at,
+        )
+
+    def update_parameters(self, name, value, region=None):
+
+        """Updates the values of an input parameter of the model
+
+        If the model is run with parametrize=True and the parameter is one of
+        the costs, demand, capacity factors or caps, the next run solves the
+        compiled problem again with the new values. Otherwise, the problem is
+        built again in the next run.
+
+        Parameters
+        ----------
+        name : str
+            The name of the parameter in the input data, such as 'demand',
+            'tech_var_cost' or 'emission_cap_annual'.
+
+        value : pandas.DataFrame or numpy.ndarray
+            The new values of the parameter with the same shape, index and
+            columns of the current values.
+
+        region : str (Optional)
+            The region of a regional parameter. If not given, the parameter
+            is looked up in the global and in the inter-regional link
+            parameters.
+        """
+
+        self._check_data_imported()
+
+        if region is not None:
+            source = "data"
+            parameters = self._StrData.data.get(region, {})
+        else:
+            source = next(
+                (
+                    source
+                    for source in ["global_data", "trade_data"]
+                    if name in getattr(self._StrData, source, {})
+                ),
+                "global_data",
+            )
+            parameters = getattr(self._StrData, source, {})
+
+        if name not in parameters:
+            raise WrongInputMode(
+                f"{name} is not an input parameter"
+                + ("" if region is None else f" of region {region}")
+            )
+
+        if isinstance(getattr(self, "results", None), SolvedResults):
+            # the expressions of the lazy results may use the current values
+            self.results = Results(self.results)
+
+        frame = parameters[name]
+        if isinstance(value, pd.DataFrame):
+            value = value.reindex(index=frame.index, columns=frame.columns)
+        value = np.asarray(value, dtype=float)
+
+        if np.isnan(value).any():
+            raise NanValues(f"New values of {name} include nan or missing values")
+
+        frame.iloc[:, :] = value
+        self._StrData.arrays.clear(name)
+
+        if name in ["carrier_ratio_in", "carrier_ratio_out"]:
+            # the ratios are folded into the incidence of the carrier balance
+            self._StrData._create_carrier_incidence()
+            self._model = None
+
+        elif name not in PARAMETERS[source]:
+            # the value is a constant of the compiled problem
+            self._model = None
+
+    def export_problem(self, path, format="mps"):
+
+        """Writes the linear program of the model to a file, to be solved by
+        an external solver
+
+        The problem is assembled by the sparse engine and written block by
+        block. The variables are named after their region, technology
+        category, technology (or carrier), year and timeslice, such as
+        ``productionbyTechnology(Reg1,Supply,Tech1,Y0,T1)``, and the
+        constraints after the method of the model that defines them.
+
+        Parameters
+        ----------
+        path : str
+            Defines the path and the name of the file to be created.
+
+        format : str (Optional)
+            Defines the format of the file. Acceptable values are :
+
+                * 'mps' : free MPS format
+                * 'lp' : CPLEX LP format
+        """
+
+        self._check_data_imported()
+
+        if format not in ["mps", "lp"]:
+            raise WrongFileFormat(
+                f"{format} is not a valid format. Acceptable formats are "
+                "'mps' and 'lp'."
+            )
+
+        model = BuildModel(sets=self._StrData, engine="sparse")
+        model._export(path, format)
+
+    def import_solution(self, path, force_rewrite=False):
+
+        """Loads the primal solution of a problem exported by
+        :meth:`export_problem` and solved by an external solver into the
+        results of the model
+
+        Parameters
+        ----------
+        path : str
+            Defines the path to the solution file. Any line of the file with
+            a variable name followed by its value is read, the variables that
+            are not in the file are taken as zero.
+
+        force_rewrite : boolean
+            If the force_rewrite is True, any existing results will
+            be overwritten and the previous results will be saved
+            in a back-up file.
+        """
+
+        self._check_data_imported()
+        self._backup_results(force_rewrite)
+
+        model = BuildModel(sets=self._StrData, engine="sparse")
+        self._set_results(model._load_solution(path))
+
+    def _check_data_imported(self):
+
+        """
+        Checks if the input parameters are imported to the model
+        """
+
         if not hasattr(self._StrData, "data"):
 
             raise DataNotImported(
                 "No data is imported to the model. Use " "'read_input_data' function."
             )
 
-        # checks if the model is already solved when force_rewrite is false
-        # and takes a backup of previous results if force_rewrite is true
+    def _check_horizon(self, window, overlap):
+
+        """
+        Checks if the rolling horizon is used in the operation mode with
+        valid window and overlap lengths
+        """
+
+        if self._StrData.mode != "Operation":
+            raise WrongInputMode(
+                "The rolling horizon can only be used in the 'Operation' mode."
+            )
+
+        n_steps = len(self._StrData.time_steps)
+        if not (
+            isinstance(window, (int, np.integer))
+            and isinstance(overlap, (int, np.integer))
+            and 0 < window <= n_steps
+            and overlap >= 0
+        ):
+            raise WrongHorizon(
+                "The window must be a positive number of timesteps not larger "
+                f"than {n_steps} and the overlap a non negative number of timesteps."
+            )
+
+    def _backup_results(self, force_rewrite):
+
+        """
+        Checks if the model is already solved when force_rewrite is false
+        and takes a backup of previous results if force_rewrite is true
+        """
+
         if hasattr(self, "results"):
 
             if not force_rewrite:
@@ -156,37 +667,97 @@ class Model:
                     "'force_rewrite'= True"
                 )
 
-            self.backup_results = deepcopy(self.results)
+            # the results can not be changed, so they are kept without a copy
+            self.backup_results = self.results
+            if isinstance(self.results, SolvedResults) and self._model is not None:
+                # the kept problem may be solved again, changing its values
+                self.backup_results = Results(self.results)
 
             delattr(self, "results")
 
-        # checks if the given solver is in the installed solver package
-        if solver.upper() not in installed_solvers():
+    def _set_run_stats(self, build=None, solve=None, stats=None, results=None):
 
-            raise SolverNotFound(
-                f"Installed solvers on your system are {installed_solvers()}"
+        """
+        Keeps the seconds taken by the phases of the run, with the sizes of the
+        solved problem, in run_stats and logs them
+        """
+
+        stats = {} if stats is None else stats
+        timings = {("build", phase): seconds for phase, seconds in (build or {}).items()}
+        for stage, phase in RUN_PHASES:
+            if phase in stats:
+                timings[(stage, phase)] = stats[phase]
+        for phase, seconds in (solve or {}).items():
+            timings[("solve", phase)] = seconds
+        if results is not None:
+            timings[("results", "conversion")] = results
+
+        timings = pd.Series(timings, name="seconds", dtype=float)
+        timings.index.names = ["stage", "phase"]
+        self.run_stats = {"timings": timings}
+        self.run_stats.update(
+            {size: stats[size] for size in RUN_SIZES if size in stats}
+        )
+
+        stages = timings.groupby(level="stage", sort=False).sum()
+        logger.info(
+            ", ".join(f"{stage} {seconds:.3f} s" for stage, seconds in stages.items())
+            + "".join(
+                f", {self.run_stats[size]} {size}"
+                for size in RUN_SIZES
+                if size in self.run_stats
             )
+        )
 
-        model = BuildModel(sets=self._StrData)
+    def _set_results(self, results, items=None, lazy=False):
+
+        """
+        Turns the results of the solved problem, or only the given items, into
+        DataFrames, or into SolvedResults converted on their access if lazy
+        """
 
-        results = model._solve(verbosity=verbosity, solver=solver.upper(), **kwargs)
         self.check = results
         if results is not None:
 
-            results = set_DataFrame(
-                results=results,
+            sets = dict(
                 regions=self._StrData.regions,
                 years=self._StrData.main_years,
                 time_fraction=self._StrData.time_steps,
                 glob_mapping=self._StrData.glob_mapping,
                 technologies=self._StrData.Technologies,
                 mode=self._StrData.mode,
+                line_carriers=getattr(self._StrData, "line_carriers", None),
             )
 
-            self.results = results
+            if lazy:
+                self.results = SolvedResults(results, items, **sets)
+            else:
+                self.results = Results(
+                    set_DataFrame(results=results, items=items, **sets)
+                )
 
     def to_csv(self, path, force_rewrite=False):
-        """Exports the results of the model to csv files with nested folders
+        """Exports the results of the model to csv files with nested folders.
+        The sets and the inputs used by the plots are exported as well, so
+        the folder can be plotted by :class:`Plotter`.
+
+        Parameters
+        ----------
+        path : str
+            Defines the path to th 'folder' which all the results will be
+            created.
+        force_rewrite : boolean
+            if False, will stop the code in case the file already exists,
+            if True, will delete the file if alreadey exists and create a new one
+        """
+
+        self._export(path, force_rewrite, dict_to_csv)
+
+    def to_npy(self, path, force_rewrite=False):
+        """Exports the results of the model to binary files with nested
+        folders, as in :meth:`to_csv`. The values of each result are written
+        to a npy file and its labels to a json file. :class:`Plotter` memory
+        maps the npy files, so only the plotted results are loaded.
 
         Parameters
         ----------
@@ -198,6 +769,15 @@ class Model:
             if True, will delete the file if alreadey exists and create a new one
         """
 
+        self._export(path, force_rewrite, dict_to_npy)
+
+    def _export(self, path, force_rewrite, writer):
+
+        """
+        Writes the results, the inputs used by the plots and the sets to
+        nested folders with the given writer
+        """
+
         if not hasattr(self, "results"):
             raise WrongInputMode("model has not any results")
 
@@ -210,7 +790,85 @@ class Model:
         else:
             os.mkdir(path)
 
-        dict_to_csv(self.results, path)
+        results = dict(self.results)
+        if hasattr(self._StrData, "data"):
+            results.update(plot_inputs(self._StrData))
+        writer(results, path)
+
+        sets = os.path.join(path, SETS_FOLDER)
+        write_set_tables(sets, "global", self._StrData.glob_mapping)
+        for reg in self._StrData.regions:
+            write_set_tables(sets, reg, self._StrData.mapping[reg])
+
+    def to_parquet(self, path, force_rewrite=False):
+        """Exports the results of the model to a folder of parquet files, one
+        long format table per result with the region, category, technology,
+        year, timeslice and value columns. The labels are stored as
+        categorical columns. Needs the pyarrow or the fastparquet package.
+
+        Parameters
+        ----------
+        path : str
+            Defines the path to the folder of the parquet files.
+        force_rewrite : boolean
+            if False, will stop the code in case the folder already exists,
+            if True, will overwrite the files of the results
+        """
+
+        self._write_results(path, force_rewrite, "parquet")
+
+    def to_hdf(self, path, force_rewrite=False):
+        """Exports the results of the model to a single hdf file, with one
+        long format table per result stored under the name of the result,
+        as in :meth:`to_parquet`. Needs the tables package.
+
+        Parameters
+        ----------
+        path : str
+            Defines the path and the name of the hdf file to be created.
+        force_rewrite : boolean
+            if False, will stop the code in case the file already exists,
+            if True, will delete the file if alreadey exists and create a new one
+        """
+
+        self._write_results(path, force_rewrite, "hdf")
+
+    def read_results(self, path, items=None, force_rewrite=False):
+        """Loads the results written by :meth:`to_parquet` or :meth:`to_hdf`
+        into the results of the model
+
+        Parameters
+        ----------
+        path : str
+            Defines the path to the parquet folder or the hdf file.
+        items : list (Optional)
+            The names of the results to be loaded, all the results are loaded
+            if not given.
+        force_rewrite : boolean
+            If the force_rewrite is True, any existing results will
+            be overwritten and the previous results will be saved
+            in a back-up file.
+        """
+
+        self._backup_results(force_rewrite)
+        self.results = Results(read_results(path, items))
+
+    def _write_results(self, path, force_rewrite, format):
+
+        """
+        Writes the results in the given columnar format
+        """
+
+        if not hasattr(self, "results"):
+            raise WrongInputMode("model has not any results")
+
+        if os.path.exists(path) and not force_rewrite:
+            raise ResultOverWrite(
+                f"{path} already exists. To over write"
+                f" the results, use force_rewrite=True."
+            )
+
+        write_results(self.results, path, format)
 
     def create_config_file(self, path):
         """Creates a config excel file for plots
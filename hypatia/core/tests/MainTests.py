@@ -0,0 +1,52 @@
+import os
+import shutil
+import tempfile
+import warnings
+import numpy as np
+import unittest
+from hypatia import load_example
+
+'''
+Unit tests for the Model in main.py
+'''
+
+class TestUpdateParameters(unittest.TestCase):
+    def setUp(self):
+        warnings.simplefilter("ignore")
+        self.addCleanup(warnings.resetwarnings)
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder)
+
+    def costs(self, model):
+        model.run(
+            solver="HIGHS", verbosity=False, engine="sparse", force_rewrite=True
+        )
+        return np.array(
+            [
+                frame.values.sum()
+                for name in ["variable_cost", "fix_cost"]
+                for regional in model.results[name].values()
+                for frame in regional.values()
+            ]
+        )
+
+    def test_carrier_ratio(self):
+        model = load_example("Operation")
+        before = self.costs(model)
+
+        ratio = model._StrData.data["reg1"]["carrier_ratio_out"] * 0.5
+        model.update_parameters("carrier_ratio_out", ratio, region="reg1")
+        updated = self.costs(model)
+
+        # a fresh model reads the updated parameters from files
+        model._StrData._write_data(self.folder, "csv")
+        fresh = load_example("Operation")
+        fresh.read_input_data(self.folder)
+        expected = self.costs(fresh)
+
+        self.assertFalse(np.allclose(before, expected))
+        self.assertTrue(np.allclose(updated, expected))
+
+
+if __name__ == "__main__":
+    unittest.main()
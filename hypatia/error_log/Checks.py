@@ -71,14 +71,16 @@ def check_table_name(
         )
 
 
-def check_sheet_name(path, file_name, ids):
+def check_sheet_name(path, file_name, ids, sheet_names=None):
 
     """Checks if the sheets in the parameter files have valid names when 
-    reading the data
+    reading the data. The sheet names of a workbook that is already open can
+    be given to avoid opening it again
     """
 
-    file = pd.ExcelFile(r"{}/{}.xlsx".format(path, file_name))
-    given_sheets = set(file.sheet_names)
+    if sheet_names is None:
+        sheet_names = pd.ExcelFile(r"{}/{}.xlsx".format(path, file_name)).sheet_names
+    given_sheets = set(sheet_names)
 
     neccessary_sheets = set()
     for value in ids.values():
@@ -170,20 +172,35 @@ def check_mapping_ctgry(
             )
 
 
+def check_lines(lines_table, file_name):
+
+    """Checks if the declared inter-regional links connect two different
+    regions
+    """
+
+    if (lines_table["Region_from"] == lines_table["Region_to"]).any():
+
+        raise WrongMappingData(
+            f"An inter-regional link of the 'Lines' table in the '{file_name}' set "
+            "file connects a region with itself."
+        )
+
+
 def check_years_mode_consistency(mode, main_years):
 
     """Checks if the number of years is valid based on the given optimization
-    mode
+    mode. The years of the 'Operation' mode are solved as separate problems,
+    so any number of years is accepted as long as there is one
     """
 
-    if mode == "Operation":
+    if len(main_years) < 1:
+
+        raise WrongNumberOfYears(
+            f"The number of years is invalid. The '{mode}' optimization mode of "
+            "the energy system needs at least one year."
+        )
 
-        if len(main_years) != 1:
 
-            raise WrongNumberOfYears(
-                f"The number of years is invalid.The '{mode}' optimization mode of the energy system\
-                                     can be analyzed only with 'one year' time horizon"
-            )
 #%%
 
 # %%
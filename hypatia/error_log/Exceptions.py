@@ -93,3 +93,27 @@ class WrongNumberOfYears(Exception):
     """
 
     pass
+
+
+class WrongEngine(Exception):
+    """Raises when the engine for building the model is not known"""
+
+    pass
+
+
+class WrongFileFormat(Exception):
+    """Raises when the format of a file is not supported"""
+
+    pass
+
+
+class WrongHorizon(Exception):
+    """Raises when the window or the overlap of a rolling horizon is not valid"""
+
+    pass
+
+
+class MissingDependency(Exception):
+    """Raises when an optional package needed by a feature is not installed"""
+
+    pass
@@ -0,0 +1,797 @@
+# -*- coding: utf-8 -*-
+
+"""
+This module contains a light sparse representation of affine expressions
+that lets the model be assembled directly as the matrices of a linear
+program, without building and canonicalizing CVXPY expression trees.
+
+The functions at the module level are used by the build class in place of
+the CVXPY atoms. They dispatch on the type of their arguments, so the same
+model code builds CVXPY expressions, sparse affine expressions or plain
+NumPy arrays. The shape and broadcasting rules follow CVXPY, and the
+elements of the expressions are stacked in column-major order as in CVXPY.
+"""
+
+import cvxpy as cp
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+import time
+from scipy.optimize import linprog
+
+
+def _is_affine(*args):
+
+    return any(isinstance(arg, AffineExpression) for arg in args)
+
+
+def _is_cvxpy(*args):
+
+    return any(isinstance(arg, cp.Expression) for arg in args)
+
+
+def _constant(value):
+
+    """
+    Casts pandas objects and sequences to NumPy arrays
+    """
+
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.values.astype(float)
+
+    return np.asarray(value, dtype=float)
+
+
+def multiply(lh_expr, rh_expr):
+
+    """
+    Elementwise multiplication with broadcasting
+    """
+
+    if _is_affine(lh_expr, rh_expr):
+        if _is_affine(lh_expr):
+            return lh_expr._scale(rh_expr)
+        return rh_expr._scale(lh_expr)
+
+    if _is_cvxpy(lh_expr, rh_expr):
+        return cp.multiply(lh_expr, rh_expr)
+
+    return np.multiply(_constant(lh_expr), _constant(rh_expr))
+
+
+def sum(expr, axis=None, keepdims=False):
+
+    """
+    Sums the entries of an expression over the given axis
+    """
+
+    if _is_affine(expr):
+        return expr._sum(axis, keepdims)
+
+    if _is_cvxpy(expr):
+        return cp.sum(expr, axis=axis, keepdims=keepdims)
+
+    return np.sum(_constant(expr), axis=axis, keepdims=keepdims)
+
+
+def reshape(expr, shape):
+
+    """
+    Reshapes an expression in column-major order
+    """
+
+    if _is_affine(expr):
+        return expr._reshape(shape)
+
+    if _is_cvxpy(expr):
+        return cp.reshape(expr, shape)
+
+    return np.reshape(_constant(expr), shape, order="F")
+
+
+def vec(expr):
+
+    """
+    Flattens an expression in column-major order
+    """
+
+    if _is_affine(expr):
+        return expr._reshape((expr.size,))
+
+    if _is_cvxpy(expr):
+        return cp.vec(expr)
+
+    return np.ravel(_constant(expr), order="F")
+
+
+def cumsum(expr, axis=0):
+
+    """
+    Cumulative sum of an expression over the given axis
+    """
+
+    if _is_affine(expr):
+        return expr._cumsum(axis)
+
+    if _is_cvxpy(expr):
+        return cp.cumsum(expr, axis=axis)
+
+    return np.cumsum(_constant(expr), axis=axis)
+
+
+def values(exprs):
+
+    """
+    Gives the values of a list of expressions in the solution. The sparse
+    affine expressions of a program are evaluated together, with one product
+    of their stacked coefficients and the solution, the variables are sliced
+    from the solution and the pandas objects are taken as NumPy arrays. The
+    CVXPY expressions are evaluated one at a time, so the results of the
+    CVXPY engine are given as arrays evaluated from its variables instead
+    """
+
+    result = [None] * len(exprs)
+    programs = {}
+
+    for indx, expr in enumerate(exprs):
+        if isinstance(expr, Variable) or isinstance(expr, cp.Expression):
+            result[indx] = expr.value
+        elif isinstance(expr, AffineExpression):
+            programs.setdefault(id(expr.program), []).append(indx)
+        elif isinstance(expr, (pd.DataFrame, pd.Series)):
+            result[indx] = expr.values
+        else:
+            result[indx] = expr
+
+    for indices in programs.values():
+        program = exprs[indices[0]].program
+        if program.solution is None:
+            continue
+
+        stacked = sp.vstack(
+            [exprs[indx]._matrix(program.n_vars) for indx in indices], format="csr"
+        )
+        flat = stacked @ program.solution + np.concatenate(
+            [exprs[indx].constant for indx in indices]
+        )
+
+        start = 0
+        for indx in indices:
+            shape = exprs[indx].shape
+            value = flat[start : start + exprs[indx].size]
+            if shape:
+                result[indx] = value.reshape(shape, order="F")
+            else:
+                result[indx] = value.item()
+            start += exprs[indx].size
+
+    return result
+
+
+def _broadcast_shape(lh_shape, rh_shape):
+
+    """
+    Gives the shape of a binary elementwise operation based on the CVXPY rules:
+    scalars are promoted, two-dimensional operands replicate their dimensions
+    of size one and anything else follows NumPy
+    """
+
+    if np.prod(lh_shape, dtype=int) == 1 and np.prod(rh_shape, dtype=int) != 1:
+        return tuple(rh_shape)
+
+    if np.prod(rh_shape, dtype=int) == 1 and np.prod(lh_shape, dtype=int) != 1:
+        return tuple(lh_shape)
+
+    return tuple(np.broadcast_shapes(tuple(lh_shape), tuple(rh_shape)))
+
+
+def _broadcast_flat(value, shape):
+
+    """
+    Broadcasts a constant to the given shape and flattens it in
+    column-major order
+    """
+
+    if value.size == 1:
+        return np.full(int(np.prod(shape, dtype=int)), value.item())
+
+    return np.ravel(np.broadcast_to(value, shape), order="F")
+
+
+def _positions(shape):
+
+    """
+    Gives the flat column-major position of each entry of a given shape
+    """
+
+    return np.arange(int(np.prod(shape, dtype=int))).reshape(shape, order="F")
+
+
+class AffineExpression:
+
+    """An affine expression stored as ``coefficients @ x + constant``
+
+    Attributes
+    -----------
+    program:
+        The linear program that owns the variables x
+
+    shape: tuple
+        The shape of the expression
+
+    coefficients:
+        The sparse matrix with one row per entry of the expression and one
+        column per variable of the program
+
+    constant: numpy.ndarray
+        The constant term of each entry of the expression
+    """
+
+    # lets NumPy defer the binary and in-place operators to this class
+    __array_priority__ = 100
+
+    def __init__(self, program, shape, coefficients, constant):
+
+        self.program = program
+        self.shape = tuple(shape)
+        self.coefficients = sp.csr_matrix(coefficients)
+        self.constant = np.asarray(constant, dtype=float)
+
+    @property
+    def size(self):
+        return int(np.prod(self.shape, dtype=int))
+
+    @property
+    def ndim(self):
+        return len(self.shape)
+
+    @property
+    def value(self):
+
+        """
+        The value of the expression in the solution of the program
+        """
+
+        if self.program.solution is None:
+            return None
+
+        value = self._matrix(self.program.n_vars) @ self.program.solution
+        value = np.reshape(value + self.constant, self.shape, order="F")
+
+        if not self.shape:
+            return value.item()
+        return value
+
+    def _matrix(self, n_vars):
+
+        """
+        Gives the coefficients with the given number of variable columns
+        """
+
+        coefficients = self.coefficients
+        if coefficients.shape[1] == n_vars:
+            return coefficients
+
+        return sp.csr_matrix(
+            (coefficients.data, coefficients.indices, coefficients.indptr),
+            shape=(coefficients.shape[0], n_vars),
+        )
+
+    def _new(self, shape, coefficients, constant):
+
+        return AffineExpression(self.program, shape, coefficients, constant)
+
+    def _take(self, positions, shape):
+
+        """
+        Creates a new expression from the given entries of this one
+        """
+
+        return self._new(shape, self.coefficients[positions], self.constant[positions])
+
+    def _broadcast_to(self, shape):
+
+        if self.shape == tuple(shape):
+            return self
+
+        positions = np.broadcast_to(_positions(self.shape), shape)
+        return self._take(np.ravel(positions, order="F"), shape)
+
+    def _add(self, other, shortcut=True):
+
+        if isinstance(other, AffineExpression):
+
+            shape = _broadcast_shape(self.shape, other.shape)
+            lh_expr = self._broadcast_to(shape)
+            rh_expr = other._broadcast_to(shape)
+            n_vars = self.program.n_vars
+
+            return self._new(
+                shape,
+                lh_expr._matrix(n_vars) + rh_expr._matrix(n_vars),
+                lh_expr.constant + rh_expr.constant,
+            )
+
+        other = _constant(other)
+        # as in CVXPY, adding a constant zero leaves the expression untouched
+        if shortcut and not np.any(other):
+            return self
+
+        shape = _broadcast_shape(self.shape, other.shape)
+        expr = self._broadcast_to(shape)
+
+        return self._new(
+            shape, expr.coefficients, expr.constant + _broadcast_flat(other, shape)
+        )
+
+    def _scale(self, other):
+
+        other = _constant(other)
+        shape = _broadcast_shape(self.shape, other.shape)
+        expr = self._broadcast_to(shape)
+        factor = _broadcast_flat(other, shape)
+
+        return self._new(
+            shape, sp.diags(factor) @ expr.coefficients, factor * expr.constant
+        )
+
+    def _sum(self, axis=None, keepdims=False):
+
+        if axis is None:
+            shape = tuple(1 for _ in self.shape) if keepdims else ()
+            return self._new(
+                shape,
+                sp.csr_matrix(self.coefficients.sum(axis=0)),
+                [self.constant.sum()],
+            )
+
+        shape = list(self.shape)
+        shape[axis] = 1
+        # each entry is mapped to the position of its sum
+        rows = np.broadcast_to(_positions(shape), self.shape)
+        aggregation = sp.csr_matrix(
+            (np.ones(self.size), (np.ravel(rows, order="F"), np.arange(self.size))),
+            shape=(int(np.prod(shape, dtype=int)), self.size),
+        )
+        if not keepdims:
+            shape.pop(axis)
+
+        return self._new(
+            shape, aggregation @ self.coefficients, aggregation @ self.constant
+        )
+
+    def _reshape(self, shape):
+
+        if int(np.prod(shape, dtype=int)) != self.size:
+            raise ValueError(f"Cannot reshape {self.shape} into {tuple(shape)}")
+
+        return self._new(shape, self.coefficients, self.constant)
+
+    def _cumsum(self, axis=0):
+
+        """
+        The cumulative sum is represented by an auxiliary variable linked to
+        the expression by first order differences, to keep it sparse
+        """
+
+        if self.ndim == 1:
+            return self._reshape((self.size, 1))._cumsum(axis)._reshape(self.shape)
+
+        cumulative = self.program.variable(self.shape)
+
+        length = self.shape[axis]
+        difference = sp.diags(
+            [np.ones(length), -np.ones(length - 1)], [0, -1], shape=(length, length)
+        )
+        if axis == 0:
+            difference = sp.kron(sp.identity(self.shape[1]), difference, format="csr")
+        else:
+            difference = sp.kron(difference, sp.identity(self.shape[0]), format="csr")
+
+        self.program.auxiliary_constraints.append(
+            Constraint(
+                self._new(
+                    self.shape,
+                    difference @ cumulative._matrix(self.program.n_vars)
+                    - self._matrix(self.program.n_vars),
+                    -self.constant,
+                ),
+                "==",
+            )
+        )
+
+        return cumulative
+
+    def __getitem__(self, key):
+
+        positions = _positions(self.shape)[key]
+        return self._take(np.ravel(positions, order="F"), positions.shape)
+
+    def __neg__(self):
+
+        return self._new(self.shape, -self.coefficients, -self.constant)
+
+    def __add__(self, other):
+
+        return self._add(other)
+
+    def __radd__(self, other):
+
+        return self._add(other)
+
+    def __sub__(self, other):
+
+        if isinstance(other, AffineExpression):
+            return self._add(-other)
+
+        return self._add(-_constant(other))
+
+    def __rsub__(self, other):
+
+        return (-self)._add(other, shortcut=False)
+
+    def __mul__(self, other):
+
+        other = _constant(other)
+        if other.size != 1:
+            raise ValueError(
+                "Only scalars can multiply an affine expression with '*', "
+                "use 'multiply' or '@' instead"
+            )
+
+        return self._scale(other)
+
+    def __rmul__(self, other):
+
+        return self.__mul__(other)
+
+    def __truediv__(self, other):
+
+        return self._scale(1 / _constant(other))
+
+    def __matmul__(self, other):
+
+        """
+        expression @ matrix
+        """
+
+        if not sp.issparse(other):
+            other = _constant(other)
+
+        expr = self._reshape((1, self.size)) if self.ndim == 1 else self
+        rows, columns = expr.shape[0], other.shape[1]
+        operator = sp.kron(sp.csr_matrix(other).T, sp.identity(rows), format="csr")
+
+        shape = (columns,) if self.ndim == 1 else (rows, columns)
+        return self._new(
+            shape, operator @ self.coefficients, operator @ self.constant
+        )
+
+    def __rmatmul__(self, other):
+
+        """
+        matrix @ expression
+        """
+
+        if not sp.issparse(other):
+            other = _constant(other)
+
+        columns = 1 if self.ndim == 1 else self.shape[1]
+        operator = sp.kron(sp.identity(columns), sp.csr_matrix(other), format="csr")
+
+        shape = (other.shape[0],) if self.ndim == 1 else (other.shape[0], columns)
+        return self._new(
+            shape, operator @ self.coefficients, operator @ self.constant
+        )
+
+    def __le__(self, other):
+
+        return Constraint(self - other, "<=")
+
+    def __ge__(self, other):
+
+        if isinstance(other, AffineExpression):
+            return Constraint(other - self, "<=")
+
+        return Constraint((-self)._add(other, shortcut=False), "<=")
+
+    def __eq__(self, other):
+
+        return Constraint(self - other, "==")
+
+    __hash__ = object.__hash__
+
+    def __repr__(self):
+
+        return f"AffineExpression(shape={self.shape})"
+
+
+class Variable(AffineExpression):
+
+    """A decision variable of a linear program
+
+    Attributes
+    -----------
+    name: str
+        The name of the variable block
+
+    keys: tuple
+        The labels shared by all the entries of the block, such as the region
+        and the technology category
+
+    index, columns: list
+        The labels of the rows and of the columns of the block
+    """
+
+    def __init__(
+        self,
+        program,
+        shape,
+        start,
+        nonneg=False,
+        name=None,
+        keys=(),
+        index=None,
+        columns=None,
+    ):
+
+        size = int(np.prod(shape, dtype=int))
+        coefficients = sp.csr_matrix(
+            (np.ones(size), (np.arange(size), np.arange(start, start + size))),
+            shape=(size, start + size),
+        )
+        super().__init__(program, shape, coefficients, np.zeros(size))
+
+        self.start = start
+        self.nonneg = nonneg
+        self.name = name
+        self.keys = tuple(keys)
+        self.index = list(range(self.shape[0])) if index is None else list(index)
+        self.columns = (
+            list(range(int(np.prod(self.shape[1:], dtype=int))))
+            if columns is None
+            else list(columns)
+        )
+
+    def entry_names(self):
+
+        """
+        Gives the name of each entry of the block in column-major order
+        """
+
+        name = f"x{self.start}" if self.name is None else self.name
+        keys = [str(key) for key in self.keys]
+
+        return [
+            f"{name}({','.join(keys + [str(column), str(row)])})"
+            for column in self.columns
+            for row in self.index
+        ]
+
+    @property
+    def value(self):
+
+        if self.program.solution is None:
+            return None
+
+        return np.reshape(
+            self.program.solution[self.start : self.start + self.size],
+            self.shape,
+            order="F",
+        )
+
+    @value.setter
+    def value(self, value):
+
+        if self.program.solution is None:
+            self.program.solution = np.zeros(self.program.n_vars)
+
+        self.program.solution[self.start : self.start + self.size] = np.ravel(
+            np.broadcast_to(value, self.shape), order="F"
+        )
+
+    def __repr__(self):
+
+        return f"Variable(shape={self.shape}, nonneg={self.nonneg})"
+
+
+class Constraint:
+
+    """A block of linear constraints ``expression <= 0`` or ``expression == 0``"""
+
+    def __init__(self, expression, sense):
+
+        self.expression = expression
+        self.sense = sense
+
+    @property
+    def size(self):
+        return self.expression.size
+
+
+class LinearProgram:
+
+    """Collects the variables of a linear program and assembles it as sparse
+    matrices for ``scipy.optimize.linprog``
+
+    Attributes
+    -----------
+    n_vars: int
+        The number of scalar variables of the program
+
+    variables: list
+        The variable blocks in the order of the columns of the program
+
+    auxiliary_constraints: list
+        The constraints that define auxiliary variables, such as cumulative sums
+
+    solution: numpy.ndarray
+        The primal solution vector, once solved
+
+    stats: dict
+        The seconds taken to assemble and to solve the program and its numbers
+        of variables, constraints and nonzero coefficients, once solved
+    """
+
+    def __init__(self):
+
+        self.n_vars = 0
+        self.variables = []
+        self.auxiliary_constraints = []
+        self.solution = None
+        self.stats = {}
+
+    def variable(self, shape, nonneg=False, name=None, **labels):
+
+        """
+        Creates a new block of variables
+        """
+
+        variable = Variable(
+            self, shape, self.n_vars, nonneg=nonneg, name=name, **labels
+        )
+        self.n_vars += variable.size
+        self.variables.append(variable)
+
+        return variable
+
+    def constant(self, value):
+
+        """
+        Wraps a constant as an expression of the program
+        """
+
+        value = _constant(value)
+        return AffineExpression(
+            self,
+            value.shape,
+            sp.csr_matrix((value.size, self.n_vars)),
+            np.ravel(value, order="F"),
+        )
+
+    def bounds(self):
+
+        """
+        Gives the lower and upper bounds of all the variables
+        """
+
+        lower = np.full(self.n_vars, -np.inf)
+        for variable in self.variables:
+            if variable.nonneg:
+                lower[variable.start : variable.start + variable.size] = 0
+
+        return np.column_stack([lower, np.full(self.n_vars, np.inf)])
+
+    def constraint_blocks(self, constraints, names=None):
+
+        """
+        Yields the name, the sense, the sparse coefficients and the right hand
+        side of each block of constraints, including the auxiliary ones
+        """
+
+        names = {} if names is None else names
+        constraints = list(constraints)
+        blocks = [
+            (names.get(indx, f"c{indx}"), constraint)
+            for indx, constraint in enumerate(constraints)
+        ] + [
+            (f"auxiliary_{indx}", constraint)
+            for indx, constraint in enumerate(self.auxiliary_constraints)
+        ]
+
+        for name, constraint in blocks:
+
+            if not isinstance(constraint, Constraint):
+                # comparisons among constants are evaluated by NumPy
+                if not np.all(constraint):
+                    raise ValueError("The model has an infeasible constant constraint")
+                continue
+
+            yield (
+                name,
+                constraint.sense,
+                constraint.expression._matrix(self.n_vars),
+                -constraint.expression.constant,
+            )
+
+    def objective(self, objective):
+
+        """
+        Gives the cost vector and the constant offset of an objective
+        """
+
+        if not isinstance(objective, AffineExpression):
+            objective = self.constant(objective)
+
+        return (
+            np.ravel(objective._matrix(self.n_vars).sum(axis=0)),
+            objective.constant.sum(),
+        )
+
+    def assemble(self, objective, constraints):
+
+        """
+        Assembles the program as the cost vector, the inequality and equality
+        constraint matrices and right hand sides, the variable bounds and the
+        constant offset of the objective
+        """
+
+        blocks = {"<=": ([], []), "==": ([], [])}
+
+        for _, sense, matrix, rhs in self.constraint_blocks(constraints):
+            blocks[sense][0].append(matrix)
+            blocks[sense][1].append(rhs)
+
+        def stack(matrices, constants):
+            if not matrices:
+                return None, None
+            return sp.vstack(matrices, format="csr"), np.concatenate(constants)
+
+        A_ub, b_ub = stack(*blocks["<="])
+        A_eq, b_eq = stack(*blocks["=="])
+        c, offset = self.objective(objective)
+
+        return {
+            "c": c,
+            "A_ub": A_ub,
+            "b_ub": b_ub,
+            "A_eq": A_eq,
+            "b_eq": b_eq,
+            "bounds": self.bounds(),
+            "offset": offset,
+        }
+
+    def solve(self, objective, constraints, method="highs", verbose=False, **options):
+
+        """
+        Solves the program with the HiGHS solvers bundled in scipy and
+        returns the status of the solution
+        """
+
+        start = time.perf_counter()
+        problem = self.assemble(objective, constraints)
+        offset = problem.pop("offset")
+        assembled = time.perf_counter()
+
+        result = linprog(
+            method=method, options=dict(disp=verbose, **options), **problem
+        )
+
+        matrices = [
+            problem[name] for name in ["A_ub", "A_eq"] if problem[name] is not None
+        ]
+        self.stats = {
+            "assembly": assembled - start,
+            "solver": time.perf_counter() - assembled,
+            "variables": self.n_vars,
+            "constraints": int(np.sum([matrix.shape[0] for matrix in matrices])),
+            "nonzeros": int(np.sum([matrix.nnz for matrix in matrices])),
+        }
+
+        if result.status == 0:
+            self.solution = result.x
+            self.objective_value = result.fun + offset
+            return "optimal"
+
+        self.solution = None
+        return {2: "infeasible", 3: "unbounded"}.get(result.status, "failed")
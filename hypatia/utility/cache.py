@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+
+"""
+This module contains the functions of the on-disk cache of the parsed input
+files. The entries are named by a hash of the bytes of the input files, so
+they are found again for unchanged files wherever they are located and a
+changed file leads to a new entry.
+"""
+
+import hashlib
+import os
+import pickle
+
+# changed when the layout of the cached objects changes, to skip old entries
+CACHE_VERSION = 2
+
+# size of the chunks in which the input files are hashed
+CHUNK_SIZE = 1 << 20
+
+
+def files_key(base, files, *keys):
+
+    """
+    Hashes the names relative to base and the bytes of the given files
+    together with the given keys
+    """
+
+    digest = hashlib.sha256(repr((CACHE_VERSION,) + keys).encode())
+
+    for file in files:
+        digest.update(os.path.relpath(file, base).replace(os.sep, "/").encode())
+        with open(file, "rb") as stream:
+            for chunk in iter(lambda: stream.read(CHUNK_SIZE), b""):
+                digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def load_entry(cache, key):
+
+    """
+    Gives the object cached with the given key, or None if there is no entry
+    """
+
+    try:
+        with open(os.path.join(cache, f"{key}.pkl"), "rb") as stream:
+            return pickle.load(stream)
+    except (OSError, EOFError, pickle.UnpicklingError):
+        return None
+
+
+def save_entry(cache, key, value):
+
+    """
+    Caches an object with the given key. The entry is written to a temporary
+    file first, so other processes never read a partial entry
+    """
+
+    os.makedirs(cache, exist_ok=True)
+    file = os.path.join(cache, f"{key}.pkl")
+    temporary = f"{file}.{os.getpid()}.tmp"
+
+    with open(temporary, "wb") as stream:
+        pickle.dump(value, stream, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temporary, file)
@@ -422,7 +422,8 @@ global_set_ids = {
     "Carriers_glob": ["Carrier", "Carr_name", "Carr_type", "Carr_unit"],
     "Technologies_glob": ["Technology", "Tech_name", "Tech_category",
     "Tech_cap_unit", "Tech_act_unit"],
-    "Emissions": ["Emission", "Emission_name", "Emission_unit"]
+    "Emissions": ["Emission", "Emission_name", "Emission_unit"],
+    "Lines": ["Region_from", "Region_to", "Carrier"]
 }
 
 
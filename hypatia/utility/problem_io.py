@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+
+"""
+This module contains the functions for writing the sparse linear program of
+a model to MPS and LP files, to be solved by an external solver, and for
+reading back the primal solution of the external solver.
+"""
+
+import re
+
+import numpy as np
+import scipy.sparse as sp
+
+# characters accepted in names by both the LP and the free MPS formats
+INVALID_NAME_CHARACTERS = re.compile(r"[^A-Za-z0-9_.,(){}!#$%&/;?@'|~-]")
+
+# number of terms written on each line of an LP file
+LP_TERMS_PER_LINE = 4
+
+
+def clean_name(name):
+
+    """
+    Replaces the characters that are not accepted in the names of the
+    problem files
+    """
+
+    return INVALID_NAME_CHARACTERS.sub("_", str(name))
+
+
+def variable_names(program):
+
+    """
+    Gives the names of all the variables of a linear program in the order
+    of its columns
+    """
+
+    names = []
+    for variable in program.variables:
+        names.extend(clean_name(name) for name in variable.entry_names())
+
+    return names
+
+
+def _row_names(name, matrix):
+
+    return [f"{clean_name(name)}_{row}" for row in range(matrix.shape[0])]
+
+
+def _number(value):
+
+    return repr(float(value))
+
+
+def _lp_terms(coefficients, indices, names):
+
+    terms = [
+        f"{'-' if value < 0 else '+'} {_number(abs(value))} {names[indx]}"
+        for value, indx in zip(coefficients, indices)
+    ]
+    if not terms:
+        # empty rows still need a term in the LP format
+        terms = [f"+ 0 {names[0]}"]
+
+    return "\n   ".join(
+        " ".join(terms[start : start + LP_TERMS_PER_LINE])
+        for start in range(0, len(terms), LP_TERMS_PER_LINE)
+    )
+
+
+def write_lp(path, program, objective, constraints, constraint_names=None):
+
+    """
+    Writes the program in the CPLEX LP format, the constraint blocks are
+    written one after the other as they are assembled
+    """
+
+    names = variable_names(program)
+    c, offset = program.objective(objective)
+
+    with open(path, "w") as file:
+
+        file.write("\\ Problem written by hypatia\n")
+        file.write("Minimize\n")
+        indices = np.flatnonzero(c)
+        file.write(f" obj: {_lp_terms(c[indices], indices, names)}")
+        if offset:
+            file.write(f" {'-' if offset < 0 else '+'} {_number(abs(offset))}")
+        file.write("\nSubject To\n")
+
+        for name, sense, matrix, rhs in program.constraint_blocks(
+            constraints, constraint_names
+        ):
+            operator = "<=" if sense == "<=" else "="
+            rows = zip(
+                _row_names(name, matrix), matrix.indptr[:-1], matrix.indptr[1:], rhs
+            )
+            file.writelines(
+                f" {row_name}: "
+                f"{_lp_terms(matrix.data[start:end], matrix.indices[start:end], names)}"
+                f" {operator} {_number(value)}\n"
+                for row_name, start, end, value in rows
+            )
+
+        file.write("Bounds\n")
+        file.writelines(
+            f" {names[indx]} free\n"
+            for indx in np.flatnonzero(np.isinf(program.bounds()[:, 0]))
+        )
+        file.write("End\n")
+
+
+def write_mps(path, program, objective, constraints, constraint_names=None):
+
+    """
+    Writes the program in the free MPS format. The rows are written block by
+    block as they are assembled, the columns section needs the coefficients
+    ordered by variable, so the sparse blocks are kept until the end
+    """
+
+    names = variable_names(program)
+    c, offset = program.objective(objective)
+
+    matrices = []
+    row_names = []
+    right_hand_sides = []
+
+    with open(path, "w") as file:
+
+        file.write("NAME hypatia\n")
+        file.write("ROWS\n")
+        file.write(" N obj\n")
+
+        for name, sense, matrix, rhs in program.constraint_blocks(
+            constraints, constraint_names
+        ):
+            block_rows = _row_names(name, matrix)
+            row_type = "L" if sense == "<=" else "E"
+            file.writelines(f" {row_type} {row_name}\n" for row_name in block_rows)
+
+            matrices.append(matrix)
+            row_names.extend(block_rows)
+            right_hand_sides.append(rhs)
+
+        file.write("COLUMNS\n")
+        if matrices:
+            columns = sp.vstack(matrices, format="csc")
+        for indx, name in enumerate(names):
+            if c[indx]:
+                file.write(f" {name} obj {_number(c[indx])}\n")
+            if matrices:
+                start, end = columns.indptr[indx], columns.indptr[indx + 1]
+                file.writelines(
+                    f" {name} {row_names[row]} {_number(value)}\n"
+                    for row, value in zip(
+                        columns.indices[start:end], columns.data[start:end]
+                    )
+                )
+
+        file.write("RHS\n")
+        if offset:
+            # the constant of the objective is the negative of its right hand side
+            file.write(f" RHS obj {_number(-offset)}\n")
+        if right_hand_sides:
+            rhs = np.concatenate(right_hand_sides)
+            file.writelines(
+                f" RHS {row_names[row]} {_number(rhs[row])}\n"
+                for row in np.flatnonzero(rhs)
+            )
+
+        file.write("BOUNDS\n")
+        file.writelines(
+            f" FR BND {names[indx]}\n"
+            for indx in np.flatnonzero(np.isinf(program.bounds()[:, 0]))
+        )
+        file.write("ENDATA\n")
+
+
+def read_solution(path, program):
+
+    """
+    Reads the primal values of the variables from the solution file of an
+    external solver. The first line with a variable name followed by its
+    value is read for each variable, which covers the solution files of the
+    common solvers as they write the primal values before the dual values;
+    the variables missing in the file are taken as zero
+    """
+
+    columns = {name: indx for indx, name in enumerate(variable_names(program))}
+    solution = np.zeros(program.n_vars)
+    found = set()
+
+    with open(path) as file:
+        for line in file:
+            tokens = line.split()
+            for indx, token in enumerate(tokens[:-1]):
+                if token in columns and token not in found:
+                    try:
+                        solution[columns[token]] = float(tokens[indx + 1])
+                    except ValueError:
+                        continue
+                    found.add(token)
+                    break
+
+    if not found:
+        raise ValueError(f"No values of the model variables were found in {path}")
+
+    return solution
@@ -0,0 +1,123 @@
+import numpy as np
+import unittest
+from hypatia.utility import algebra
+
+'''
+Unit tests for the sparse affine expressions in algebra.py
+'''
+
+class TestAffineExpression(unittest.TestCase):
+    def setUp(self):
+        self.program = algebra.LinearProgram()
+        self.x = self.program.variable((4, 3))
+        self.values = np.arange(12, dtype=float).reshape((4, 3)) - 5
+        self.program.solution = np.ravel(self.values, order="F")
+
+    def test_variable_value(self):
+        self.assertTrue(np.array_equal(self.x.value, self.values))
+
+    def test_multiply_broadcast(self):
+        row = np.array([1.0, -2.0, 0.5])
+        column = np.array([[2.0], [3.0], [0.0], [1.0]])
+
+        self.assertTrue(
+            np.allclose(algebra.multiply(self.x, row).value, self.values * row)
+        )
+        self.assertTrue(
+            np.allclose(algebra.multiply(column, self.x).value, column * self.values)
+        )
+
+    def test_sum(self):
+        self.assertAlmostEqual(algebra.sum(self.x).value, self.values.sum())
+        for axis in [0, 1]:
+            self.assertTrue(
+                np.allclose(
+                    algebra.sum(self.x, axis=axis).value, self.values.sum(axis=axis)
+                )
+            )
+
+    def test_matmul(self):
+        right = np.arange(6, dtype=float).reshape((3, 2))
+        left = np.arange(8, dtype=float).reshape((2, 4))
+
+        self.assertTrue(np.allclose((self.x @ right).value, self.values @ right))
+        self.assertTrue(np.allclose((left @ self.x).value, left @ self.values))
+
+    def test_reshape_column_major(self):
+        self.assertTrue(
+            np.array_equal(
+                algebra.reshape(self.x, (2, 6)).value,
+                np.reshape(self.values, (2, 6), order="F"),
+            )
+        )
+        self.assertTrue(
+            np.array_equal(
+                algebra.vec(self.x).value, np.ravel(self.values, order="F")
+            )
+        )
+
+    def test_add_zero_keeps_shape(self):
+        total = np.zeros((4, 1))
+        total += algebra.sum(self.x, axis=1)
+
+        self.assertEqual(total.shape, (4,))
+
+    def test_values(self):
+        row = np.array([1.0, -2.0, 0.5])
+        exprs = [
+            algebra.multiply(self.x, row) + 1,
+            self.x,
+            algebra.sum(self.x),
+            algebra.sum(self.x, axis=0),
+            self.values,
+        ]
+        values = algebra.values(exprs)
+
+        self.assertEqual(len(values), len(exprs))
+        for value, expr in zip(values[:4], exprs):
+            self.assertTrue(np.array_equal(value, expr.value))
+        self.assertIsInstance(values[2], float)
+        self.assertIs(values[4], self.values)
+
+    def test_numpy_dispatch(self):
+        self.assertTrue(
+            np.array_equal(
+                algebra.reshape(self.values, (2, 6)),
+                np.reshape(self.values, (2, 6), order="F"),
+            )
+        )
+
+
+class TestLinearProgram(unittest.TestCase):
+    def test_solve(self):
+        program = algebra.LinearProgram()
+        x = program.variable((3,), nonneg=True)
+        cost = np.array([1.0, 2.0, 3.0])
+
+        status = program.solve(
+            algebra.sum(algebra.multiply(cost, x)), [algebra.sum(x) >= 6, x <= 4]
+        )
+
+        self.assertEqual(status, "optimal")
+        self.assertTrue(np.allclose(x.value, [4, 2, 0]))
+        self.assertAlmostEqual(program.objective_value, 8)
+
+    def test_cumsum(self):
+        program = algebra.LinearProgram()
+        x = program.variable((5, 2))
+        values = np.arange(10, dtype=float).reshape((5, 2))
+        cumulative = algebra.cumsum(x)
+
+        program.solve(0 * algebra.sum(x), [x == values])
+
+        self.assertTrue(np.allclose(cumulative.value, np.cumsum(values, axis=0)))
+
+    def test_infeasible(self):
+        program = algebra.LinearProgram()
+        x = program.variable((2,), nonneg=True)
+
+        self.assertEqual(program.solve(algebra.sum(x), [x <= -1]), "infeasible")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import os
+import shutil
+import tempfile
+import unittest
+from hypatia.utility.cache import files_key, load_entry, save_entry
+
+'''
+Unit tests for the functions in cache.py
+'''
+
+class TestCache(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder)
+        self.file = os.path.join(self.folder, "global.xlsx")
+        with open(self.file, "wb") as stream:
+            stream.write(b"content")
+
+    def test_key_follows_content(self):
+        key = files_key(self.folder, [self.file], "sets", "Planning")
+
+        self.assertEqual(key, files_key(self.folder, [self.file], "sets", "Planning"))
+        self.assertNotEqual(
+            key, files_key(self.folder, [self.file], "sets", "Operation")
+        )
+
+        with open(self.file, "ab") as stream:
+            stream.write(b"changed")
+        self.assertNotEqual(key, files_key(self.folder, [self.file], "sets", "Planning"))
+
+    def test_key_independent_of_location(self):
+        other = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, other)
+        shutil.copy(self.file, other)
+
+        self.assertEqual(
+            files_key(self.folder, [self.file]),
+            files_key(other, [os.path.join(other, "global.xlsx")]),
+        )
+
+    def test_save_and_load(self):
+        cache = os.path.join(self.folder, "cache")
+
+        self.assertIsNone(load_entry(cache, "key"))
+        save_entry(cache, "key", {"data": [1, 2]})
+        self.assertEqual(load_entry(cache, "key"), {"data": [1, 2]})
+
+
+if __name__ == "__main__":
+    unittest.main()
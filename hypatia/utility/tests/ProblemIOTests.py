@@ -0,0 +1,87 @@
+import numpy as np
+import os
+import shutil
+import tempfile
+import unittest
+from hypatia.utility import algebra
+from hypatia.utility.problem_io import (
+    clean_name,
+    write_lp,
+    write_mps,
+    read_solution,
+)
+
+'''
+Unit tests for the functions in problem_io.py
+'''
+
+class TestProblemFiles(unittest.TestCase):
+    def setUp(self):
+        self.program = algebra.LinearProgram()
+        self.x = self.program.variable(
+            (2, 2),
+            nonneg=True,
+            name="newcapacity",
+            keys=("reg1", "Supply"),
+            index=["Y0", "Y1"],
+            columns=["Tech 1", "Tech2"],
+        )
+        self.objective = algebra.sum(algebra.multiply([[1, 2], [3, 4]], self.x))
+        self.constraints = [algebra.sum(self.x, axis=1) >= [1, 2], self.x <= 5]
+        self.names = {0: "demand_0", 1: "capacity_0"}
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def test_variable_names(self):
+        self.assertEqual(
+            [clean_name(name) for name in self.x.entry_names()],
+            [
+                "newcapacity(reg1,Supply,Tech_1,Y0)",
+                "newcapacity(reg1,Supply,Tech_1,Y1)",
+                "newcapacity(reg1,Supply,Tech2,Y0)",
+                "newcapacity(reg1,Supply,Tech2,Y1)",
+            ],
+        )
+
+    def test_write_mps(self):
+        path = os.path.join(self.directory, "problem.mps")
+        write_mps(path, self.program, self.objective, self.constraints, self.names)
+
+        with open(path) as file:
+            lines = file.read().splitlines()
+
+        self.assertEqual(lines[0], "NAME hypatia")
+        self.assertIn(" L demand_0_1", lines)
+        self.assertIn(" newcapacity(reg1,Supply,Tech2,Y1) obj 4.0", lines)
+        self.assertIn(" newcapacity(reg1,Supply,Tech2,Y1) demand_0_1 -1.0", lines)
+        self.assertIn(" RHS demand_0_1 -2.0", lines)
+        self.assertEqual(lines[-1], "ENDATA")
+
+    def test_write_lp(self):
+        path = os.path.join(self.directory, "problem.lp")
+        write_lp(path, self.program, self.objective, self.constraints, self.names)
+
+        with open(path) as file:
+            lines = file.read().splitlines()
+
+        self.assertIn(
+            " capacity_0_3: + 1.0 newcapacity(reg1,Supply,Tech2,Y1) <= 5.0", lines
+        )
+        self.assertEqual(lines[-1], "End")
+
+    def test_read_solution(self):
+        path = os.path.join(self.directory, "problem.sol")
+        with open(path, "w") as file:
+            file.write("# Primal solution values\n")
+            file.write("newcapacity(reg1,Supply,Tech_1,Y0) 1\n")
+            file.write("newcapacity(reg1,Supply,Tech_1,Y1) 2\n")
+            file.write("# Dual solution values\n")
+            file.write("newcapacity(reg1,Supply,Tech_1,Y0) 0.5\n")
+
+        solution = read_solution(path, self.program)
+
+        self.assertTrue(np.array_equal(solution, [1, 2, 0, 0]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,153 @@
+import numpy as np
+import unittest
+from hypatia.utility.utility import (
+    lifetime_operators,
+    annuity_coefficients,
+    salvage_factor,
+    year_aggregation_operator,
+)
+
+'''
+Unit tests for the functions in utility.py
+'''
+
+class TestLifetimeOperators(unittest.TestCase):
+    n_years = 6
+    lifetimes = (1.0, 3.0, 10.0)
+
+    def test_accumulation(self):
+        expected = np.zeros((18, 18))
+        for entity, lifetime in enumerate(self.lifetimes):
+            for year in range(self.n_years):
+                for vintage in range(self.n_years):
+                    if 0 <= year - vintage < lifetime:
+                        expected[
+                            entity * self.n_years + year,
+                            entity * self.n_years + vintage,
+                        ] = 1
+
+        accumulation, _ = lifetime_operators(self.n_years, self.lifetimes)
+
+        self.assertTrue(np.array_equal(accumulation.toarray(), expected))
+
+    def test_decommission(self):
+        expected = np.zeros((18, 18))
+        for entity, lifetime in enumerate(self.lifetimes):
+            for vintage in range(self.n_years):
+                year = int(vintage + lifetime)
+                if year < self.n_years:
+                    expected[
+                        entity * self.n_years + year,
+                        entity * self.n_years + vintage,
+                    ] = 1
+
+        _, decommission = lifetime_operators(self.n_years, self.lifetimes)
+
+        self.assertTrue(np.array_equal(decommission.toarray(), expected))
+
+    def test_cached(self):
+        # identical technology groups share the same operators
+        self.assertIs(
+            lifetime_operators(self.n_years, self.lifetimes),
+            lifetime_operators(self.n_years, tuple(self.lifetimes)),
+        )
+
+
+class TestAnnuityCoefficients(unittest.TestCase):
+    interest_rate = np.array([[0.05, 0.1, 0.07]])
+    economiclife = np.array([[1, 5, 30]])
+
+    def expected(self, discount_rate):
+        depreciation = (
+            (1 + self.interest_rate) ** self.economiclife * self.interest_rate
+        ) / ((1 + self.interest_rate) ** self.economiclife - 1)
+
+        expected = np.zeros((len(discount_rate), self.economiclife.shape[1]))
+        for y_indx, rate in enumerate(discount_rate):
+            for tech_indx, life in enumerate(self.economiclife[0]):
+                for future_year in range(y_indx + 1, y_indx + life + 1):
+                    expected[y_indx, tech_indx] += depreciation[0, tech_indx] * (
+                        1 + rate
+                    ) ** (-future_year)
+
+        return expected
+
+    def test_annuity_coefficients(self):
+        discount_rate = np.array([0.05, 0.05, 0.04, 0.06])
+
+        self.assertTrue(
+            np.allclose(
+                annuity_coefficients(
+                    self.interest_rate, self.economiclife, discount_rate
+                ),
+                self.expected(discount_rate),
+            )
+        )
+
+    def test_annuity_coefficients_zero_discount_rate(self):
+        discount_rate = np.array([0.0, 0.05])
+
+        self.assertTrue(
+            np.allclose(
+                annuity_coefficients(
+                    self.interest_rate, self.economiclife, discount_rate
+                ),
+                self.expected(discount_rate),
+            )
+        )
+
+
+class TestSalvageFactor(unittest.TestCase):
+    main_years = ["Y0", "Y1", "Y2", "Y3"]
+    tlft = np.array([[2, 3, 10]])
+    interest_rate = np.array([[0.05, 0.1, 0.07]])
+    economiclife = np.array([[2, 5, 30]])
+    discount_rate = np.array([[0.05], [0.05], [0.04], [0.06]])
+
+    def test_salvage_factor(self):
+        EOH = len(self.main_years) - 1
+        expected = np.zeros((len(self.main_years), self.tlft.shape[1]))
+        for tech in range(self.tlft.shape[1]):
+            rate, life = self.interest_rate[0, tech], self.economiclife[0, tech]
+            lifetime = self.tlft[0, tech]
+            technical = (1 - 1 / (1 + rate)) / (1 - 1 / (1 + rate) ** life)
+            for year, discount in enumerate(self.discount_rate[:, 0]):
+                social = (1 - 1 / (1 + discount) ** life) / (1 - 1 / (1 + discount))
+                if year + lifetime > EOH:
+                    expected[year, tech] = (
+                        technical
+                        * social
+                        * ((1 + discount) ** (lifetime - EOH - 1 + year) - 1)
+                        / ((1 + discount) ** lifetime - 1)
+                    )
+
+        self.assertTrue(
+            np.allclose(
+                salvage_factor(
+                    self.main_years,
+                    ["a", "b", "c"],
+                    self.tlft,
+                    self.interest_rate,
+                    self.discount_rate,
+                    self.economiclife,
+                ),
+                expected,
+            )
+        )
+
+
+class TestYearAggregationOperator(unittest.TestCase):
+
+    def test_year_aggregation_operator(self):
+        activity = np.arange(24, dtype=float).reshape(12, 2)
+
+        self.assertTrue(
+            np.array_equal(
+                year_aggregation_operator(3, 4) @ activity,
+                activity.reshape(3, 4, 2).sum(axis=1),
+            )
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,9 +4,12 @@
 This module contains the utility functions from cerating the optimization problem
 """
 
+from functools import lru_cache
 import cvxpy as cp
 import numpy as np
-import pandas as pd
+import scipy.sparse as sp
+
+from hypatia.utility import algebra
 
 
 def stack(a, b, axis=0):
@@ -21,32 +24,79 @@ def stack(a, b, axis=0):
         return cp.hstack([a, b])
 
 
-def newcap_accumulated(newcap, techs, main_years, tlft):
+@lru_cache(maxsize=None)
+def lifetime_operators(n_years, lifetimes):
 
     """
-    Calculates the accumulated new capacity of each technology in each 
-    year of the model horizon based on the useful technical lifetime
+    Builds the sparse block-diagonal operators that map the new capacities
+    installed in each vintage year to the accumulated and the decommissioned
+    capacities of each year, with one banded block per technology (or carrier)
+    of the given technical lifetimes. The operators are cached per number of
+    years and lifetimes, so groups with identical lifetimes share them
     """
 
-    index = pd.MultiIndex.from_product([techs, main_years])
-    exist = pd.DataFrame(0, index=index, columns=index)
+    lifetimes = np.asarray(lifetimes, dtype=float)
+    size = len(lifetimes) * n_years
+    offsets = np.arange(len(lifetimes)) * n_years
 
-    newcap_reshape = cp.reshape(newcap, (len(main_years) * len(techs), 1))
+    year, vintage = np.tril_indices(n_years)
+    entity, pair = np.nonzero(
+        (year - vintage)[np.newaxis, :] < lifetimes[:, np.newaxis]
+    )
+    accumulation = sp.csr_matrix(
+        (
+            np.ones(len(pair)),
+            (offsets[entity] + year[pair], offsets[entity] + vintage[pair]),
+        ),
+        shape=(size, size),
+    )
 
-    for tech in techs:
-        for year in main_years:
-            for year0 in main_years:
+    decom_year = (
+        np.arange(n_years)[np.newaxis, :] + lifetimes[:, np.newaxis]
+    ).astype(int)
+    entity, vintage = np.nonzero(decom_year < n_years)
+    decommission = sp.csr_matrix(
+        (
+            np.ones(len(vintage)),
+            (offsets[entity] + decom_year[entity, vintage], offsets[entity] + vintage),
+        ),
+        shape=(size, size),
+    )
+
+    return accumulation, decommission
 
-                age = main_years.index(year) - main_years.index(year0)
 
-                if age >= 0 and age < tlft[tech].values:
+def _lifetimes(tlft, entities):
+
+    """
+    Takes the lifetimes of the given technologies or carriers, as an array in
+    the order of the entities, as a hashable tuple
+    """
 
-                    exist.loc[(tech, year), (tech, year0)] = 1
+    return tuple(np.reshape(tlft, -1)[: len(entities)].astype(float))
+
+
+def _apply_lifetime_operator(operator, newcap):
+
+    """
+    Applies a lifetime operator to the stacked vintages of the new capacities
+    """
+
+    newcap_reshape = algebra.reshape(newcap, (newcap.shape[0] * newcap.shape[1], 1))
+
+    return algebra.reshape(operator @ newcap_reshape, newcap.shape)
+
+
+def newcap_accumulated(newcap, techs, main_years, tlft):
+
+    """
+    Calculates the accumulated new capacity of each technology in each 
+    year of the model horizon based on the useful technical lifetime
+    """
 
-    accumulated_newcap_reshape = exist.values @ newcap_reshape
-    accumulated_newcap = cp.reshape(accumulated_newcap_reshape, newcap.shape)
+    accumulation, _ = lifetime_operators(len(main_years), _lifetimes(tlft, techs))
 
-    return accumulated_newcap
+    return _apply_lifetime_operator(accumulation, newcap)
 
 
 def _calc_variable_overall(
@@ -70,7 +120,8 @@ def _calc_variable_overall(
 
                 if tech in value:
 
-                    variable_overall[tech] += variable[reg][key][:, value.index(tech)]
+                    column = variable[reg][key][:, value.index(tech)]
+                    variable_overall[tech] = variable_overall[tech] + column
 
     return variable_overall
 
@@ -97,7 +148,8 @@ def _calc_production_overall(
 
                 if tech in value:
 
-                    production_overall[tech] += variable[reg][key][:, value.index(tech)]
+                    column = variable[reg][key][:, value.index(tech)]
+                    production_overall[tech] = production_overall[tech] + column
 
     return production_overall
 
@@ -109,28 +161,11 @@ def line_newcap_accumulated(line_newcap, carriers, main_years, line_tlft):
     year the model horizon based on the useful technical lifetime
     """
 
-    index_line = pd.MultiIndex.from_product([carriers, main_years])
-    exist_line = pd.DataFrame(0, index=index_line, columns=index_line)
-
-    line_newcap_reshape = cp.reshape(line_newcap, (len(main_years) * len(carriers), 1))
-
-    for carrier in carriers:
-        for year in main_years:
-            for year0 in main_years:
-
-                age = main_years.index(year) - main_years.index(year0)
-
-                if age >= 0 and age < line_tlft[carrier].values:
-
-                    exist_line.loc[(carrier, year), (carrier, year0)] = 1
-
-    line_newacp_accumulated_reshape = exist_line.values @ line_newcap_reshape
-
-    line_newcap_accumulated = cp.reshape(
-        line_newacp_accumulated_reshape, line_newcap.shape
+    accumulation, _ = lifetime_operators(
+        len(main_years), _lifetimes(line_tlft, carriers)
     )
 
-    return line_newcap_accumulated
+    return _apply_lifetime_operator(accumulation, line_newcap)
 
 
 def decomcap(newcap, techs, main_years, tlft):
@@ -140,25 +175,10 @@ def decomcap(newcap, techs, main_years, tlft):
     year of the time horizon based on life time of the new capacities 
     installed in the vintage years
     """
-    index = pd.MultiIndex.from_product([techs, main_years])
-    decom_matrix = pd.DataFrame(0, index=index, columns=index)
-    newcap_reshape = cp.reshape(newcap, (len(main_years) * len(techs), 1))
-
-    for tech in techs:
-        for indx, year in enumerate(main_years):
-
-            try:
-
-                decom_matrix.loc[
-                    (tech, main_years[int(indx + tlft[tech].values)]), (tech, year)
-                ] = 1
 
-            except:
-                pass
+    _, decommission = lifetime_operators(len(main_years), _lifetimes(tlft, techs))
 
-    decomcap_reshape = decom_matrix.values @ newcap_reshape
-    decomcap = cp.reshape(decomcap_reshape, newcap.shape)
-    return decomcap
+    return _apply_lifetime_operator(decommission, newcap)
 
 
 def line_decomcap(line_newcap, carriers, main_years, line_tlft):
@@ -169,45 +189,39 @@ def line_decomcap(line_newcap, carriers, main_years, line_tlft):
     installed in the vintage years
     """
 
-    index_line = pd.MultiIndex.from_product([carriers, main_years])
-    decom_matrix_line = pd.DataFrame(0, index=index_line, columns=index_line)
-    line_newcap_reshape = cp.reshape(line_newcap, (len(main_years) * len(carriers), 1))
-
-    for carrier in carriers:
-        for year in main_years:
-
-            try:
-                decom_matrix_line.loc[
-                    (carrier, main_years[main_years.index(year) + line_tlft[carrier]]),
-                    (carrier, year),
-                ] = 1
+    _, decommission = lifetime_operators(
+        len(main_years), _lifetimes(line_tlft, carriers)
+    )
 
-            except:
-                pass
-    line_decomcap_reshape = decom_matrix_line.values @ line_newcap_reshape
-    line_decomcap = cp.reshape(line_decomcap_reshape, line_newcap.shape)
-    return line_decomcap
+    return _apply_lifetime_operator(decommission, line_newcap)
 
 
 # annual undiscounted investmnests and their related taxes and subsidies
 
 
-def invcosts(inv, newcap, inv_tax, inv_sub):
+def invcosts(inv, newcap, specific_inv_tax, specific_inv_sub):
 
     """
     Calculates the annual undiscounted investment cost of each technology and
     their taxes and subsidies before considering the annuities
     """
 
-    cost_inv = cp.multiply(inv.values, newcap)
-    specific_inv_tax = cp.multiply(inv_tax.values, inv.values)
-    specific_inv_sub = cp.multiply(inv_sub.values, inv.values)
-    cost_inv_tax = cp.multiply(specific_inv_tax, newcap)
-    cost_inv_sub = cp.multiply(specific_inv_sub, newcap)
+    cost_inv = algebra.multiply(inv, newcap)
+    cost_inv_tax = algebra.multiply(specific_inv_tax, newcap)
+    cost_inv_sub = algebra.multiply(specific_inv_sub, newcap)
 
     return cost_inv, cost_inv_tax, cost_inv_sub
 
 
+def specific_taxsub(specific_cost, rate):
+
+    """
+    Calculates the specific tax or subsidy of a cost from its rate
+    """
+
+    return np.multiply(rate, specific_cost)
+
+
 def invcosts_annuity(
     cost_inv_present,
     interest_rate,
@@ -222,58 +236,57 @@ def invcosts_annuity(
     and economic lifetime of each technology
     """
 
-    depreciation = np.divide(
-        np.multiply(
-            np.power((interest_rate.values + 1), economiclife.values),
-            interest_rate.values,
-        ),
-        (np.power((interest_rate.values + 1), economiclife.values) - 1),
-    )
-    depreciation = pd.DataFrame(
-        depreciation, index=["Depreciation_rate"], columns=technologies
-    )
+    coefficients = annuity_coefficients(interest_rate, economiclife, discount_rate)
 
-    inv_fvalue_total = 0
-    for tech_indx, tech in enumerate(technologies):
-        inv_fvalue_discounted = 0
-        for y_indx, year in enumerate(main_years):
+    return algebra.sum(algebra.multiply(coefficients, cost_inv_present))
 
-            inv_fvalue_annual_discounted = 0
-            for future_year in range(
-                y_indx + 1, y_indx + economiclife.loc["Economic Life time", tech] + 1
-            ):
 
-                annuity = (
-                    cost_inv_present[y_indx, tech_indx]
-                    * depreciation.loc["Depreciation_rate", tech]
-                )
+def annuity_coefficients(interest_rate, economiclife, discount_rate):
 
-                inv_fvalue_annual_discounted += annuity * (
-                    1 + discount_rate.loc[year, "Annual Discount Rate"]
-                ) ** (-future_year)
+    """
+    Calculates the (years x technologies) coefficients that turn the present
+    investment cost of each vintage year into the sum of its discounted
+    annuities over the economic lifetime of each technology
+    """
 
-            inv_fvalue_discounted += inv_fvalue_annual_discounted
+    interest_rate = np.reshape(interest_rate, (1, -1))
+    economiclife = np.reshape(economiclife, (1, -1))
+    discount_rate = np.reshape(discount_rate, (-1, 1))
 
-        inv_fvalue_total += inv_fvalue_discounted
+    depreciation = np.divide(
+        np.multiply(np.power((interest_rate + 1), economiclife), interest_rate),
+        (np.power((interest_rate + 1), economiclife) - 1),
+    )
+
+    # closed form of sum((1 + discount_rate) ** -future_year) over the
+    # future years y+1, ..., y+economiclife of each vintage year y
+    discount = 1 / (1 + discount_rate)
+    first_year = np.arange(1, len(discount_rate) + 1).reshape(-1, 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        discounted_years = np.where(
+            discount_rate == 0,
+            economiclife,
+            np.power(discount, first_year)
+            * (1 - np.power(discount, economiclife))
+            / (1 - discount),
+        )
 
-    return inv_fvalue_total
+    return depreciation * discounted_years
 
 
 # annual undiscounted fixed O&M costs and their related taxes and subsidies
 
 
-def fixcosts(fix, totalcap, fix_tax, fix_sub):
+def fixcosts(fix, totalcap, specific_fix_tax, specific_fix_sub):
 
     """
     Calculates the annual undiscounted fixed operation and maintenance costs
     and their taxes and subsidies
     """
 
-    cost_fix = cp.multiply(fix.values, totalcap)
-    specific_fix_tax = cp.multiply(fix_tax.values, fix.values)
-    specific_fix_sub = cp.multiply(fix_sub.values, fix.values)
-    cost_fix_tax = cp.multiply(specific_fix_tax, totalcap)
-    cost_fix_sub = cp.multiply(specific_fix_sub, totalcap)
+    cost_fix = algebra.multiply(fix, totalcap)
+    cost_fix_tax = algebra.multiply(specific_fix_tax, totalcap)
+    cost_fix_sub = algebra.multiply(specific_fix_sub, totalcap)
 
     return cost_fix, cost_fix_tax, cost_fix_sub
 
@@ -284,27 +297,53 @@ def varcost(specific_varcost, activity, time_step):
     Calculates the annual undiscounted variables costs
     """
 
-    specific_varcost_reshape = pd.concat(
-        [specific_varcost] * len(time_step)
-    ).sort_index()
-    variablecost = cp.multiply(specific_varcost_reshape.values, activity)
+    specific_varcost_reshape = np.repeat(specific_varcost, len(time_step), axis=0)
+    variablecost = algebra.multiply(specific_varcost_reshape, activity)
 
     return variablecost
 
 
-def available_resource_prod(
-    totalcap, capacity_factor, timeslice_fraction, annualprod_per_unitcapacity
+def resource_availability_factor(
+    capacity_factor, timeslice_fraction, annualprod_per_unitcapacity
 ):
 
+    """
+    Calculates the maximum available production per unit of total capacity
+    due to the resource availability
+    """
+
+    return np.multiply(
+        np.multiply(capacity_factor, annualprod_per_unitcapacity), timeslice_fraction
+    )
+
+
+def available_resource_prod(totalcap, availability_factor):
+
     """
     Calculates the maximum available production due to the resource availability
     """
 
-    available_capacity = cp.multiply(totalcap, capacity_factor)
-    annualprod = cp.multiply(available_capacity, annualprod_per_unitcapacity)
-    annual_prod_per_timslice = cp.multiply(annualprod, timeslice_fraction)
+    return algebra.multiply(totalcap, availability_factor)
+
+
+@lru_cache(maxsize=None)
+def year_aggregation_operator(n_years, n_timesteps):
+
+    """
+    Builds the sparse (years x years*timesteps) operator that sums the
+    timesteps of each year. The operator is cached per model size
+    """
 
-    return annual_prod_per_timslice
+    return sp.csr_matrix(
+        (
+            np.ones(n_years * n_timesteps),
+            (
+                np.repeat(np.arange(n_years), n_timesteps),
+                np.arange(n_years * n_timesteps),
+            ),
+        ),
+        shape=(n_years, n_years * n_timesteps),
+    )
 
 
 def annual_activity(activity, main_years, timeslices):
@@ -312,18 +351,8 @@ def annual_activity(activity, main_years, timeslices):
     """
     Calculates the annual production from the prodution defined on timeslices
     """
-    activity_annual = cp.sum(activity[0 : len(timeslices), :], axis=0, keepdims=True)
-
-    for indx, year in enumerate(main_years[1:]):
 
-        activity_annual_rest = cp.sum(
-            activity[(indx + 1) * len(timeslices) : (indx + 2) * len(timeslices), :],
-            axis=0,
-            keepdims=True,
-        )
-        activity_annual = stack(activity_annual, activity_annual_rest)
-
-    return activity_annual
+    return year_aggregation_operator(len(main_years), len(timeslices)) @ activity
 
 
 def line_varcost(
@@ -332,6 +361,7 @@ def line_varcost(
 
     """
     Calculates the annual undiscounted variables costs of inter-regional links
+    from the specific variable cost of each link
     """
 
     variablecost_line = {}
@@ -346,17 +376,13 @@ def line_varcost(
 
             if "{}-{}".format(reg, key) in lines_list:
 
-                specific_varcost_line = specific_varcost.loc[
-                    :, "{}-{}".format(reg, key)
-                ]
+                specific_varcost_line = specific_varcost["{}-{}".format(reg, key)]
 
-            elif "{}-{}".format(reg, key) in lines_list:
+            elif "{}-{}".format(key, reg) in lines_list:
 
-                specific_varcost_line = specific_varcost.loc[
-                    :, "{}-{}".format(key, reg)
-                ]
+                specific_varcost_line = specific_varcost["{}-{}".format(key, reg)]
 
-            variablecost_line_regional[key] = cp.multiply(
+            variablecost_line_regional[key] = algebra.multiply(
                 specific_varcost_line, line_import_anunual
             )
 
@@ -375,64 +401,59 @@ def salvage_factor(
     effect
     """
 
-    salvage_factor_0 = pd.DataFrame(0, index=main_years, columns=technologies)
-
-    rates_factor = pd.DataFrame(0, index=main_years, columns=technologies)
+    tlft = np.reshape(tlft, (1, -1))
+    interest_rate = np.reshape(interest_rate, (1, -1))
+    economiclife = np.reshape(economiclife, (1, -1))
+    discount_rate = np.reshape(discount_rate, (-1, 1))
 
     EOH = len(main_years) - 1
+    year = np.arange(len(main_years)).reshape(-1, 1)
 
-    for tech in technologies:
-
-        technical_factor = (1 - 1 / (1 + interest_rate[tech].values)) / (
-            1 - 1 / ((1 + interest_rate[tech].values) ** economiclife[tech].values)
-        )
-
-        social_factor = (
-            1 - 1 / ((1 + discount_rate.values) ** economiclife[tech].values)
-        ) / (1 - 1 / (1 + discount_rate.values))
-
-        rates_factor.loc[:, tech] = technical_factor * social_factor
-
-        for indx, year in enumerate(main_years):
-
-            if indx + tlft[tech].values > EOH:
-
-                salvage_factor_0.loc[year, tech] = (
-                    (1 + discount_rate.loc[year, :].values)
-                    ** (tlft[tech].values - EOH - 1 + indx)
-                    - 1
-                ) / ((1 + discount_rate.loc[year, :].values) ** tlft[tech].values - 1)
+    technical_factor = (1 - 1 / (1 + interest_rate)) / (
+        1 - 1 / ((1 + interest_rate) ** economiclife)
+    )
 
-    salvage_factor_mod = pd.DataFrame(
-        salvage_factor_0.values * rates_factor.values,
-        index=main_years,
-        columns=technologies,
+    social_factor = (1 - 1 / ((1 + discount_rate) ** economiclife)) / (
+        1 - 1 / (1 + discount_rate)
     )
 
-    return salvage_factor_mod
+    # only the capacities installed in the years whose lifetime goes beyond
+    # the end of the horizon have a salvage value
+    with np.errstate(divide="ignore", invalid="ignore"):
+        salvage_factor_0 = np.where(
+            year + tlft > EOH,
+            ((1 + discount_rate) ** (tlft - EOH - 1 + year) - 1)
+            / ((1 + discount_rate) ** tlft - 1),
+            0,
+        )
+
+    return salvage_factor_0 * technical_factor * social_factor
 
 
-def storage_state_of_charge(initial_storage, flow_in, flow_out, main_years, time_steps,charge_efficiency,discharge_efficiency):
+def storage_state_of_charge(
+    initial_storage,
+    flow_in,
+    flow_out,
+    main_years,
+    time_steps,
+    charge_efficiency,
+    discharge_efficiency,
+):
 
     """
-    Calculates the state of charge of the storage 
+    Calculates the state of charge of the storage, with the charge and
+    discharge efficiencies given for each timestep
     """
-    charge_efficiency_reshape = pd.concat(
-    [charge_efficiency]
-    * len(time_steps)
-    ).sort_index()
 
-    discharge_efficiency_reshape = pd.concat(
-    [discharge_efficiency]
-    * len(time_steps)
-    ).sort_index()
-
-    initial_storage_concat = pd.concat(
-        [initial_storage] * len(time_steps) * len(main_years)
+    initial_storage_reshape = np.repeat(
+        initial_storage, len(time_steps) * len(main_years), axis=0
     )
 
-    state_of_charge = cp.multiply(cp.cumsum(flow_in),charge_efficiency_reshape) + initial_storage_concat - \
-        cp.multiply(cp.cumsum(flow_out),(np.ones((discharge_efficiency_reshape.shape))/discharge_efficiency_reshape.values))
+    state_of_charge = (
+        algebra.multiply(algebra.cumsum(flow_in), charge_efficiency)
+        + initial_storage_reshape
+        - algebra.multiply(algebra.cumsum(flow_out), 1 / discharge_efficiency)
+    )
 
     return state_of_charge
 
@@ -450,18 +471,20 @@ def get_regions_with_storage(sets):
             yield reg
 
 
-def storage_max_flow(
-    storage_totalcapacity, time, storage_capacity_factor, timeslice_fraction
-):
+def storage_flow_factor(time, storage_capacity_factor, timeslice_fraction):
+
     """
-    Calculates the maximum allowed inflow and ouflow of storage technologies 
-    based on the charge/discharge time and the total nominal capacity
+    Calculates the maximum allowed inflow or outflow of storage technologies
+    per unit of total nominal capacity based on the charge/discharge time
     """
 
-    storage_capacity_available = cp.multiply(
-        storage_totalcapacity, storage_capacity_factor
-    )
+    return np.multiply(storage_capacity_factor, timeslice_fraction) * 8760 / time
+
 
-    max_flow = cp.multiply(storage_capacity_available, timeslice_fraction) * 8760 / time
+def storage_max_flow(storage_totalcapacity, flow_factor):
+    """
+    Calculates the maximum allowed inflow and ouflow of storage technologies 
+    based on the charge/discharge time and the total nominal capacity
+    """
 
-    return max_flow
+    return algebra.multiply(storage_totalcapacity, flow_factor)
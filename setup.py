@@ -19,12 +19,14 @@ setup(
     install_requires=[
         "pandas >= 1.3.3",
         "numpy >= 1.21.2",
+        "scipy >= 1.6.0",
         "xlsxwriter <= 1.3.7",
         "plotly >= 4.12.0",
         "openpyxl >= 3.0.6",
         "IPython >= 7.22.0",
         "cvxopt >= 1.2.7",
     ],
+    extras_require={"parquet": ["pyarrow"], "yaml": ["pyyaml"]},
     classifiers=[
         "Programming Language :: Python :: 3.7",
         "Programming Language :: Python :: 3.8",